@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Maintain and query the SQLite asset catalog (riftkit.catalog).
+`update` rescans organized_bikes_refined, public/bikes and output/, probing
+and hashing only new or changed files. `summary`, `find` and `duplicates`
+answer from the catalog without touching the trees.
+
+    python3 scripts/asset-catalog.py update
+    python3 scripts/asset-catalog.py find --root refined --category images/clean
+    python3 scripts/asset-catalog.py duplicates --root public-bikes
+"""
+
+import argparse
+import time
+
+from riftkit import profiling
+from riftkit.catalog import DEFAULT_PATH, ROOTS, Catalog
+
+
+def root_folder(name):
+    return ROOTS[name][0] if name else None
+
+
+def update(catalog, names, workers):
+    start = time.perf_counter()
+    for name, counts in catalog.update_roots(names, workers=workers).items():
+        print(f"🗂️  {name:13} {counts['added']:4} added, {counts['changed']:4} changed, "
+              f"{counts['removed']:4} removed, {counts['unchanged']:5} unchanged")
+    print(f"\n✅ Catalog updated in {time.perf_counter() - start:.2f}s: {catalog.path}")
+
+
+def summary(catalog, name):
+    start = time.perf_counter()
+    rows = catalog.summary(root_folder(name))
+    for root, bike, category, count, size in rows:
+        label = f"{bike}/{category}" if bike else category
+        print(f"  {label:45} {count:5} files {size / 1024 / 1024:9.1f}MB")
+    print(f"\n{sum(r[3] for r in rows)} files in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+def find(catalog, name, bike, category, extensions):
+    start = time.perf_counter()
+    assets = catalog.files(root_folder(name), bike=bike, category=category, extensions=extensions)
+    for asset in assets:
+        dimensions = f"{asset.width:g}x{asset.height:g}" if asset.width else "-"
+        print(f"  {asset.full_path}  {dimensions}  {asset.size / 1024:.1f}KB")
+    print(f"\n{len(assets)} files in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+def duplicates(catalog, name):
+    start = time.perf_counter()
+    groups = catalog.duplicates(root_folder(name))
+    for group in groups:
+        print(f"  {len(group)} × {group[0].size / 1024:.1f}KB:")
+        for asset in group:
+            print(f"    {asset.full_path}")
+    print(f"\n{len(groups)} groups of identical files in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain and query the SQLite asset catalog")
+    parser.add_argument("--db", default=str(DEFAULT_PATH), help=f"catalog file (default: {DEFAULT_PATH})")
+    profiling.add_arguments(parser)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    update_parser = commands.add_parser("update", help="rescan the trees, reading only changed files")
+    update_parser.add_argument("roots", nargs="*", metavar="ROOT",
+                               help=f"trees to rescan: {', '.join(ROOTS)} (default: all)")
+    update_parser.add_argument("--workers", type=int, default=8,
+                               help="threads for probing and hashing")
+
+    summary_parser = commands.add_parser("summary", help="files and bytes per bike and category")
+    summary_parser.add_argument("--root", choices=list(ROOTS))
+
+    find_parser = commands.add_parser("find", help="list files matching filters")
+    find_parser.add_argument("--root", choices=list(ROOTS))
+    find_parser.add_argument("--bike")
+    find_parser.add_argument("--category", help="exact category, or a prefix ending in /")
+    find_parser.add_argument("--ext", nargs="+", help="extensions such as .jpg .png")
+
+    duplicates_parser = commands.add_parser("duplicates", help="groups of byte-identical files")
+    duplicates_parser.add_argument("--root", choices=list(ROOTS))
+
+    args = parser.parse_args()
+    unknown = [name for name in getattr(args, "roots", []) if name not in ROOTS]
+    if unknown:
+        parser.error(f"unknown tree {unknown[0]!r}, expected one of {', '.join(ROOTS)}")
+    with profiling.session(args), Catalog(args.db) as catalog, profiling.stage(args.command):
+        if args.command == "update":
+            update(catalog, args.roots or list(ROOTS), args.workers)
+        elif args.command == "summary":
+            summary(catalog, args.root)
+        elif args.command == "find":
+            find(catalog, args.root, args.bike, args.category, args.ext)
+        else:
+            duplicates(catalog, args.root)
+
+
+if __name__ == "__main__":
+    main()
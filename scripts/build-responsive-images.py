@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Build responsive WebP/AVIF versions of the bike photos.
+Every image under public/bikes is encoded at a ladder of widths into
+public/bikes-srcset, and lib/bike-images.json maps each original URL (as
+used in lib/bikes-data.ts) to its intrinsic size and width -> URL lists
+for srcset. Photos that have not changed since the last run are skipped.
+
+Run from the repository root: python3 scripts/build-responsive-images.py
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+from riftkit import profiling
+from riftkit.responsive import FORMATS, WIDTHS, available_formats, build_derivatives
+
+SOURCE_DIR = Path("public/bikes")
+OUTPUT_DIR = Path("public/bikes-srcset")
+MANIFEST_FILE = Path("lib/bike-images.json")
+
+
+def build_responsive_images(source_dir=SOURCE_DIR, output_dir=OUTPUT_DIR, manifest_file=MANIFEST_FILE,
+                            widths=WIDTHS, formats=FORMATS, jobs=1):
+    """Encode the derivatives and write the srcset manifest."""
+    start = time.perf_counter()
+    try:
+        supported = available_formats(formats)
+    except ImportError:
+        print("⚠️  Pillow is needed to build responsive images; skipping it")
+        return None
+    for fmt in formats:
+        if fmt not in supported:
+            print(f"⚠️  This Pillow cannot encode {fmt.upper()}; skipping it")
+    if not supported:
+        return None
+
+    previous = {}
+    if manifest_file.exists():
+        with open(manifest_file, encoding='utf-8') as f:
+            previous = json.load(f)
+
+    print(f"🖼️  Building {', '.join(f.upper() for f in supported)} at {', '.join(map(str, widths))}px "
+          f"from {source_dir} ({jobs} workers)...")
+    # URLs are the paths under public/, which is what the site serves at /
+    with profiling.stage('encode'):
+        manifest, stats = build_derivatives(
+            str(source_dir), str(output_dir),
+            url_prefix="/" + source_dir.name, out_url_prefix="/" + output_dir.name,
+            previous=previous, widths=widths, formats=supported, jobs=jobs)
+    for rel_path, error in stats['errors']:
+        print(f"  ✗ {rel_path}: {error}")
+
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+    # Page weight at the largest width served, per format, against the originals
+    def size_of(directory, url):
+        return os.path.getsize(directory / url.split("/", 2)[2])
+    original = sum(size_of(source_dir, url) for url in manifest)
+    by_format = {fmt: sum(size_of(output_dir, list(entry['sources'][fmt].values())[-1])
+                          for entry in manifest.values() if fmt in entry['sources'])
+                 for fmt in supported}
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ {stats['photos']} photos: {stats['encoded']} encoded, {stats['cached']} unchanged, "
+          f"{len(stats['errors'])} failed, {stats['removed']} stale files removed in {elapsed:.1f}s")
+    print(f"📉 Originals: {original / 1024 / 1024:.1f}MB; largest width: " +
+          ", ".join(f"{fmt.upper()} {size / 1024 / 1024:.1f}MB" for fmt, size in by_format.items()))
+    print(f"📄 Manifest: {manifest_file}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build srcset WebP/AVIF derivatives of the bike photos")
+    parser.add_argument("--source", type=Path, default=SOURCE_DIR,
+                        help=f"folder of original photos under public/ (default: {SOURCE_DIR})")
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR,
+                        help=f"folder under public/ for the derivatives (default: {OUTPUT_DIR})")
+    parser.add_argument("--manifest", type=Path, default=MANIFEST_FILE,
+                        help=f"srcset manifest to write (default: {MANIFEST_FILE})")
+    parser.add_argument("--widths", type=int, nargs="+", default=list(WIDTHS),
+                        help="width ladder in pixels")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS),
+                        help="formats to encode")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="worker processes for encoding (0 = one per CPU core)")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    with profiling.session(args):
+        build_responsive_images(args.source, args.output, args.manifest,
+                                widths=sorted(set(args.widths)), formats=args.formats,
+                                jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1))
+
+
+if __name__ == "__main__":
+    main()
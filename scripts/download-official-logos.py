@@ -3,10 +3,13 @@
 Download official brand logos from reliable sources
 """
 
+import argparse
 import os
 import requests
 from pathlib import Path
 
+from riftkit import profiling
+
 LOGOS_DIR = Path(__file__).parent.parent / "public" / "logos" / "partners"
 LOGOS_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -32,6 +35,7 @@ def download_logo(name, urls):
                     filepath = LOGOS_DIR / f"{name}.svg"
                     with open(filepath, 'w', encoding='utf-8') as f:
                         f.write(content)
+                    profiling.note_output(str(filepath), os.path.getsize(filepath))
                     print(f"  ✓ Downloaded {name}.svg ({len(content)} bytes)")
                     return True
         except Exception as e:
@@ -39,7 +43,7 @@ def download_logo(name, urls):
             continue
     return False
 
-def main():
+def download_logos():
     print("🎨 Downloading Official Brand Logos")
     print("=" * 50)
     print(f"Output directory: {LOGOS_DIR}\n")
@@ -47,7 +51,9 @@ def main():
     success_count = 0
     for name, urls in LOGO_SOURCES.items():
         print(f"Downloading {name.upper()}...")
-        if download_logo(name, urls):
+        with profiling.stage(name):
+            downloaded = download_logo(name, urls)
+        if downloaded:
             success_count += 1
         print()
     
@@ -60,5 +66,12 @@ def main():
     print(f"   4. Save to: {LOGOS_DIR}/")
     print("\nSee scripts/download-logos-manual.md for detailed instructions")
 
+def main():
+    parser = argparse.ArgumentParser(description="Download official partner brand logos")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    with profiling.session(args):
+        download_logos()
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Export output/press-package as reproducible press-kit bundles for journalists.
+Each audience gets one zip or tar.zst with a MANIFEST.json of file sizes and
+SHA-256 hashes (riftkit.presskit); the same files always give the same bytes.
+Members are compressed in parallel, and members unchanged since the last
+export are copied from the previous bundle without recompressing them.
+
+    python3 scripts/export-press-kit.py
+    python3 scripts/export-press-kit.py --audience social print --format tar.zst
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from riftkit import profiling
+from riftkit.presskit import AUDIENCES, FORMATS, LEVELS, export_bundle
+
+SOURCE_DIR = Path("output/press-package")
+OUTPUT_DIR = Path("output/press-kits")
+
+
+def export_press_kits(source_dir=SOURCE_DIR, output_dir=OUTPUT_DIR, audiences=('full',), fmt='zip',
+                      level=None, jobs=1, force=False):
+    """Write one bundle per audience and report what was compressed and reused."""
+    if not source_dir.is_dir():
+        print(f"⚠️  {source_dir} not found; generate the press package first")
+        return None
+    print(f"📦 Exporting {', '.join(audiences)} press kits from {source_dir} as .{fmt} ({jobs} workers)...")
+    results = []
+    for audience in audiences:
+        start = time.perf_counter()
+        try:
+            with profiling.stage(audience):
+                stats = export_bundle(str(source_dir), str(output_dir), audience, fmt, level=level,
+                                      jobs=jobs, force=force)
+        except ImportError:
+            print("⚠️  zstandard is needed for tar.zst bundles (pip install zstandard); skipping them")
+            return None
+        elapsed = time.perf_counter() - start
+        if stats['unchanged']:
+            print(f"· Unchanged: {stats['path']} ({stats['files']} files, {stats['size'] / 1024:.1f}KB)")
+        else:
+            print(f"✓ Exported: {stats['path']} ({stats['files']} files, {stats['compressed']} compressed, "
+                  f"{stats['reused']} reused; {stats['bytes'] / 1024:.1f}KB → {stats['size'] / 1024:.1f}KB "
+                  f"in {elapsed:.2f}s)")
+        results.append(stats)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the press package as reproducible press-kit bundles")
+    parser.add_argument("--source", type=Path, default=SOURCE_DIR,
+                        help=f"press package folder (default: {SOURCE_DIR})")
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR,
+                        help=f"folder for the bundles (default: {OUTPUT_DIR})")
+    parser.add_argument("--audience", nargs="+", choices=list(AUDIENCES), default=["full"],
+                        help="kits to export (default: full)")
+    parser.add_argument("--format", choices=FORMATS, default="zip",
+                        help="bundle format (default: zip; tar.zst needs zstandard)")
+    parser.add_argument("--level", type=int,
+                        help=f"compression level (default: {', '.join(f'{k} {v}' for k, v in LEVELS.items())})")
+    parser.add_argument("--force", action="store_true",
+                        help="compress every member again instead of reusing the previous bundle's")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="threads for hashing and compressing (0 = one per CPU core)")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    with profiling.session(args):
+        export_press_kits(args.source, args.output, args.audience, args.format, level=args.level,
+                          jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1), force=args.force)
+
+
+if __name__ == "__main__":
+    main()
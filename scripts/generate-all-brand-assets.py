@@ -9,16 +9,11 @@ import os
 from typing import Dict, List, Tuple
 from pathlib import Path
 
-# Brand Colors
-COLORS = {
-    'emerald_dark': '#0d4d3f',
-    'emerald_mid': '#0f3d32',
-    'emerald_bright': '#065f46',
-    'emerald_accent': '#10b981',
-    'gold': '#fbbf24',
-    'white': '#ffffff',
-    'black': '#000000'
-}
+from riftkit import engine
+from riftkit.engine import (COLORS, background_rect, require_dirs, rift_icon, rift_text_geometric,
+                            svg_document, write_asset)
+from riftkit.preview import PreviewWriter
+from riftkit.raster import ico_job, raster_job, rasterize
 
 # Tagline options
 TAGLINES = [
@@ -27,6 +22,16 @@ TAGLINES = [
     "Premium Performance"
 ]
 
+FAVICON_SIZES = [16, 32, 48, 64, 128, 256]
+
+# SVGs that app stores and printers need in another format: path -> formats
+RASTER_FORMATS = {
+    'specialized/app-icons/rift-app-icon-ios.svg': ('png',),
+    'specialized/app-icons/rift-app-icon-android.svg': ('png',),
+    'banners/rift-print-banner.svg': ('png', 'pdf'),
+    'specialized/business-cards/rift-business-card-logo.svg': ('png', 'pdf'),
+}
+
 
 class RIFTBrandAssetGenerator:
     """Comprehensive generator for all RIFT brand assets"""
@@ -49,65 +54,19 @@ class RIFTBrandAssetGenerator:
             'specialized/app-icons',
             'specialized/business-cards',
         ]
-        for dir_path in dirs:
-            os.makedirs(os.path.join(self.base_output_dir, dir_path), exist_ok=True)
+        require_dirs(*(os.path.join(self.base_output_dir, dir_path) for dir_path in dirs))
     
     def get_rift_icon(self, x: float, y: float, scale: float = 1.0, 
                      color: str = COLORS['gold'], stroke_width: float = None) -> str:
         """Generate the volcanic rift icon SVG paths"""
-        s = scale
         sw = stroke_width if stroke_width is not None else (3 * scale)
         sw_cracks = (sw * 0.83) if stroke_width else (2.5 * scale)
-        
-        return f'''
-        <!-- Volcanic Rift Icon -->
-        <g transform="translate({x}, {y}) scale({s})">
-            <!-- Horizontal lines -->
-            <path d="M10 30 L90 30" stroke="{color}" stroke-width="{sw}" stroke-linecap="square"/>
-            <path d="M15 60 L85 60" stroke="{color}" stroke-width="{sw}" stroke-linecap="square"/>
-            <path d="M20 90 L80 90" stroke="{color}" stroke-width="{sw}" stroke-linecap="square"/>
-            <!-- Angular cracks -->
-            <path d="M25 15 L28 30 M75 15 L72 30" stroke="{color}" stroke-width="{sw_cracks}" stroke-linecap="square"/>
-            <path d="M30 45 L33 60 M70 45 L67 60" stroke="{color}" stroke-width="{sw_cracks}" stroke-linecap="square"/>
-            <path d="M50 75 L53 90 M50 75 L47 90" stroke="{color}" stroke-width="{sw_cracks}" stroke-linecap="square"/>
-        </g>
-        '''
+        return rift_icon(x, y, scale, color, sw, sw_cracks)
     
     def get_rift_text_geometric(self, x: float, y: float, size: float = 60, 
-                                color: str = COLORS['white'], weight: str = 'bold',
-                                fill: bool = True) -> str:
+                                color: str = COLORS['white'], weight: str = 'bold') -> str:
         """Generate custom geometric RIFT letterforms as SVG paths"""
-        scale = size / 60  # Base size is 60
-        stroke_width = 8 if weight == 'bold' else 6
-        
-        # Custom geometric letterforms for R-I-F-T (as closed paths for filling)
-        # R: Closed path
-        r_path = f"M {x + 0*scale} {y + 60*scale} L {x + 0*scale} {y + 0*scale} L {x + 25*scale} {y + 0*scale} L {x + 30*scale} {y + 15*scale} L {x + 25*scale} {y + 30*scale} L {x + 0*scale} {y + 30*scale} Z M {x + 12*scale} {y + 30*scale} L {x + 30*scale} {y + 60*scale}"
-        
-        # I: Vertical line with caps
-        i_path = f"M {x + 50*scale} {y + 0*scale} L {x + 50*scale} {y + 60*scale} M {x + 40*scale} {y + 0*scale} L {x + 60*scale} {y + 0*scale} M {x + 40*scale} {y + 60*scale} L {x + 60*scale} {y + 60*scale}"
-        
-        # F: Vertical with horizontals
-        f_path = f"M {x + 80*scale} {y + 60*scale} L {x + 80*scale} {y + 0*scale} L {x + 110*scale} {y + 0*scale} M {x + 80*scale} {y + 28*scale} L {x + 105*scale} {y + 28*scale}"
-        
-        # T: Horizontal top + vertical
-        t_path = f"M {x + 125*scale} {y + 0*scale} L {x + 165*scale} {y + 0*scale} M {x + 145*scale} {y + 0*scale} L {x + 145*scale} {y + 60*scale}"
-        
-        if fill:
-            # Use stroke for letterforms (they're line-based, not filled shapes)
-            return f'''<g>
-            <path d="{r_path}" fill="none" stroke="{color}" stroke-width="{stroke_width*scale}" stroke-linecap="square" stroke-linejoin="miter"/>
-            <path d="{i_path}" fill="none" stroke="{color}" stroke-width="{stroke_width*scale}" stroke-linecap="square"/>
-            <path d="{f_path}" fill="none" stroke="{color}" stroke-width="{stroke_width*scale}" stroke-linecap="square"/>
-            <path d="{t_path}" fill="none" stroke="{color}" stroke-width="{stroke_width*scale}" stroke-linecap="square"/>
-        </g>'''
-        else:
-            return f'''<g>
-            <path d="{r_path}" fill="none" stroke="{color}" stroke-width="{stroke_width*scale}" stroke-linecap="square" stroke-linejoin="miter"/>
-            <path d="{i_path}" fill="none" stroke="{color}" stroke-width="{stroke_width*scale}" stroke-linecap="square"/>
-            <path d="{f_path}" fill="none" stroke="{color}" stroke-width="{stroke_width*scale}" stroke-linecap="square"/>
-            <path d="{t_path}" fill="none" stroke="{color}" stroke-width="{stroke_width*scale}" stroke-linecap="square"/>
-        </g>'''
+        return rift_text_geometric(x, y, size, color, weight)
     
     def get_tagline(self, x: float, y: float, size: float = 12, 
                    color: str = COLORS['gold'], text: str = None) -> str:
@@ -123,24 +82,12 @@ class RIFTBrandAssetGenerator:
     def create_svg(self, width: int, height: int, content: str, 
                   viewbox: str = None, background: str = None) -> str:
         """Wrap content in SVG tags"""
-        if viewbox is None:
-            viewbox = f"0 0 {width} {height}"
-        
-        bg = f'<rect width="{width}" height="{height}" fill="{background}"/>' if background else ''
-        
-        return f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewbox}" width="{width}" height="{height}">
-    {bg}
-    {content}
-</svg>'''
+        return svg_document(width, height, background_rect(width, height, background), content,
+                            viewbox=viewbox)
     
     def save_asset(self, filepath: str, svg_content: str):
         """Save SVG content to file"""
-        full_path = os.path.join(self.base_output_dir, filepath)
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(svg_content)
-        print(f"✓ Generated: {filepath}")
+        write_asset(os.path.join(self.base_output_dir, filepath), svg_content, filepath)
     
     # ==================== PRIMARY LOGOS ====================
     
@@ -520,7 +467,7 @@ class RIFTBrandAssetGenerator:
         """Generate all specialized assets"""
         print("\n⭐ Generating Specialized Assets...")
         # Favicons in multiple sizes
-        for size in [16, 32, 48, 64, 128, 256]:
+        for size in FAVICON_SIZES:
             self.specialized_favicon(size)
         self.specialized_app_icon_ios()
         self.specialized_app_icon_android()
@@ -531,7 +478,28 @@ class RIFTBrandAssetGenerator:
         self.specialized_social_story()
         self.specialized_social_post_template()
     
-    def generate_all(self):
+    def generate_rasters(self, jobs: int = 1):
+        """Render favicons to PNG and ICO, app icons to PNG and print assets to PNG and PDF"""
+        print("\n🖨  Rasterizing Favicons, App Icons & Print Assets...")
+        # The renderers read the SVGs from disk
+        engine.WRITER.flush()
+        favicons = [(os.path.join(self.base_output_dir, f'specialized/favicons/rift-favicon-{size}x{size}.svg'), size)
+                    for size in FAVICON_SIZES]
+        raster_jobs = [raster_job(svg_path, svg_path[:-4] + '.png') for svg_path, _ in favicons]
+        raster_jobs.append(ico_job(os.path.join(self.base_output_dir, 'specialized/favicons/favicon.ico'), favicons))
+        for rel_path, formats in RASTER_FORMATS.items():
+            svg_path = os.path.join(self.base_output_dir, rel_path)
+            raster_jobs.extend(raster_job(svg_path, f"{svg_path[:-4]}.{fmt}") for fmt in formats)
+        try:
+            stats = rasterize(raster_jobs, self.base_output_dir, workers=jobs)
+        except ImportError as e:
+            print(f"⚠️  {e}; skipping rasterization")
+            return
+        print(f"🖼  {stats['rendered']} frames rendered, {stats['cached']} from the render cache")
+        for fmt, count in stats['skipped'].items():
+            print(f"⚠️  No installed renderer writes {fmt.upper()}; skipped {count} files")
+    
+    def generate_all(self, jobs: int = 1):
         """Generate all brand assets"""
         print("\n" + "="*60)
         print("🎨 RIFT Comprehensive Brand Asset Generator")
@@ -544,6 +512,7 @@ class RIFTBrandAssetGenerator:
         self.generate_banners()
         self.generate_overlays()
         self.generate_specialized()
+        self.generate_rasters(jobs)
         
         # Generate preview HTML
         self.generate_preview_html()
@@ -556,7 +525,8 @@ class RIFTBrandAssetGenerator:
     
     def generate_preview_html(self):
         """Generate comprehensive HTML preview of all assets"""
-        html = '''<!DOCTYPE html>
+        page = PreviewWriter(os.path.join(self.base_output_dir, 'preview.html'))
+        page.write('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -647,7 +617,7 @@ class RIFTBrandAssetGenerator:
 <body>
     <h1>RIFT BRAND ASSETS</h1>
     <p class="subtitle">Comprehensive Brand Asset Collection</p>
-'''
+''')
         
         # Define all assets by category
         assets = {
@@ -697,13 +667,13 @@ class RIFTBrandAssetGenerator:
         }
         
         for category, items in assets.items():
-            html += f'''
+            page.write(f'''
     <div class="section">
         <h2 class="section-title">{category}</h2>
         <div class="grid">
-'''
+''')
             for filepath, name, dimensions, description in items:
-                html += f'''
+                page.write(f'''
             <div class="asset-card">
                 <div class="asset-container">
                     <img src="{filepath}" alt="{name}" onerror="this.style.display='none'">
@@ -712,23 +682,30 @@ class RIFTBrandAssetGenerator:
                 <div class="asset-description">{description}</div>
                 <div class="asset-dimensions">{dimensions}</div>
             </div>
-'''
-            html += '        </div>\n    </div>\n'
+''')
+            page.write('        </div>\n    </div>\n')
         
-        html += '''
+        page.write('''
 </body>
-</html>'''
+</html>''')
         
-        preview_path = os.path.join(self.base_output_dir, 'preview.html')
-        with open(preview_path, 'w', encoding='utf-8') as f:
-            f.write(html)
+        page.close()
         print(f"✓ Generated: preview.html")
 
 
+engine.register_class(
+    'brand-assets', RIFTBrandAssetGenerator,
+    description='Logos, social, banners, overlays and specialized assets, with PNG/ICO/PDF renders (supports --jobs)',
+    output_dir='output/brand-assets',
+    entry='generate_all',
+    assets=engine.prefixed_assets('logo_', 'social_', 'pfp_', 'banner_', 'overlay_', 'specialized_'),
+    options=('jobs',),
+)
+
+
 def main():
     """Main execution function"""
-    generator = RIFTBrandAssetGenerator(output_dir='output/brand-assets')
-    generator.generate_all()
+    engine.main(['brand-assets'], description='Generate all RIFT brand assets')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+RIFT Asset Generator - common command line
+Runs any or all of the generate-*.py generators in one process.
+
+    python3 scripts/generate-assets.py --list
+    python3 scripts/generate-assets.py                      # everything
+    python3 scripts/generate-assets.py logos premium-logos -j 0
+"""
+
+from riftkit import engine
+
+
+if __name__ == '__main__':
+    engine.main()
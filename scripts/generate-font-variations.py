@@ -2,21 +2,26 @@
 """
 RIFT Logo Font Variations Generator
 Generates multiple logo variations with different typography styles
+
+Logos are drawn from a font × layout × palette × size × background matrix.
+By default every font in every layout in the brand palette; sweep more with
+--axis and narrow it with --where, e.g.
+
+    python3 scripts/generate-font-variations.py -j 0 --axis palette=all --axis size=all \
+        --where layout!=text-only
 """
 
+import functools
 import os
+import time
 from typing import Dict, List, Tuple
 
-# Brand Colors
-COLORS = {
-    'emerald_dark': '#0d4d3f',
-    'emerald_mid': '#0f3d32',
-    'emerald_bright': '#065f46',
-    'emerald_accent': '#10b981',
-    'gold': '#fbbf24',
-    'white': '#ffffff',
-    'black': '#000000'
-}
+from riftkit import engine, profiling
+from riftkit.buildcache import recording
+from riftkit.engine import COLORS, PALETTES, background_rect, require_dirs, rift_icon, svg_document, write_asset
+from riftkit.gallery import write_gallery
+from riftkit.matrix import VariantMatrix, parse_axes, parse_where
+from riftkit.preview import PreviewWriter
 
 # Font configurations with Google Fonts
 # Organized by category: Sans-Serif, Serif, Display, Script, Monospace
@@ -401,39 +406,63 @@ FONT_VARIATIONS = [
         'letter_spacing': '0.1em'
     },
 ]
+FONTS_BY_NAME = {font_config['name']: font_config for font_config in FONT_VARIATIONS}
+
+# Logo layouts: canvas size, icon placement (x, y, scale) or None, and wordmark (x, y, size)
+LAYOUTS = {
+    'horizontal': {'width': 400, 'height': 120, 'icon': (20, 40, 1.0), 'text': (200, 70, 56)},
+    'vertical': {'width': 300, 'height': 400, 'icon': (100, 30, 1.0), 'text': (150, 200, 50)},
+    'text-only': {'width': 400, 'height': 150, 'icon': None, 'text': (200, 80, 70)},
+    'compact': {'width': 180, 'height': 60, 'icon': (10, 15, 0.5), 'text': (120, 40, 32)},
+}
+
+# Rendered widths in pixels for `--axis size=all`; 0 keeps the layout's own size
+SIZE_PRESETS = [0, 256, 512, 1024, 2048]
+
+# Every value each matrix axis can take, and the ones drawn by default
+MATRIX_CHOICES = {
+    'font': list(FONTS_BY_NAME),
+    'layout': list(LAYOUTS),
+    'palette': list(PALETTES),
+    'size': SIZE_PRESETS,
+    'background': ['solid', 'transparent'],
+}
+MATRIX_DEFAULTS = {
+    'font': list(FONTS_BY_NAME),
+    'layout': list(LAYOUTS),
+    'palette': ['brand'],
+    'size': [0],
+    'background': ['solid'],
+}
+
+
+def variant_filename(font: str, layout: str, palette: str = 'brand', size: int = 0,
+                     background: str = 'solid') -> str:
+    """File name of a logo variant; the default variants keep their original names"""
+    suffix = '' if palette == 'brand' else f"-{palette}"
+    suffix += f"-{size}w" if size else ''
+    suffix += '' if background == 'solid' else f"-{background}"
+    return f"rift-logo-{layout}-{font}{suffix}.svg"
 
 
 class RIFTFontVariationGenerator:
     """Generates logo variations with different fonts"""
     
-    def __init__(self, output_dir: str = 'output/font-variations'):
+    def __init__(self, output_dir: str = 'output/font-variations', verbose: bool = True):
         self.output_dir = output_dir
+        self.verbose = verbose
         self.ensure_output_dir()
     
     def ensure_output_dir(self):
         """Create output directory if it doesn't exist"""
-        os.makedirs(self.output_dir, exist_ok=True)
+        require_dirs(self.output_dir)
     
     def get_rift_icon(self, x: float, y: float, scale: float = 1.0, 
                      color: str = COLORS['gold'], stroke_width: float = None) -> str:
         """Generate the volcanic rift icon SVG paths"""
-        s = scale
         sw = stroke_width if stroke_width is not None else (3 * scale)
         sw_cracks = (sw * 0.83) if stroke_width else (2.5 * scale)
-        
-        return f'''
-        <!-- Volcanic Rift Icon -->
-        <g transform="translate({x}, {y}) scale({s})">
-            <!-- Horizontal lines -->
-            <path d="M10 30 L90 30" stroke="{color}" stroke-width="{sw}" stroke-linecap="square"/>
-            <path d="M15 60 L85 60" stroke="{color}" stroke-width="{sw}" stroke-linecap="square"/>
-            <path d="M20 90 L80 90" stroke="{color}" stroke-width="{sw}" stroke-linecap="square"/>
-            <!-- Angular cracks -->
-            <path d="M25 15 L28 30 M75 15 L72 30" stroke="{color}" stroke-width="{sw_cracks}" stroke-linecap="square"/>
-            <path d="M30 45 L33 60 M70 45 L67 60" stroke="{color}" stroke-width="{sw_cracks}" stroke-linecap="square"/>
-            <path d="M50 75 L53 90 M50 75 L47 90" stroke="{color}" stroke-width="{sw_cracks}" stroke-linecap="square"/>
-        </g>
-        '''
+        return rift_icon(x, y, scale, color, sw, sw_cracks)
     
     def get_rift_text(self, x: float, y: float, size: float, font_config: Dict, 
                      color: str = COLORS['white']) -> str:
@@ -452,13 +481,8 @@ class RIFTFontVariationGenerator:
     
     def create_svg(self, width: int, height: int, content: str, 
                   viewbox: str = None, background: str = None,
-                  fonts: List[str] = None) -> str:
-        """Wrap content in SVG tags with font imports"""
-        if viewbox is None:
-            viewbox = f"0 0 {width} {height}"
-        
-        bg = f'<rect width="{width}" height="{height}" fill="{background}"/>' if background else ''
-        
+                  fonts: List[str] = None, scale_to: int = None) -> str:
+        """Wrap content in SVG tags with font imports, optionally scaled to scale_to pixels wide"""
         # Build font imports (using CDATA to avoid XML parsing issues)
         font_imports = ''
         if fonts:
@@ -470,145 +494,118 @@ class RIFTFontVariationGenerator:
         ]]></style>
     </defs>'''
         
-        return f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewbox}" width="{width}" height="{height}">
-    {font_imports}
-    {bg}
-    {content}
-</svg>'''
+        doc_width, doc_height = width, height
+        if scale_to:
+            viewbox = viewbox or f"0 0 {width} {height}"
+            doc_width, doc_height = scale_to, round(height * scale_to / width)
+        return svg_document(doc_width, doc_height, font_imports, background_rect(width, height, background),
+                            content, viewbox=viewbox)
     
     def save_logo(self, filename: str, svg_content: str):
         """Save SVG content to file"""
-        filepath = os.path.join(self.output_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(svg_content)
-        print(f"✓ Generated: {filename}")
-    
-    def generate_horizontal_logo(self, font_config: Dict):
-        """Generate horizontal logo with specific font"""
-        filename = f"rift-logo-horizontal-{font_config['name']}.svg"
-        
-        # Calculate text position (centered after icon)
-        icon_width = 100
-        icon_x = 20
-        icon_y = 40
-        text_x = 200  # Center of remaining space
-        text_y = 70
-        text_size = 56
-        
-        content = f'''
-        {self.get_rift_icon(icon_x, icon_y, 1.0, COLORS['gold'])}
-        {self.get_rift_text(text_x, text_y, text_size, font_config, COLORS['white'])}
-        '''
-        
-        svg = self.create_svg(
-            width=400, 
-            height=120, 
-            content=content,
-            background=COLORS['emerald_dark'],
-            fonts=[font_config['google_font']]
-        )
-        
-        self.save_logo(filename, svg)
+        write_asset(os.path.join(self.output_dir, filename), svg_content,
+                    filename if self.verbose else None)
     
-    def generate_vertical_logo(self, font_config: Dict):
-        """Generate vertical logo with specific font"""
-        filename = f"rift-logo-vertical-{font_config['name']}.svg"
-        
-        icon_x = 100
-        icon_y = 30
-        text_x = 150
-        text_y = 200
-        text_size = 50
+    def generate_logo(self, font: str, layout: str, palette: str = 'brand', size: int = 0,
+                      background: str = 'solid'):
+        """Generate one logo variant: a font set in a layout, palette, width and background"""
+        font_config = FONTS_BY_NAME[font]
+        spec = LAYOUTS[layout]
+        colors = PALETTES[palette]
         
-        content = f'''
-        {self.get_rift_icon(icon_x, icon_y, 1.0, COLORS['gold'])}
-        {self.get_rift_text(text_x, text_y, text_size, font_config, COLORS['white'])}
+        text_x, text_y, text_size = spec['text']
+        if spec['icon']:
+            icon_x, icon_y, icon_scale = spec['icon']
+            content = f'''
+        {self.get_rift_icon(icon_x, icon_y, icon_scale, colors['icon'])}
+        {self.get_rift_text(text_x, text_y, text_size, font_config, colors['text'])}
         '''
+        else:
+            content = self.get_rift_text(text_x, text_y, text_size, font_config, colors['accent'])
         
         svg = self.create_svg(
-            width=300, 
-            height=400, 
+            width=spec['width'],
+            height=spec['height'],
             content=content,
-            background=COLORS['emerald_dark'],
-            fonts=[font_config['google_font']]
+            background=colors['background'] if background == 'solid' else None,
+            fonts=[font_config['google_font']],
+            scale_to=size
         )
         
-        self.save_logo(filename, svg)
+        self.save_logo(variant_filename(font, layout, palette, size, background), svg)
     
-    def generate_text_only_logo(self, font_config: Dict):
-        """Generate text-only logo with specific font"""
-        filename = f"rift-logo-text-only-{font_config['name']}.svg"
-        
-        text_x = 200
-        text_y = 80
-        text_size = 70
-        
-        content = self.get_rift_text(text_x, text_y, text_size, font_config, COLORS['gold'])
-        
-        svg = self.create_svg(
-            width=400, 
-            height=150, 
-            content=content,
-            background=COLORS['emerald_dark'],
-            fonts=[font_config['google_font']]
-        )
-        
-        self.save_logo(filename, svg)
+    def variant_matrix(self, axis: List[str] = (), where: List[str] = ()) -> VariantMatrix:
+        """The default matrix with --axis overrides and --where filters applied. Raises ValueError."""
+        axes = {**MATRIX_DEFAULTS, **parse_axes(axis, MATRIX_CHOICES)}
+        return VariantMatrix(axes, parse_where(where, MATRIX_CHOICES))
     
-    def generate_compact_logo(self, font_config: Dict):
-        """Generate compact logo with specific font"""
-        filename = f"rift-logo-compact-{font_config['name']}.svg"
+    def render_matrix(self, matrix: VariantMatrix, jobs: int = 1) -> int:
+        """Draw every variant in the matrix, streaming progress; returns the variant count"""
+        if jobs <= 1:
+            count = 0
+            for variant in matrix:
+                self.generate_logo(**variant)
+                count += 1
+            return count
         
-        icon_x = 10
-        icon_y = 15
-        text_x = 120
-        text_y = 40
-        text_size = 32
+        # Up-to-date variants are skipped here rather than shipped to a worker
+        method = self.generate_logo
+        cache = getattr(method, 'build_cache', None)
+        skipped = 0
         
-        content = f'''
-        {self.get_rift_icon(icon_x, icon_y, 0.5, COLORS['gold'])}
-        {self.get_rift_text(text_x, text_y, text_size, font_config, COLORS['white'])}
-        '''
+        def stale(variant):
+            nonlocal skipped
+            if cache is None:
+                return True
+            key, fingerprint = method.cache_key(**variant)
+            if cache.is_fresh(key, fingerprint):
+                cache.skip(key)
+                skipped += 1
+                return False
+            return True
         
-        svg = self.create_svg(
-            width=180, 
-            height=60, 
-            content=content,
-            background=COLORS['emerald_dark'],
-            fonts=[font_config['google_font']]
-        )
-        
-        self.save_logo(filename, svg)
+        engine.WRITER.flush()
+        count = 0
+        for variant, outputs, elapsed, minify_stats in matrix.filter(stale).run(
+                functools.partial(_render_variant, self.output_dir), jobs):
+            count += 1
+            engine.WRITER.add_minify_stats(minify_stats)
+            if cache is not None:
+                cache.record(*method.cache_key(**variant), outputs)
+            profiling.record_asset(f"{self.output_dir}/{method.__name__}", elapsed, outputs)
+            for path, changed, _ in outputs:
+                print(f"{'✓ Generated' if changed else '· Unchanged'}: {os.path.basename(path)}")
+        return count + skipped
     
-    def generate_all_variations(self):
-        """Generate all font variations"""
+    def generate_all_variations(self, jobs: int = 1, axis: List[str] = (), where: List[str] = ()):
+        """Generate every variant in the font × layout × palette × size × background matrix"""
         print("\n" + "="*60)
         print("🎨 RIFT Font Variations Generator")
         print("="*60)
         print(f"📁 Output directory: {self.output_dir}\n")
         
-        total = 0
-        for font_config in FONT_VARIATIONS:
-            print(f"\n📝 Generating {font_config['family']} ({font_config['style']})...")
-            self.generate_horizontal_logo(font_config)
-            self.generate_vertical_logo(font_config)
-            self.generate_text_only_logo(font_config)
-            self.generate_compact_logo(font_config)
-            total += 4
+        try:
+            matrix = self.variant_matrix(axis, where)
+        except ValueError as e:
+            raise SystemExit(f"❌ {e}")
+        print("📐 " + " × ".join(f"{len(values)} {name}" for name, values in matrix.axes.items())
+              + f" = {matrix.bound} combinations" + (" before filters" if matrix.where else ""))
+        
+        total = self.render_matrix(matrix, jobs)
         
         # Generate preview HTML
         self.generate_preview_html()
         
         print("\n" + "="*60)
-        print(f"✅ Generated {total} logo variations with {len(FONT_VARIATIONS)} fonts!")
+        print(f"✅ Generated {total} logo variations with {len(matrix.axes['font'])} fonts!")
         print(f"📁 Files saved to: {self.output_dir}/")
         print(f"🌐 Preview: {os.path.join(self.output_dir, 'preview.html')}")
         print("="*60)
     
     def generate_preview_html(self):
         """Generate HTML preview of all font variations grouped by category"""
-        html = '''<!DOCTYPE html>
+        page = PreviewWriter(os.path.join(self.output_dir, 'preview.html'))
+        page.write('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -745,7 +742,7 @@ class RIFTFontVariationGenerator:
         <a href="#script">Script</a>
         <a href="#monospace">Monospace</a>
     </div>
-'''
+''')
         
         # Group fonts by category
         categories = {}
@@ -769,13 +766,13 @@ class RIFTFontVariationGenerator:
             if category not in categories:
                 continue
                 
-            html += f'''
+            page.write(f'''
     <div class="category-section" id="{category_ids[category]}">
         <h2 class="category-title">{category}</h2>
-'''
+''')
             
             for font_config in categories[category]:
-                html += f'''
+                page.write(f'''
         <div class="font-section">
             <h3 class="font-title">{font_config['family']}</h3>
             <p class="font-style">{font_config['style']}</p>
@@ -810,26 +807,62 @@ class RIFTFontVariationGenerator:
                 </div>
             </div>
         </div>
-'''
+''')
             
-            html += '''
+            page.write('''
     </div>
-'''
+''')
         
-        html += '''
+        page.write('''
 </body>
-</html>'''
+</html>''')
         
-        preview_path = os.path.join(self.output_dir, 'preview.html')
-        with open(preview_path, 'w', encoding='utf-8') as f:
-            f.write(html)
+        page.close()
         print(f"✓ Generated: preview.html")
+        
+        engine.WRITER.flush()
+        count = write_gallery(self.output_dir, 'RIFT Font Variations', self.gallery_category)
+        print(f"✓ Generated: gallery.html ({count} assets indexed in assets.json)")
+    
+    def gallery_category(self, rel_path: str) -> str:
+        """Gallery category of a logo file: the category of the font it is set in"""
+        stem = os.path.splitext(os.path.basename(rel_path))[0]
+        for layout in LAYOUTS:
+            prefix = f'rift-logo-{layout}-'
+            if stem.startswith(prefix):
+                rest = stem[len(prefix):]
+                # Longest match first: variant suffixes follow the font name
+                for font_name in sorted(FONTS_BY_NAME, key=len, reverse=True):
+                    if rest == font_name or rest.startswith(font_name + '-'):
+                        return FONTS_BY_NAME[font_name].get('category', 'Other')
+        return 'Other'
+
+
+def _render_variant(output_dir: str, variant: Dict) -> Tuple[Dict, List[Tuple[str, bool, int]], float, Dict[str, int]]:
+    """Worker entry point: draw one variant and report the files it wrote and the time it took"""
+    generator = RIFTFontVariationGenerator(output_dir=output_dir, verbose=False)
+    # Pool workers draw many variants; count only this one's minify and outline stats
+    engine.WRITER.take_stats()
+    start = time.perf_counter()
+    with recording() as outputs:
+        generator.generate_logo(**variant)
+    engine.WRITER.flush()
+    return variant, outputs, time.perf_counter() - start, engine.WRITER.take_stats()
+
+
+engine.register_class(
+    'font-variations', RIFTFontVariationGenerator,
+    description='font × layout × palette × size matrix (supports --jobs, --axis, --where)',
+    output_dir='output/font-variations',
+    entry='generate_all_variations',
+    assets=engine.prefixed_assets('generate_', exclude=('generate_all_variations', 'generate_preview_html')),
+    options=('jobs', 'axis', 'where'),
+)
 
 
 def main():
     """Main execution function"""
-    generator = RIFTFontVariationGenerator(output_dir='output/font-variations')
-    generator.generate_all_variations()
+    engine.main(['font-variations'], description='Generate RIFT logo font variations')
 
 
 if __name__ == '__main__':
@@ -7,17 +7,25 @@ Generates multiple icon variations with different complexity, styles, sizes, and
 import os
 from typing import Dict, List, Tuple
 
-# Brand Colors
-COLORS = {
-    'emerald_dark': '#0d4d3f',
-    'emerald_mid': '#0f3d32',
-    'emerald_bright': '#065f46',
-    'emerald_accent': '#10b981',
-    'gold': '#fbbf24',
-    'white': '#ffffff',
-    'black': '#000000'
+from riftkit import engine
+from riftkit.engine import COLORS, background_rect, require_dirs, rift_icon, svg_document, write_asset
+from riftkit.gallery import write_gallery
+from riftkit.preview import PreviewWriter
+from riftkit.raster import ico_job, raster_job, rasterize
+
+# Preview categories and the filename keywords that put an icon in them
+ICON_CATEGORIES = {
+    'Complexity': ['minimal', 'standard', 'enhanced', 'detailed', 'ornate'],
+    'Style': ['geometric', 'organic', 'tech', 'classic', 'bold', 'subtle'],
+    'Integration': ['standalone', 'framed', 'badge'],
+    'Color': ['inverted', 'monochrome', 'gradient'],
+    'Size': ['16px', '32px', '64px', '128px', '256px'],
 }
 
+# Sizes of the size-optimized icons, and the styles drawn at each size
+VARIATION_SIZES = [16, 32, 64, 128, 256]
+VARIATION_STYLES = ['minimal', 'standard', 'bold']
+
 
 class RIFTIconVariationGenerator:
     """Generates icon variations with different styles and configurations"""
@@ -28,28 +36,17 @@ class RIFTIconVariationGenerator:
     
     def ensure_output_dir(self):
         """Create output directory if it doesn't exist"""
-        os.makedirs(self.output_dir, exist_ok=True)
+        require_dirs(self.output_dir)
     
     def create_svg(self, width: int, height: int, content: str, 
                   viewbox: str = None, background: str = None) -> str:
         """Wrap content in SVG tags"""
-        if viewbox is None:
-            viewbox = f"0 0 {width} {height}"
-        
-        bg = f'<rect width="{width}" height="{height}" fill="{background}"/>' if background else ''
-        
-        return f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewbox}" width="{width}" height="{height}">
-    {bg}
-    {content}
-</svg>'''
+        return svg_document(width, height, background_rect(width, height, background), content,
+                            viewbox=viewbox)
     
     def save_icon(self, filename: str, svg_content: str):
         """Save SVG content to file"""
-        filepath = os.path.join(self.output_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(svg_content)
-        print(f"✓ Generated: {filename}")
+        write_asset(os.path.join(self.output_dir, filename), svg_content, filename)
     
     # ===== COMPLEXITY VARIATIONS =====
     
@@ -73,24 +70,13 @@ class RIFTIconVariationGenerator:
         self.save_icon(filename, svg)
     
     def generate_standard_icon(self, size: int = 100, color: str = COLORS['gold'],
-                               background: str = None):
+                               background: str = None, filename: str = None):
         """Current design - standard complexity"""
-        filename = f"rift-icon-standard-{size}px.svg"
+        filename = filename or f"rift-icon-standard-{size}px.svg"
         center_x = size / 2
         scale = size / 100
         
-        content = f'''
-        <g transform="translate({center_x - 40*scale}, {center_x - 20*scale}) scale({scale})">
-            <!-- Horizontal lines -->
-            <path d="M10 30 L90 30" stroke="{color}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M15 60 L85 60" stroke="{color}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M20 90 L80 90" stroke="{color}" stroke-width="3" stroke-linecap="square"/>
-            <!-- Angular cracks -->
-            <path d="M25 15 L28 30 M75 15 L72 30" stroke="{color}" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M30 45 L33 60 M70 45 L67 60" stroke="{color}" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M50 75 L53 90 M50 75 L47 90" stroke="{color}" stroke-width="2.5" stroke-linecap="square"/>
-        </g>
-        '''
+        content = rift_icon(center_x - 40*scale, center_x - 20*scale, scale, color)
         
         svg = self.create_svg(size, size, content, background=background)
         self.save_icon(filename, svg)
@@ -358,12 +344,10 @@ class RIFTIconVariationGenerator:
     def generate_standalone_icon(self, size: int = 100, color: str = COLORS['gold'],
                                  background: str = None):
         """Icon only, no text"""
-        self.generate_standard_icon(size, color, background)
-        # Rename the file
-        old_path = os.path.join(self.output_dir, f"rift-icon-standard-{size}px.svg")
-        new_path = os.path.join(self.output_dir, f"rift-icon-standalone-{size}px.svg")
-        if os.path.exists(old_path):
-            os.rename(old_path, new_path)
+        # Same artwork as the standard icon, written straight to its own file
+        # rather than renamed afterwards, so the standard icon is left intact
+        self.generate_standard_icon(size, color, background,
+                                    filename=f"rift-icon-standalone-{size}px.svg")
     
     def generate_framed_icon(self, size: int = 100, color: str = COLORS['gold'],
                             background: str = None):
@@ -467,46 +451,19 @@ class RIFTIconVariationGenerator:
         filename = f"rift-icon-inverted-{size}px.svg"
         center_x = size / 2
         scale = size / 100
-        content = f'''
-        <g transform="translate({center_x - 40*scale}, {center_x - 20*scale}) scale({scale})">
-            <path d="M10 30 L90 30" stroke="{COLORS['emerald_dark']}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M15 60 L85 60" stroke="{COLORS['emerald_dark']}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M20 90 L80 90" stroke="{COLORS['emerald_dark']}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M25 15 L28 30 M75 15 L72 30" stroke="{COLORS['emerald_dark']}" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M30 45 L33 60 M70 45 L67 60" stroke="{COLORS['emerald_dark']}" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M50 75 L53 90 M50 75 L47 90" stroke="{COLORS['emerald_dark']}" stroke-width="2.5" stroke-linecap="square"/>
-        </g>
-        '''
+        content = rift_icon(center_x - 40*scale, center_x - 20*scale, scale, COLORS['emerald_dark'])
         svg = self.create_svg(size, size, content, background=COLORS['gold'])
         self.save_icon(filename, svg)
         
         # Monochrome gold
         filename = f"rift-icon-monochrome-gold-{size}px.svg"
-        content = f'''
-        <g transform="translate({center_x - 40*scale}, {center_x - 20*scale}) scale({scale})">
-            <path d="M10 30 L90 30" stroke="{COLORS['gold']}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M15 60 L85 60" stroke="{COLORS['gold']}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M20 90 L80 90" stroke="{COLORS['gold']}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M25 15 L28 30 M75 15 L72 30" stroke="{COLORS['gold']}" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M30 45 L33 60 M70 45 L67 60" stroke="{COLORS['gold']}" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M50 75 L53 90 M50 75 L47 90" stroke="{COLORS['gold']}" stroke-width="2.5" stroke-linecap="square"/>
-        </g>
-        '''
+        content = rift_icon(center_x - 40*scale, center_x - 20*scale, scale, COLORS['gold'])
         svg = self.create_svg(size, size, content, background=None)
         self.save_icon(filename, svg)
         
         # Monochrome emerald
         filename = f"rift-icon-monochrome-emerald-{size}px.svg"
-        content = f'''
-        <g transform="translate({center_x - 40*scale}, {center_x - 20*scale}) scale({scale})">
-            <path d="M10 30 L90 30" stroke="{COLORS['emerald_dark']}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M15 60 L85 60" stroke="{COLORS['emerald_dark']}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M20 90 L80 90" stroke="{COLORS['emerald_dark']}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M25 15 L28 30 M75 15 L72 30" stroke="{COLORS['emerald_dark']}" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M30 45 L33 60 M70 45 L67 60" stroke="{COLORS['emerald_dark']}" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M50 75 L53 90 M50 75 L47 90" stroke="{COLORS['emerald_dark']}" stroke-width="2.5" stroke-linecap="square"/>
-        </g>
-        '''
+        content = rift_icon(center_x - 40*scale, center_x - 20*scale, scale, COLORS['emerald_dark'])
         svg = self.create_svg(size, size, content, background=None)
         self.save_icon(filename, svg)
         
@@ -520,16 +477,7 @@ class RIFTIconVariationGenerator:
             </linearGradient>
         </defs>
         '''
-        content = f'''
-        <g transform="translate({center_x - 40*scale}, {center_x - 20*scale}) scale({scale})">
-            <path d="M10 30 L90 30" stroke="url(#grad-gold-emerald)" stroke-width="3" stroke-linecap="square"/>
-            <path d="M15 60 L85 60" stroke="url(#grad-gold-emerald)" stroke-width="3" stroke-linecap="square"/>
-            <path d="M20 90 L80 90" stroke="url(#grad-gold-emerald)" stroke-width="3" stroke-linecap="square"/>
-            <path d="M25 15 L28 30 M75 15 L72 30" stroke="url(#grad-gold-emerald)" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M30 45 L33 60 M70 45 L67 60" stroke="url(#grad-gold-emerald)" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M50 75 L53 90 M50 75 L47 90" stroke="url(#grad-gold-emerald)" stroke-width="2.5" stroke-linecap="square"/>
-        </g>
-        '''
+        content = rift_icon(center_x - 40*scale, center_x - 20*scale, scale, 'url(#grad-gold-emerald)')
         svg = self.create_svg(size, size, gradient_content + content, background=COLORS['emerald_dark'])
         self.save_icon(filename, svg)
     
@@ -537,9 +485,7 @@ class RIFTIconVariationGenerator:
     
     def generate_size_variations(self, style: str = 'standard'):
         """Generate icons at different sizes optimized for each"""
-        sizes = [16, 32, 64, 128, 256]
-        
-        for size in sizes:
+        for size in VARIATION_SIZES:
             if style == 'minimal':
                 self.generate_minimal_icon(size, COLORS['gold'], COLORS['emerald_dark'])
             elif style == 'standard':
@@ -551,7 +497,24 @@ class RIFTIconVariationGenerator:
             elif style == 'bold':
                 self.generate_bold_icon(size, COLORS['gold'], COLORS['emerald_dark'])
     
-    def generate_all_variations(self):
+    def rasterize_size_variations(self, jobs: int = 1):
+        """Render the whole size sweep to PNG, plus one multi-size ICO per style, in one batch"""
+        # The renderers read the SVGs from disk
+        engine.WRITER.flush()
+        raster_jobs = []
+        for style in VARIATION_STYLES:
+            sweep = [(os.path.join(self.output_dir, f"rift-icon-{style}-{size}px.svg"), size)
+                     for size in VARIATION_SIZES]
+            raster_jobs.extend(raster_job(svg_path, svg_path[:-4] + '.png') for svg_path, _ in sweep)
+            raster_jobs.append(ico_job(os.path.join(self.output_dir, f"rift-icon-{style}.ico"), sweep))
+        try:
+            stats = rasterize(raster_jobs, self.output_dir, workers=jobs)
+        except ImportError as e:
+            print(f"⚠️  {e}; skipping rasterization")
+            return
+        print(f"🖼  {stats['rendered']} frames rendered, {stats['cached']} from the render cache")
+    
+    def generate_all_variations(self, jobs: int = 1):
         """Generate all icon variations"""
         print("\n" + "="*60)
         print("🎨 RIFT Icon Variations Generator")
@@ -594,10 +557,10 @@ class RIFTIconVariationGenerator:
         
         # Size optimizations (minimal and standard styles)
         print("\n📝 Generating Size Optimizations...")
-        self.generate_size_variations('minimal')
-        self.generate_size_variations('standard')
-        self.generate_size_variations('bold')
-        total += 15  # 3 styles × 5 sizes
+        for style in VARIATION_STYLES:
+            self.generate_size_variations(style)
+        total += len(VARIATION_STYLES) * len(VARIATION_SIZES)
+        self.rasterize_size_variations(jobs)
         
         # Generate preview HTML
         self.generate_preview_html()
@@ -610,7 +573,8 @@ class RIFTIconVariationGenerator:
     
     def generate_preview_html(self):
         """Generate HTML preview of all icon variations"""
-        html = '''<!DOCTYPE html>
+        page = PreviewWriter(os.path.join(self.output_dir, 'preview.html'))
+        page.write('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -697,58 +661,74 @@ class RIFTIconVariationGenerator:
 <body>
     <h1>RIFT ICON VARIATIONS</h1>
     <p class="subtitle">Explore Different Icon Styles and Applications</p>
-'''
+''')
         
-        # Get all SVG files
+        # Get all SVG files (flush first so the listing sees this run's icons)
+        engine.WRITER.flush()
         svg_files = [f for f in os.listdir(self.output_dir) if f.endswith('.svg') and f != 'preview.html']
         svg_files.sort()
         
         # Organize by category
         categories = {
-            'Complexity': [f for f in svg_files if any(x in f for x in ['minimal', 'standard', 'enhanced', 'detailed', 'ornate'])],
-            'Style': [f for f in svg_files if any(x in f for x in ['geometric', 'organic', 'tech', 'classic', 'bold', 'subtle'])],
-            'Integration': [f for f in svg_files if any(x in f for x in ['standalone', 'framed', 'badge'])],
-            'Color': [f for f in svg_files if any(x in f for x in ['inverted', 'monochrome', 'gradient'])],
-            'Size': [f for f in svg_files if any(x in f for x in ['16px', '32px', '64px', '128px', '256px'])]
+            category: [f for f in svg_files if any(x in f for x in keywords)]
+            for category, keywords in ICON_CATEGORIES.items()
         }
         
         for category, files in categories.items():
             if not files:
                 continue
-            html += f'''
+            page.write(f'''
     <div class="category-section">
         <h2 class="category-title">{category}</h2>
         <div class="grid">
-'''
+''')
             for filename in files:
                 name = filename.replace('rift-icon-', '').replace('.svg', '').replace('-', ' ').title()
-                html += f'''
+                page.write(f'''
             <div class="icon-card">
                 <div class="icon-container">
                     <img src="{filename}" alt="{name}">
                 </div>
                 <div class="icon-name">{name}</div>
             </div>
-'''
-            html += '''
+''')
+            page.write('''
         </div>
     </div>
-'''
+''')
         
-        html += '''
+        page.write('''
 </body>
-</html>'''
+</html>''')
         
-        preview_path = os.path.join(self.output_dir, 'preview.html')
-        with open(preview_path, 'w', encoding='utf-8') as f:
-            f.write(html)
+        page.close()
         print(f"✓ Generated: preview.html")
+        
+        count = write_gallery(self.output_dir, 'RIFT Icon Variations', self.gallery_category)
+        print(f"✓ Generated: gallery.html ({count} assets indexed in assets.json)")
+    
+    def gallery_category(self, rel_path: str) -> str:
+        """Gallery category of an icon: the first preview category it falls in"""
+        filename = os.path.basename(rel_path)
+        for category, keywords in ICON_CATEGORIES.items():
+            if any(x in filename for x in keywords):
+                return category
+        return 'Other'
+
+
+engine.register_class(
+    'icon-variations', RIFTIconVariationGenerator,
+    description='Icon complexity, style, colour and size variations',
+    output_dir='output/icon-variations',
+    entry='generate_all_variations',
+    assets=engine.prefixed_assets('generate_', exclude=('generate_all_variations', 'generate_preview_html')),
+    options=('jobs',),
+)
 
 
 def main():
     """Main execution function"""
-    generator = RIFTIconVariationGenerator(output_dir='output/icon-variations')
-    generator.generate_all_variations()
+    engine.main(['icon-variations'], description='Generate RIFT icon variations')
 
 
 if __name__ == '__main__':
@@ -5,6 +5,11 @@
 import os
 from textwrap import dedent
 
+from riftkit import engine
+from riftkit.buildcache import digest, module_constants, source_of
+from riftkit.engine import COLORS, require_dirs, write_asset
+from riftkit.sprites import SpriteSheet
+
 # -------------------------
 # Paths / constants
 # -------------------------
@@ -13,12 +18,12 @@ OUTPUT_DIR = os.path.join("output", "logos-elaborate")
 PREVIEW_HTML = os.path.join(OUTPUT_DIR, "preview.html")
 
 # Brand colors
-EMERALD_DARK = "#0d4d3f"
-EMERALD_MID = "#0f3d32"
-EMERALD_BRIGHT = "#065f46"
-EMERALD_ACCENT = "#10b981"
-GOLD = "#fbbf24"
-WHITE = "#ffffff"
+EMERALD_DARK = COLORS["emerald_dark"]
+EMERALD_MID = COLORS["emerald_mid"]
+EMERALD_BRIGHT = COLORS["emerald_bright"]
+EMERALD_ACCENT = COLORS["emerald_accent"]
+GOLD = COLORS["gold"]
+WHITE = COLORS["white"]
 
 SVG_HEADER = (
     '<svg xmlns="http://www.w3.org/2000/svg" '
@@ -32,7 +37,7 @@ SVG_FOOTER = "</svg>"
 # -------------------------
 
 def ensure_output_dir():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    require_dirs(OUTPUT_DIR)
 
 
 def base_defs():
@@ -779,21 +784,33 @@ LOGO_GENERATORS = [
 # File writing
 # -------------------------
 
-def write_svg_files():
+def write_svg_file(name, fn):
+    filename = f"rift-logo-{name}.svg"
+    write_asset(os.path.join(OUTPUT_DIR, filename), fn(), filename)
+
+
+def write_svg_files(cache=None):
     ensure_output_dir()
+    # Every logo pulls in the shared defs and lettering
+    salt = digest(module_constants(__name__), source_of(base_defs), source_of(text_path_RIFT))
     for name, fn in LOGO_GENERATORS:
-        path = os.path.join(OUTPUT_DIR, f"rift-logo-{name}.svg")
-        svg = fn()
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(svg)
-        print(f"✓ Generated: rift-logo-{name}.svg")
+        if cache is None:
+            write_svg_file(name, fn)
+        else:
+            cache.build(f"elaborate.{name}", digest(salt, source_of(fn)),
+                        write_svg_file, name, fn)
 
 
-def write_preview_html():
+def write_preview_html(sprites=False):
     """
     Dark-theme preview page, logos grouped by category.
+    With sprites=True the logos are inlined and share one copy of base_defs().
     """
     ensure_output_dir()
+    sheet = None
+    if sprites:
+        sheet = SpriteSheet()
+        engine.WRITER.flush()
 
     sections = {
         "3D & Dimensional": LOGO_GENERATORS[0:4],
@@ -837,6 +854,10 @@ def write_preview_html():
         "</p>",
     ]
 
+    if sheet is not None:
+        html_parts.insert(html_parts.index("</style>"),
+                          ".thumb svg{max-width:100%;height:auto;border-radius:8px;}")
+
     for section_title, items in sections.items():
         html_parts.append(f"<h2>{section_title}</h2>")
         html_parts.append('<div class="grid">')
@@ -848,31 +869,43 @@ def write_preview_html():
                 f'{name.replace("-", " ").title()}</div>'
             )
             html_parts.append('<div class="thumb">')
-            html_parts.append(
-                f'<a href="{svg_file}" target="_blank">'
-                f'<img src="{svg_file}" alt="{name} logo"/></a>'
-            )
+            if sheet is None:
+                thumb = f'<img src="{svg_file}" alt="{name} logo"/>'
+            else:
+                with open(os.path.join(OUTPUT_DIR, svg_file), "r", encoding="utf-8") as f:
+                    thumb = sheet.inline(f.read())
+            html_parts.append(f'<a href="{svg_file}" target="_blank">{thumb}</a>')
             html_parts.append("</div></div>")
         html_parts.append("</div>")
 
+    if sheet is not None:
+        html_parts.append(sheet.markup())
     html_parts.append("</body></html>")
 
-    with open(PREVIEW_HTML, "w", encoding="utf-8") as f:
-        f.write("\n".join(html_parts))
+    write_asset(PREVIEW_HTML, "\n".join(html_parts))
     print(f"✓ Generated: preview.html")
 
 
-def main():
+def build(cache, args):
     print("\n🎨 RIFT Elaborate Logo Generator")
     print("=" * 60)
     print(f"Output directory: {OUTPUT_DIR}\n")
-    write_svg_files()
-    write_preview_html()
+    write_svg_files(cache)
+    write_preview_html(sprites=args.sprites)
     print("\n" + "=" * 60)
     print("✅ All 20 elaborate logos generated successfully!")
     print(f"📁 Files saved to: {OUTPUT_DIR}")
     print(f"🌐 Preview: {PREVIEW_HTML}")
 
 
+engine.register("logos-elaborate", "20 layered logos with shared gradients and filters",
+                OUTPUT_DIR, build, options=("sprites",),
+                preview=lambda args: write_preview_html(sprites=args.sprites))
+
+
+def main():
+    engine.main(["logos-elaborate"], description="Generate elaborate RIFT logos")
+
+
 if __name__ == "__main__":
     main()
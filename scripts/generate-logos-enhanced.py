@@ -9,16 +9,10 @@ License: MIT
 import os
 from typing import Dict, List, Tuple
 
-# Brand Colors
-COLORS = {
-    'emerald_dark': '#0d4d3f',
-    'emerald_mid': '#0f3d32',
-    'emerald_bright': '#065f46',
-    'emerald_accent': '#10b981',
-    'gold': '#fbbf24',
-    'white': '#ffffff',
-    'black': '#000000'
-}
+from riftkit import engine
+from riftkit.engine import (COLORS, INTER_FONT_DEFS, require_dirs, rift_icon, rift_letterforms,
+                            svg_document, write_asset)
+from riftkit.preview import PreviewWriter
 
 class RIFTLogoGenerator:
     """Generates RIFT logo variations with elegant, modern typography"""
@@ -29,24 +23,11 @@ class RIFTLogoGenerator:
     
     def ensure_output_dir(self):
         """Create output directory if it doesn't exist"""
-        os.makedirs(self.output_dir, exist_ok=True)
+        require_dirs(self.output_dir)
     
     def get_rift_icon(self, x: float, y: float, scale: float = 1.0, color: str = COLORS['gold']) -> str:
         """Generate the volcanic rift icon SVG paths"""
-        s = scale
-        return f'''
-        <!-- Volcanic Rift Icon -->
-        <g transform="translate({x}, {y}) scale({s})">
-            <!-- Horizontal lines -->
-            <path d="M10 30 L90 30" stroke="{color}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M15 60 L85 60" stroke="{color}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M20 90 L80 90" stroke="{color}" stroke-width="3" stroke-linecap="square"/>
-            <!-- Angular cracks -->
-            <path d="M25 15 L28 30 M75 15 L72 30" stroke="{color}" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M30 45 L33 60 M70 45 L67 60" stroke="{color}" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M50 75 L53 90 M50 75 L47 90" stroke="{color}" stroke-width="2.5" stroke-linecap="square"/>
-        </g>
-        '''
+        return rift_icon(x, y, scale, color)
     
     # ==================== ELEGANT TYPOGRAPHY STYLES ====================
     
@@ -54,37 +35,7 @@ class RIFTLogoGenerator:
         """Elegant serif with refined curves and sharp accents"""
         scale = size / 60
         sw = 3 * scale  # Stroke width for thin elegant lines
-        
-        # R: Elegant with curved top bowl and flowing diagonal
-        r_path = f'''
-            M {x} {y + 60*scale} L {x} {y}
-            Q {x + 20*scale} {y} {x + 25*scale} {y + 12*scale}
-            Q {x + 28*scale} {y + 20*scale} {x + 25*scale} {y + 28*scale}
-            L {x} {y + 28*scale}
-            M {x + 10*scale} {y + 28*scale} Q {x + 25*scale} {y + 45*scale} {x + 32*scale} {y + 60*scale}
-        '''
-        
-        # I: Elegant with subtle curves at caps
-        i_path = f'''
-            M {x + 52*scale} {y} L {x + 52*scale} {y + 60*scale}
-            M {x + 42*scale} {y} Q {x + 47*scale} {y + 3*scale} {x + 52*scale} {y + 3*scale}
-            Q {x + 57*scale} {y + 3*scale} {x + 62*scale} {y}
-            M {x + 42*scale} {y + 60*scale} Q {x + 47*scale} {y + 57*scale} {x + 52*scale} {y + 57*scale}
-            Q {x + 57*scale} {y + 57*scale} {x + 62*scale} {y + 60*scale}
-        '''
-        
-        # F: Flowing with elegant crossbar
-        f_path = f'''
-            M {x + 82*scale} {y + 60*scale} L {x + 82*scale} {y}
-            Q {x + 95*scale} {y} {x + 108*scale} {y}
-            M {x + 82*scale} {y + 28*scale} Q {x + 92*scale} {y + 28*scale} {x + 102*scale} {y + 28*scale}
-        '''
-        
-        # T: Sophisticated with curved top and sharp vertical
-        t_path = f'''
-            M {x + 120*scale} {y} Q {x + 138*scale} {y} {x + 158*scale} {y}
-            M {x + 139*scale} {y} L {x + 139*scale} {y + 60*scale}
-        '''
+        r_path, i_path, f_path, t_path = rift_letterforms('elegant_serif', x, y, size)
         
         return f'''
         <g>
@@ -103,41 +54,7 @@ class RIFTLogoGenerator:
         """Flowing connected script style with smooth curves"""
         scale = size / 60
         sw = 3.5 * scale
-        
-        # R: Flowing script with connected curves
-        r_path = f'''
-            M {x} {y + 60*scale}
-            Q {x} {y + 50*scale} {x} {y + 20*scale}
-            Q {x} {y} {x + 15*scale} {y}
-            Q {x + 28*scale} {y} {x + 28*scale} {y + 15*scale}
-            Q {x + 28*scale} {y + 25*scale} {x + 15*scale} {y + 28*scale}
-            Q {x + 5*scale} {y + 28*scale} {x + 5*scale} {y + 35*scale}
-            Q {x + 12*scale} {y + 42*scale} {x + 25*scale} {y + 60*scale}
-        '''
-        
-        # I: Simple flowing vertical with subtle curve
-        i_path = f'''
-            M {x + 48*scale} {y + 2*scale}
-            Q {x + 48*scale} {y + 30*scale} {x + 48*scale} {y + 60*scale}
-        '''
-        
-        # F: Flowing F with connected strokes
-        f_path = f'''
-            M {x + 68*scale} {y + 60*scale}
-            Q {x + 68*scale} {y + 40*scale} {x + 68*scale} {y + 15*scale}
-            Q {x + 68*scale} {y} {x + 82*scale} {y}
-            Q {x + 95*scale} {y} {x + 105*scale} {y}
-            M {x + 68*scale} {y + 28*scale}
-            Q {x + 75*scale} {y + 27*scale} {x + 88*scale} {y + 28*scale}
-        '''
-        
-        # T: Elegant flowing T
-        t_path = f'''
-            M {x + 115*scale} {y + 3*scale}
-            Q {x + 130*scale} {y} {x + 148*scale} {y + 3*scale}
-            M {x + 132*scale} {y + 2*scale}
-            Q {x + 132*scale} {y + 30*scale} {x + 132*scale} {y + 60*scale}
-        '''
+        r_path, i_path, f_path, t_path = rift_letterforms('flowing_script', x, y, size)
         
         return f'''
         <g>
@@ -156,35 +73,7 @@ class RIFTLogoGenerator:
         """Modern sans-serif with elegant proportions and subtle curves"""
         scale = size / 60
         sw = 4 * scale
-        
-        # R: Modern with subtle curve at top
-        r_path = f'''
-            M {x} {y + 60*scale} L {x} {y + 5*scale}
-            Q {x} {y} {x + 5*scale} {y}
-            L {x + 20*scale} {y}
-            Q {x + 30*scale} {y} {x + 30*scale} {y + 14*scale}
-            Q {x + 30*scale} {y + 26*scale} {x + 18*scale} {y + 26*scale}
-            L {x} {y + 26*scale}
-            M {x + 8*scale} {y + 26*scale} L {x + 30*scale} {y + 60*scale}
-        '''
-        
-        # I: Clean minimal I
-        i_path = f'''
-            M {x + 52*scale} {y} L {x + 52*scale} {y + 60*scale}
-        '''
-        
-        # F: Modern clean F
-        f_path = f'''
-            M {x + 74*scale} {y + 60*scale} L {x + 74*scale} {y}
-            L {x + 105*scale} {y}
-            M {x + 74*scale} {y + 28*scale} L {x + 98*scale} {y + 28*scale}
-        '''
-        
-        # T: Clean modern T
-        t_path = f'''
-            M {x + 117*scale} {y} L {x + 155*scale} {y}
-            M {x + 136*scale} {y} L {x + 136*scale} {y + 60*scale}
-        '''
+        r_path, i_path, f_path, t_path = rift_letterforms('modern_sans', x, y, size)
         
         return f'''
         <g>
@@ -203,33 +92,7 @@ class RIFTLogoGenerator:
         """Italic style with forward lean and dynamic energy"""
         scale = size / 60
         sw = 3.5 * scale
-        
-        # R: Italic with dynamic flow
-        r_path = f'''
-            M {x + 8*scale} {y + 60*scale} L {x + 18*scale} {y}
-            L {x + 38*scale} {y}
-            Q {x + 43*scale} {y + 12*scale} {x + 38*scale} {y + 25*scale}
-            L {x + 18*scale} {y + 25*scale}
-            M {x + 23*scale} {y + 25*scale} L {x + 38*scale} {y + 60*scale}
-        '''
-        
-        # I: Slanted I
-        i_path = f'''
-            M {x + 60*scale} {y} L {x + 50*scale} {y + 60*scale}
-        '''
-        
-        # F: Italic F
-        f_path = f'''
-            M {x + 70*scale} {y + 60*scale} L {x + 80*scale} {y}
-            L {x + 108*scale} {y}
-            M {x + 75*scale} {y + 28*scale} L {x + 98*scale} {y + 28*scale}
-        '''
-        
-        # T: Italic T
-        t_path = f'''
-            M {x + 120*scale} {y} L {x + 155*scale} {y}
-            M {x + 138*scale} {y} L {x + 128*scale} {y + 60*scale}
-        '''
+        r_path, i_path, f_path, t_path = rift_letterforms('italic_dynamic', x, y, size)
         
         return f'''
         <g>
@@ -248,40 +111,7 @@ class RIFTLogoGenerator:
         """Brush stroke style with organic, hand-drawn feel"""
         scale = size / 60
         sw = 5 * scale
-        
-        # R: Organic brush strokes
-        r_path = f'''
-            M {x} {y + 60*scale}
-            Q {x - 2*scale} {y + 40*scale} {x} {y + 10*scale}
-            Q {x + 2*scale} {y} {x + 18*scale} {y}
-            Q {x + 30*scale} {y + 5*scale} {x + 28*scale} {y + 18*scale}
-            Q {x + 26*scale} {y + 28*scale} {x + 12*scale} {y + 28*scale}
-            M {x + 12*scale} {y + 30*scale}
-            Q {x + 20*scale} {y + 45*scale} {x + 30*scale} {y + 60*scale}
-        '''
-        
-        # I: Organic I
-        i_path = f'''
-            M {x + 50*scale} {y}
-            Q {x + 51*scale} {y + 30*scale} {x + 49*scale} {y + 60*scale}
-        '''
-        
-        # F: Brush stroke F
-        f_path = f'''
-            M {x + 69*scale} {y + 60*scale}
-            Q {x + 70*scale} {y + 30*scale} {x + 69*scale} {y + 3*scale}
-            Q {x + 80*scale} {y} {x + 98*scale} {y + 2*scale}
-            M {x + 69*scale} {y + 28*scale}
-            Q {x + 78*scale} {y + 27*scale} {x + 88*scale} {y + 29*scale}
-        '''
-        
-        # T: Organic T
-        t_path = f'''
-            M {x + 108*scale} {y + 2*scale}
-            Q {x + 125*scale} {y} {x + 148*scale} {y + 2*scale}
-            M {x + 128*scale} {y + 2*scale}
-            Q {x + 129*scale} {y + 30*scale} {x + 128*scale} {y + 60*scale}
-        '''
+        r_path, i_path, f_path, t_path = rift_letterforms('brush_stroke', x, y, size)
         
         return f'''
         <g>
@@ -300,33 +130,7 @@ class RIFTLogoGenerator:
         """Condensed elegant style - tall and refined"""
         scale = size / 60
         sw = 3 * scale
-        
-        # R: Tall condensed R
-        r_path = f'''
-            M {x} {y + 60*scale} L {x} {y}
-            L {x + 15*scale} {y}
-            Q {x + 22*scale} {y + 8*scale} {x + 15*scale} {y + 22*scale}
-            L {x} {y + 22*scale}
-            M {x + 7*scale} {y + 22*scale} L {x + 22*scale} {y + 60*scale}
-        '''
-        
-        # I: Tall I
-        i_path = f'''
-            M {x + 40*scale} {y} L {x + 40*scale} {y + 60*scale}
-        '''
-        
-        # F: Condensed F
-        f_path = f'''
-            M {x + 58*scale} {y + 60*scale} L {x + 58*scale} {y}
-            L {x + 78*scale} {y}
-            M {x + 58*scale} {y + 28*scale} L {x + 73*scale} {y + 28*scale}
-        '''
-        
-        # T: Condensed T
-        t_path = f'''
-            M {x + 88*scale} {y} L {x + 118*scale} {y}
-            M {x + 103*scale} {y} L {x + 103*scale} {y + 60*scale}
-        '''
+        r_path, i_path, f_path, t_path = rift_letterforms('condensed_elegant', x, y, size)
         
         return f'''
         <g>
@@ -352,25 +156,11 @@ class RIFTLogoGenerator:
     
     def create_svg(self, width: int, height: int, content: str, viewbox: str = None) -> str:
         """Wrap content in SVG tags"""
-        if viewbox is None:
-            viewbox = f"0 0 {width} {height}"
-        
-        return f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewbox}" width="{width}" height="{height}">
-    <defs>
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;700&amp;display=swap');
-        </style>
-    </defs>
-    {content}
-</svg>'''
+        return svg_document(width, height, INTER_FONT_DEFS, content, viewbox=viewbox)
     
     def save_logo(self, filename: str, svg_content: str):
         """Save SVG content to file"""
-        filepath = os.path.join(self.output_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(svg_content)
-        print(f"✓ Generated: {filename}")
+        write_asset(os.path.join(self.output_dir, filename), svg_content, filename)
     
     # ==================== LOGO VARIATIONS WITH ELEGANT TYPOGRAPHY ====================
     
@@ -628,7 +418,8 @@ class RIFTLogoGenerator:
     
     def generate_preview_html(self):
         """Generate HTML preview of all logos"""
-        html = '''<!DOCTYPE html>
+        page = PreviewWriter(os.path.join(self.output_dir, 'preview.html'))
+        page.write('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -703,7 +494,7 @@ class RIFTLogoGenerator:
     <p class="subtitle">Enhanced Typography Edition - 20 Elegant Designs</p>
     
     <div class="grid">
-'''
+''')
         
         logos = [
             ('rift-logo-01-elegant-serif-horizontal.svg', 'Elegant Serif Horizontal', 'Refined serif with curved accents'),
@@ -729,7 +520,7 @@ class RIFTLogoGenerator:
         ]
         
         for filename, name, description in logos:
-            html += f'''
+            page.write(f'''
         <div class="logo-card">
             <div class="logo-container">
                 <img src="{filename}" alt="{name}">
@@ -737,23 +528,29 @@ class RIFTLogoGenerator:
             <div class="logo-name">{name}</div>
             <div class="logo-description">{description}</div>
         </div>
-'''
+''')
         
-        html += '''
+        page.write('''
     </div>
 </body>
-</html>'''
+</html>''')
         
-        preview_path = os.path.join(self.output_dir, 'preview.html')
-        with open(preview_path, 'w', encoding='utf-8') as f:
-            f.write(html)
+        page.close()
         print(f"✓ Generated: preview.html")
 
 
+engine.register_class(
+    'logos-enhanced', RIFTLogoGenerator,
+    description='20 logos with elegant typography',
+    output_dir='output/logos-enhanced',
+    entry='generate_all',
+    assets=engine.prefixed_assets('logo_'),
+)
+
+
 def main():
     """Main execution function"""
-    generator = RIFTLogoGenerator(output_dir='output/logos-enhanced')
-    generator.generate_all()
+    engine.main(['logos-enhanced'], description='Generate RIFT enhanced typography logos')
 
 
 if __name__ == '__main__':
@@ -9,16 +9,10 @@ License: MIT
 import os
 from typing import Dict, List, Tuple
 
-# Brand Colors
-COLORS = {
-    'emerald_dark': '#0d4d3f',
-    'emerald_mid': '#0f3d32',
-    'emerald_bright': '#065f46',
-    'emerald_accent': '#10b981',
-    'gold': '#fbbf24',
-    'white': '#ffffff',
-    'black': '#000000'
-}
+from riftkit import engine
+from riftkit.engine import (COLORS, INTER_FONT_DEFS, require_dirs, rift_icon, rift_text_geometric,
+                            svg_document, write_asset)
+from riftkit.preview import PreviewWriter
 
 class RIFTLogoGenerator:
     """Generates RIFT logo variations in SVG format"""
@@ -29,72 +23,16 @@ class RIFTLogoGenerator:
     
     def ensure_output_dir(self):
         """Create output directory if it doesn't exist"""
-        os.makedirs(self.output_dir, exist_ok=True)
+        require_dirs(self.output_dir)
     
     def get_rift_icon(self, x: float, y: float, scale: float = 1.0, color: str = COLORS['gold']) -> str:
         """Generate the volcanic rift icon SVG paths"""
-        s = scale
-        return f'''
-        <!-- Volcanic Rift Icon -->
-        <g transform="translate({x}, {y}) scale({s})">
-            <!-- Horizontal lines -->
-            <path d="M10 30 L90 30" stroke="{color}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M15 60 L85 60" stroke="{color}" stroke-width="3" stroke-linecap="square"/>
-            <path d="M20 90 L80 90" stroke="{color}" stroke-width="3" stroke-linecap="square"/>
-            <!-- Angular cracks -->
-            <path d="M25 15 L28 30 M75 15 L72 30" stroke="{color}" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M30 45 L33 60 M70 45 L67 60" stroke="{color}" stroke-width="2.5" stroke-linecap="square"/>
-            <path d="M50 75 L53 90 M50 75 L47 90" stroke="{color}" stroke-width="2.5" stroke-linecap="square"/>
-        </g>
-        '''
+        return rift_icon(x, y, scale, color)
     
     def get_rift_text_geometric(self, x: float, y: float, size: float = 60, 
                                 color: str = COLORS['white'], weight: str = 'bold') -> str:
         """Generate custom geometric RIFT letterforms as SVG paths"""
-        scale = size / 60  # Base size is 60
-        stroke_width = 8 if weight == 'bold' else 6
-        
-        # Custom geometric letterforms for R-I-F-T
-        # R: Vertical line + angled top + diagonal leg
-        r_path = f'''
-            M {x + 0*scale} {y + 60*scale} L {x + 0*scale} {y + 0*scale}
-            L {x + 25*scale} {y + 0*scale} L {x + 30*scale} {y + 15*scale}
-            L {x + 25*scale} {y + 30*scale} L {x + 0*scale} {y + 30*scale}
-            M {x + 12*scale} {y + 30*scale} L {x + 30*scale} {y + 60*scale}
-        '''
-        
-        # I: Simple vertical line with top and bottom caps
-        i_path = f'''
-            M {x + 50*scale} {y + 0*scale} L {x + 50*scale} {y + 60*scale}
-            M {x + 40*scale} {y + 0*scale} L {x + 60*scale} {y + 0*scale}
-            M {x + 40*scale} {y + 60*scale} L {x + 60*scale} {y + 60*scale}
-        '''
-        
-        # F: Vertical line + two horizontal lines (top and middle)
-        f_path = f'''
-            M {x + 80*scale} {y + 60*scale} L {x + 80*scale} {y + 0*scale}
-            L {x + 110*scale} {y + 0*scale}
-            M {x + 80*scale} {y + 28*scale} L {x + 105*scale} {y + 28*scale}
-        '''
-        
-        # T: Horizontal top + vertical center
-        t_path = f'''
-            M {x + 125*scale} {y + 0*scale} L {x + 165*scale} {y + 0*scale}
-            M {x + 145*scale} {y + 0*scale} L {x + 145*scale} {y + 60*scale}
-        '''
-        
-        return f'''
-        <g>
-            <path d="{r_path}" stroke="{color}" stroke-width="{stroke_width*scale}" 
-                  fill="none" stroke-linecap="square" stroke-linejoin="miter"/>
-            <path d="{i_path}" stroke="{color}" stroke-width="{stroke_width*scale}" 
-                  fill="none" stroke-linecap="square"/>
-            <path d="{f_path}" stroke="{color}" stroke-width="{stroke_width*scale}" 
-                  fill="none" stroke-linecap="square"/>
-            <path d="{t_path}" stroke="{color}" stroke-width="{stroke_width*scale}" 
-                  fill="none" stroke-linecap="square"/>
-        </g>
-        '''
+        return rift_text_geometric(x, y, size, color, weight)
     
     def get_tagline(self, x: float, y: float, size: float = 12, color: str = COLORS['gold']) -> str:
         """Generate tagline text"""
@@ -107,25 +45,11 @@ class RIFTLogoGenerator:
     
     def create_svg(self, width: int, height: int, content: str, viewbox: str = None) -> str:
         """Wrap content in SVG tags"""
-        if viewbox is None:
-            viewbox = f"0 0 {width} {height}"
-        
-        return f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewbox}" width="{width}" height="{height}">
-    <defs>
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;700&amp;display=swap');
-        </style>
-    </defs>
-    {content}
-</svg>'''
+        return svg_document(width, height, INTER_FONT_DEFS, content, viewbox=viewbox)
     
     def save_logo(self, filename: str, svg_content: str):
         """Save SVG content to file"""
-        filepath = os.path.join(self.output_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(svg_content)
-        print(f"✓ Generated: {filename}")
+        write_asset(os.path.join(self.output_dir, filename), svg_content, filename)
     
     # ==================== LOGO VARIATIONS ====================
     
@@ -389,7 +313,8 @@ class RIFTLogoGenerator:
     
     def generate_preview_html(self):
         """Generate HTML preview of all logos"""
-        html = '''<!DOCTYPE html>
+        page = PreviewWriter(os.path.join(self.output_dir, 'preview.html'))
+        page.write('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -462,7 +387,7 @@ class RIFTLogoGenerator:
     <p class="subtitle">20 Professional Logo Designs for Custom Bike Shop</p>
     
     <div class="grid">
-'''
+''')
         
         logos = [
             ('rift-logo-01-horizontal-primary.svg', 'Horizontal Primary', 'Icon left, text right - Main logo'),
@@ -488,7 +413,7 @@ class RIFTLogoGenerator:
         ]
         
         for filename, name, description in logos:
-            html += f'''
+            page.write(f'''
         <div class="logo-card">
             <div class="logo-container">
                 <img src="{filename}" alt="{name}">
@@ -496,26 +421,29 @@ class RIFTLogoGenerator:
             <div class="logo-name">{name}</div>
             <div class="logo-description">{description}</div>
         </div>
-'''
+''')
         
-        html += '''
+        page.write('''
     </div>
 </body>
-</html>'''
+</html>''')
         
-        preview_path = os.path.join(self.output_dir, 'preview.html')
-        with open(preview_path, 'w', encoding='utf-8') as f:
-            f.write(html)
+        page.close()
         print(f"✓ Generated: preview.html")
 
 
+engine.register_class(
+    'logos', RIFTLogoGenerator,
+    description='20 core logo variations',
+    output_dir='output/logos',
+    entry='generate_all',
+    assets=engine.prefixed_assets('logo_'),
+)
+
+
 def main():
     """Main execution function"""
-    # You can customize the output directory here
-    generator = RIFTLogoGenerator(output_dir='output/logos')
-    
-    # Generate all 20 logos
-    generator.generate_all()
+    engine.main(['logos'], description='Generate RIFT logo variations')
 
 
 if __name__ == '__main__':
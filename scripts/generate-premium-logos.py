@@ -6,52 +6,58 @@ the "rift" concept, and Tour de France-level excellence - without being tacky.
 """
 
 import os
+import re
+import time
+import inspect
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple
 import math
 
-# Brand Colors
-COLORS = {
-    'emerald_dark': '#0d4d3f',
-    'emerald_mid': '#0f3d32',
-    'emerald_bright': '#065f46',
-    'emerald_accent': '#10b981',
-    'gold': '#fbbf24',
-    'white': '#ffffff',
-    'black': '#000000'
+from riftkit import engine, profiling
+from riftkit.buildcache import recording
+from riftkit.engine import COLORS, background_rect, require_dirs, svg_document, write_asset
+from riftkit.gallery import write_gallery
+from riftkit.outline import has_text
+from riftkit.preview import PreviewWriter
+from riftkit.sprites import SpriteSheet
+
+# generate_* methods that drive the run rather than produce a design
+NON_DESIGN_METHODS = {
+    'generate_all_variations',
+    'generate_designs',
+    'generate_designs_parallel',
+    'generate_preview_html',
 }
 
 
 class RIFTPremiumLogoGenerator:
     """Generates premium, sophisticated logo variations"""
     
-    def __init__(self, output_dir: str = 'output/premium-logos'):
+    def __init__(self, output_dir: str = 'output/premium-logos', verbose: bool = True):
         self.output_dir = output_dir
+        self.verbose = verbose
         self.ensure_output_dir()
     
+    @classmethod
+    def design_methods(cls) -> List[str]:
+        """Names of all design methods, in definition order"""
+        return [name for name in vars(cls)
+                if name.startswith('generate_') and name not in NON_DESIGN_METHODS]
+    
     def ensure_output_dir(self):
         """Create output directory if it doesn't exist"""
-        os.makedirs(self.output_dir, exist_ok=True)
+        require_dirs(self.output_dir)
     
     def create_svg(self, width: int, height: int, content: str, 
                   viewbox: str = None, background: str = None) -> str:
         """Wrap content in SVG tags"""
-        if viewbox is None:
-            viewbox = f"0 0 {width} {height}"
-        
-        bg = f'<rect width="{width}" height="{height}" fill="{background}"/>' if background else ''
-        
-        return f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewbox}" width="{width}" height="{height}">
-    {bg}
-    {content}
-</svg>'''
+        return svg_document(width, height, background_rect(width, height, background), content,
+                            viewbox=viewbox)
     
     def save_logo(self, filename: str, svg_content: str):
         """Save SVG content to file"""
-        filepath = os.path.join(self.output_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(svg_content)
-        print(f"✓ Generated: {filename}")
+        write_asset(os.path.join(self.output_dir, filename), svg_content,
+                    filename if self.verbose else None)
     
     # ===== PREMIUM ABSTRACT DESIGNS =====
     
@@ -2510,13 +2516,44 @@ class RIFTPremiumLogoGenerator:
         svg = self.create_svg(width, height, content, background=COLORS['emerald_dark'])
         self.save_logo(filename, svg)
     
-    def generate_all_variations(self):
+    @classmethod
+    def design_sections(cls) -> Dict[str, str]:
+        """Map each design's filename to the collection (# ===== header) it is defined under"""
+        lines, start = inspect.getsourcelines(cls)
+        headers = [(start + i, m.group(1).title())
+                   for i, line in enumerate(lines)
+                   for m in [re.match(r'\s*# ===== (.+?) =====', line)] if m]
+        sections = {}
+        for method_name in cls.design_methods():
+            first_line = getattr(cls, method_name).__code__.co_firstlineno
+            section = [title for line_no, title in headers if line_no < first_line]
+            filename = 'rift-logo-' + method_name[len('generate_'):].replace('_', '-') + '.svg'
+            sections[filename] = section[-1] if section else 'Other'
+        return sections
+    
+    def generate_all_variations(self, jobs: int = 1, sprites: bool = False):
         """Generate all premium logo variations"""
         print("\n" + "="*60)
         print("🎨 RIFT Premium Logo Variations Generator")
         print("="*60)
         print(f"📁 Output directory: {self.output_dir}\n")
         
+        if jobs > 1:
+            self.generate_designs_parallel(jobs)
+        else:
+            self.generate_designs()
+        
+        # Generate preview HTML
+        self.generate_preview_html(sprites=sprites)
+        
+        print("\n" + "="*60)
+        print(f"✅ Generated {len(self.design_methods())} premium logo variations!")
+        print(f"📁 Files saved to: {self.output_dir}/")
+        print(f"🌐 Preview: {os.path.join(self.output_dir, 'preview.html')}")
+        print("="*60)
+    
+    def generate_designs(self):
+        """Generate every design one after another, grouped by collection"""
         print("📝 Generating Premium Abstract Designs...")
         self.generate_geometric_rift()
         self.generate_velocity_streak()
@@ -2626,26 +2663,78 @@ class RIFTPremiumLogoGenerator:
         self.generate_dynamic_atomic_force()
         self.generate_speed_atom_chain()
         self.generate_racing_energy_split()
-        
-        # Generate preview HTML
-        self.generate_preview_html()
-        
-        print("\n" + "="*60)
-        print(f"✅ Generated 96 premium logo variations!")
-        print(f"📁 Files saved to: {self.output_dir}/")
-        print(f"🌐 Preview: {os.path.join(self.output_dir, 'preview.html')}")
-        print("="*60)
     
-    def generate_preview_html(self):
-        """Generate HTML preview of all logo variations"""
-        html = '''<!DOCTYPE html>
+    def generate_designs_parallel(self, jobs: int):
+        """Fan the design methods out over a process pool.
+        
+        Each design writes its own file, so workers never touch the same path
+        and the output is byte-identical to the serial run. Results are
+        reported in definition order once every worker has finished. When the
+        design methods are routed through a build cache, up-to-date designs
+        are skipped before any work is handed out.
+        """
+        methods = []
+        for method_name in self.design_methods():
+            method = getattr(self, method_name)
+            cache = getattr(method, 'build_cache', None)
+            if cache is not None:
+                key, fingerprint = method.cache_key()
+                if cache.is_fresh(key, fingerprint):
+                    cache.skip(key)
+                    continue
+            methods.append(method_name)
+        print(f"📝 Generating {len(methods)} designs across {jobs} worker processes...")
+        
+        # Workers are forked, so hand them an empty write buffer
+        engine.WRITER.flush()
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_render_design,
+                                    [self.output_dir] * len(methods), methods))
+        wall = time.perf_counter() - start
+        
+        busy = 0.0
+        for method_name, outputs, elapsed, minify_stats in results:
+            busy += elapsed
+            engine.WRITER.add_minify_stats(minify_stats)
+            method = getattr(self, method_name)
+            if hasattr(method, 'build_cache'):
+                method.build_cache.record(*method.cache_key(), outputs)
+            profiling.record_asset(os.path.join(self.output_dir, method_name), elapsed, outputs)
+            for path, changed, _ in outputs:
+                status = "✓ Generated" if changed else "· Unchanged"
+                print(f"{status}: {os.path.basename(path)} ({elapsed * 1000:.1f}ms)")
+        
+        slowest = sorted(results, key=lambda r: r[2], reverse=True)[:5]
+        print(f"\n⏱  {len(methods)} designs in {wall:.2f}s wall, {busy:.2f}s summed across workers")
+        for method_name, _, elapsed, _ in slowest:
+            print(f"   {elapsed * 1000:8.1f}ms  {method_name}")
+    
+    def generate_preview_html(self, sprites: bool = False):
+        """Generate HTML preview of all logo variations.
+        With sprites=True the inlined designs share one sheet of defs and icons.
+        """
+        # Flush first so the listing sees this run's designs
+        engine.WRITER.flush()
+        sheet = SpriteSheet() if sprites else None
+        svg_files = [f for f in os.listdir(self.output_dir) if f.endswith('.svg') and f != 'preview.html']
+        svg_files.sort()
+        # The inlined designs only need the web fonts for lettering left as <text>
+        web_fonts = engine.WRITER.outliner is None or any(
+            has_text(os.path.join(self.output_dir, filename)) for filename in svg_files)
+        
+        page = PreviewWriter(os.path.join(self.output_dir, 'preview.html'))
+        page.write('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>RIFT Premium Logo Variations</title>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;700&family=Montserrat:wght@400;700&family=Space+Grotesk:wght@400;700&family=Orbitron:wght@400;700&family=Playfair+Display:wght@400;700&family=Cinzel:wght@400;600;700&family=Spectral:wght@300;400;600;700&family=Bebas+Neue&family=Outfit:wght@300;400;700;900&family=Plus+Jakarta+Sans:wght@400;600;700&family=Manrope:wght@300;400;700;800&family=Sora:wght@300;400;600;700&family=Epilogue:wght@400;600;700;900&family=Cormorant+Garamond:wght@300;400;700&family=Nunito+Sans:wght@300;400;700;900&family=Rajdhani:wght@300;400;600;700&family=Righteous&family=Russo+One&family=Titillium+Web:wght@300;400;600;700;900&family=Exo+2:wght@300;400;600;700;900&family=Kanit:wght@300;400;600;700;900&family=Raleway:wght@300;400;600;700;900&family=Work+Sans:wght@300;400;600;700&family=DM+Sans:wght@400;700&family=Oswald:wght@300;400;600;700&family=Anton&family=Ubuntu:wght@300;400;700&family=Lora:wght@400;700&family=Merriweather:wght@300;400;700;900&family=Libre+Baskerville:wght@400;700&family=Crimson+Text:wght@400;600;700&family=Black+Ops+One&family=Abril+Fatface&family=JetBrains+Mono:wght@400;700&display=swap" rel="stylesheet">
-    <style>
+''')
+        if web_fonts:
+            page.write('''    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;700&family=Montserrat:wght@400;700&family=Space+Grotesk:wght@400;700&family=Orbitron:wght@400;700&family=Playfair+Display:wght@400;700&family=Cinzel:wght@400;600;700&family=Spectral:wght@300;400;600;700&family=Bebas+Neue&family=Outfit:wght@300;400;700;900&family=Plus+Jakarta+Sans:wght@400;600;700&family=Manrope:wght@300;400;700;800&family=Sora:wght@300;400;600;700&family=Epilogue:wght@400;600;700;900&family=Cormorant+Garamond:wght@300;400;700&family=Nunito+Sans:wght@300;400;700;900&family=Rajdhani:wght@300;400;600;700&family=Righteous&family=Russo+One&family=Titillium+Web:wght@300;400;600;700;900&family=Exo+2:wght@300;400;600;700;900&family=Kanit:wght@300;400;600;700;900&family=Raleway:wght@300;400;600;700;900&family=Work+Sans:wght@300;400;600;700&family=DM+Sans:wght@400;700&family=Oswald:wght@300;400;600;700&family=Anton&family=Ubuntu:wght@300;400;700&family=Lora:wght@400;700&family=Merriweather:wght@300;400;700;900&family=Libre+Baskerville:wght@400;700&family=Crimson+Text:wght@400;600;700&family=Black+Ops+One&family=Abril+Fatface&family=JetBrains+Mono:wght@400;700&display=swap" rel="stylesheet">
+''')
+        page.write('''    <style>
         * { margin: 0; padding: 0; box-sizing: border-box; }
         body {
             font-family: 'Inter', Arial, sans-serif;
@@ -2716,7 +2805,7 @@ class RIFTPremiumLogoGenerator:
     <h1>RIFT PREMIUM LOGO VARIATIONS</h1>
     <p class="subtitle">Sophisticated designs reflecting the edge of excellence</p>
     <div class="grid">
-'''
+''')
         
         # Logo descriptions
         descriptions = {
@@ -2818,9 +2907,6 @@ class RIFTPremiumLogoGenerator:
             'racing-energy-split': 'Racing energy split - energy splitting at race pace'
         }
         
-        svg_files = [f for f in os.listdir(self.output_dir) if f.endswith('.svg') and f != 'preview.html']
-        svg_files.sort()
-        
         for filename in svg_files:
             name = filename.replace('rift-logo-', '').replace('.svg', '').replace('-', ' ')
             desc = descriptions.get(filename.replace('rift-logo-', '').replace('.svg', ''), 'Premium logo variation')
@@ -2840,10 +2926,13 @@ class RIFTPremiumLogoGenerator:
                                                       '<rect width="400" height="150" fill="#0d4d3f"/>')
                     svg_content = svg_content.replace('<rect width="400" height="150" fill="#0d4d3f"/>', 
                                                       '<rect width="400" height="150" fill="#0d4d3f"/>')
+                    # Move shared defs and icons into the sprite sheet
+                    if sheet is not None:
+                        svg_content = sheet.inline(svg_content) or f'<p>Error loading {filename}: not well-formed SVG</p>'
             except Exception as e:
                 svg_content = f'<p>Error loading {filename}: {e}</p>'
             
-            html += f'''
+            page.write(f'''
         <div class="logo-card">
             <div class="logo-container">
                 {svg_content}
@@ -2851,23 +2940,53 @@ class RIFTPremiumLogoGenerator:
             <div class="logo-name">{name}</div>
             <div class="logo-description">{desc}</div>
         </div>
-'''
+''')
         
-        html += '''
+        page.write('''
     </div>
-</body>
-</html>'''
+''')
+        if sheet is not None:
+            page.write(sheet.markup())
+        page.write('''</body>
+</html>''')
         
-        preview_path = os.path.join(self.output_dir, 'preview.html')
-        with open(preview_path, 'w', encoding='utf-8') as f:
-            f.write(html)
+        page.close()
         print(f"✓ Generated: preview.html")
+        if sheet is not None:
+            print(f"🧩 Sprite sheet: {len(sheet.entries)} shared defs/groups, "
+                  f"{sheet.reused} repeats replaced by references")
+        
+        sections = self.design_sections()
+        count = write_gallery(self.output_dir, 'RIFT Premium Logo Variations',
+                              lambda rel_path: sections.get(rel_path, 'Other'))
+        print(f"✓ Generated: gallery.html ({count} assets indexed in assets.json)")
+
+
+def _render_design(output_dir: str, method_name: str) -> Tuple[str, List[Tuple[str, bool, int]], float, Dict[str, int]]:
+    """Worker entry point: render one design and report the files it wrote"""
+    generator = RIFTPremiumLogoGenerator(output_dir=output_dir, verbose=False)
+    # Pool workers run many designs; count only this one's minify and outline stats
+    engine.WRITER.take_stats()
+    start = time.perf_counter()
+    with recording() as outputs:
+        getattr(generator, method_name)()
+    engine.WRITER.flush()
+    return method_name, outputs, time.perf_counter() - start, engine.WRITER.take_stats()
+
+
+engine.register_class(
+    'premium-logos', RIFTPremiumLogoGenerator,
+    description='96 premium abstract designs (supports --jobs)',
+    output_dir='output/premium-logos',
+    entry='generate_all_variations',
+    assets=lambda cls: cls.design_methods(),
+    options=('jobs', 'sprites'),
+)
 
 
 def main():
     """Main execution function"""
-    generator = RIFTPremiumLogoGenerator(output_dir='output/premium-logos')
-    generator.generate_all_variations()
+    engine.main(['premium-logos'], description='Generate RIFT premium logo variations')
 
 
 if __name__ == '__main__':
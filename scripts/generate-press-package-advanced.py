@@ -9,17 +9,8 @@ import os
 import math
 from typing import Dict, List, Tuple
 
-# Brand Colors
-COLORS = {
-    'emerald_dark': '#0d4d3f',
-    'emerald_mid': '#0f3d32',
-    'emerald_bright': '#065f46',
-    'emerald_accent': '#10b981',
-    'gold': '#fbbf24',
-    'white': '#ffffff',
-    'black': '#000000',
-    'dark': '#0a1f1a',
-}
+from riftkit import engine
+from riftkit.engine import COLORS, require_dirs, svg_document, write_asset
 
 SOCIAL_DIMENSIONS = {
     'twitter_banner': (1500, 500),
@@ -43,17 +34,11 @@ class RIFTAdvancedPressGenerator:
             f'{self.output_dir}/social-media/advanced',
             f'{self.output_dir}/banners/premium',
         ]
-        for d in dirs:
-            os.makedirs(d, exist_ok=True)
+        require_dirs(*dirs)
     
     def create_svg(self, width: int, height: int, content: str, viewbox: str = None) -> str:
         """Create SVG wrapper"""
-        if viewbox is None:
-            viewbox = f"0 0 {width} {height}"
-        return f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewbox}" width="{width}" height="{height}">
-    {content}
-</svg>'''
+        return svg_document(width, height, content, viewbox=viewbox)
     
     def save_file(self, filename: str, content: str, subdir: str = ''):
         """Save file"""
@@ -61,10 +46,7 @@ class RIFTAdvancedPressGenerator:
             filepath = os.path.join(self.output_dir, subdir, filename)
         else:
             filepath = os.path.join(self.output_dir, filename)
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✓ Generated: {subdir}/{filename}" if subdir else f"✓ Generated: {filename}")
+        write_asset(filepath, content, f"{subdir}/{filename}" if subdir else filename)
     
     def get_rift_icon_advanced(self, x: float, y: float, scale: float = 1.0) -> str:
         """Advanced rift icon with bike elements"""
@@ -213,6 +195,19 @@ class RIFTAdvancedPressGenerator:
         print("✅ Advanced designs complete!")
 
 
+engine.register_class(
+    'press-package-advanced', RIFTAdvancedPressGenerator,
+    description='Advanced press ad and reel designs',
+    output_dir='output/press-package',
+    entry='generate_all',
+    assets=engine.prefixed_assets('generate_', exclude=('generate_all',)),
+)
+
+
+def main():
+    """Main execution function"""
+    engine.main(['press-package-advanced'], description='Generate advanced RIFT press package designs')
+
+
 if __name__ == '__main__':
-    generator = RIFTAdvancedPressGenerator()
-    generator.generate_all()
+    main()
@@ -16,17 +16,8 @@ import os
 import math
 from typing import Dict, List, Tuple, Optional
 
-# Brand Colors
-COLORS = {
-    'emerald_dark': '#0d4d3f',
-    'emerald_mid': '#0f3d32',
-    'emerald_bright': '#065f46',
-    'emerald_accent': '#10b981',
-    'gold': '#fbbf24',
-    'white': '#ffffff',
-    'black': '#000000',
-    'dark': '#0a1f1a',
-}
+from riftkit import engine
+from riftkit.engine import COLORS, background_rect, require_dirs, svg_document, write_asset
 
 # Slogan Variations
 SLOGANS = {
@@ -71,22 +62,13 @@ class RIFTPressPackageGenerator:
             f'{self.output_dir}/frames',
             f'{self.output_dir}/banners',
         ]
-        for d in dirs:
-            os.makedirs(d, exist_ok=True)
+        require_dirs(*dirs)
     
     def create_svg(self, width: int, height: int, content: str, 
                    viewbox: str = None, background: str = None) -> str:
         """Wrap content in SVG tags"""
-        if viewbox is None:
-            viewbox = f"0 0 {width} {height}"
-        
-        bg = f'<rect width="{width}" height="{height}" fill="{background}"/>' if background else ''
-        
-        return f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewbox}" width="{width}" height="{height}">
-    {bg}
-    {content}
-</svg>'''
+        return svg_document(width, height, background_rect(width, height, background), content,
+                            viewbox=viewbox)
     
     def save_file(self, filename: str, content: str, subdir: str = ''):
         """Save content to file"""
@@ -94,10 +76,7 @@ class RIFTPressPackageGenerator:
             filepath = os.path.join(self.output_dir, subdir, filename)
         else:
             filepath = os.path.join(self.output_dir, filename)
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✓ Generated: {subdir}/{filename}" if subdir else f"✓ Generated: {filename}")
+        write_asset(filepath, content, f"{subdir}/{filename}" if subdir else filename)
     
     # ===== ENHANCED RIFT ICON WITH BIKE/COG ELEMENTS =====
     
@@ -578,6 +557,19 @@ class RIFTPressPackageGenerator:
         print("  • Video overlays and frame templates")
 
 
+engine.register_class(
+    'press-package', RIFTPressPackageGenerator,
+    description='Press logos, social banners, ads, overlays and frames',
+    output_dir='output/press-package',
+    entry='generate_all',
+    assets=engine.prefixed_assets('logo_', 'generate_', exclude=('generate_all',)),
+)
+
+
+def main():
+    """Main execution function"""
+    engine.main(['press-package'], description='Generate the RIFT press package')
+
+
 if __name__ == '__main__':
-    generator = RIFTPressPackageGenerator()
-    generator.generate_all()
+    main()
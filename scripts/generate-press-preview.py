@@ -6,11 +6,34 @@ Generate HTML preview page for all press package assets
 import os
 from pathlib import Path
 
-def generate_preview_html(output_dir='output/press-package'):
+from riftkit import engine
+from riftkit.preview import PreviewWriter
+from riftkit.sprites import SpriteSheet
+
+
+def read_inline_svg(path, sheet=None):
+    """SVG markup of a file for inlining in HTML.
+
+    Without a sprite sheet the XML declaration is stripped and the rest is
+    inlined as is; with one, shared defs and groups move into the sheet.
+    """
+    error = '<svg><text>Error loading</text></svg>'
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            svg_content = f.read()
+    except (OSError, UnicodeDecodeError):
+        return error
+    if sheet is not None:
+        return sheet.inline(svg_content) or error
+    svg_start = svg_content.find('<svg')
+    return svg_content[svg_start:] if svg_start != -1 else svg_content
+
+
+def generate_preview_html(output_dir='output/press-package', sprites=False):
     """Generate HTML preview of all assets"""
     
     base_dir = Path(output_dir)
-    html_content = '''<!DOCTYPE html>
+    html_head = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -141,26 +164,16 @@ def generate_preview_html(output_dir='output/press-package'):
         </div>
 '''
 
-    # Find all SVG files
-    svg_files = []
+    # Index SVG paths by top-level category; the SVGs themselves are only
+    # read one at a time, when their card is written
+    categories = {}
     for root, dirs, files in os.walk(base_dir):
         for file in files:
-            if file.endswith('.svg') and file != 'preview.html':
+            if file.endswith('.svg'):
                 rel_path = os.path.relpath(os.path.join(root, file), base_dir)
-                svg_files.append((rel_path, os.path.join(root, file)))
-    
-    # Group by category
-    categories = {}
-    for rel_path, full_path in svg_files:
-        parts = rel_path.split(os.sep)
-        if len(parts) > 1:
-            category = parts[0]
-        else:
-            category = 'root'
-        
-        if category not in categories:
-            categories[category] = []
-        categories[category].append((rel_path, full_path))
+                parts = rel_path.split(os.sep)
+                category = parts[0] if len(parts) > 1 else 'root'
+                categories.setdefault(category, []).append(rel_path)
     
     # Generate sections
     category_names = {
@@ -172,28 +185,22 @@ def generate_preview_html(output_dir='output/press-package'):
         'banners': '🎴 Banner Designs',
     }
     
-    for category in sorted(categories.keys()):
-        category_title = category_names.get(category, category.title())
-        html_content += f'''
+    sheet = SpriteSheet() if sprites else None
+    preview_path = os.path.join(base_dir, 'preview.html')
+    with PreviewWriter(preview_path) as page:
+        page.write(html_head)
+        for category in sorted(categories.keys()):
+            category_title = category_names.get(category, category.title())
+            page.write(f'''
         <div class="section">
             <h2 class="section-title">{category_title}</h2>
             <div class="asset-grid">
-'''
-        
-        for rel_path, full_path in sorted(categories[category]):
-            # Read SVG content
-            try:
-                with open(full_path, 'r', encoding='utf-8') as f:
-                    svg_content = f.read()
-                    # Extract just the SVG tag content (remove XML declaration if present)
-                    if '<svg' in svg_content:
-                        svg_start = svg_content.find('<svg')
-                        svg_content = svg_content[svg_start:]
-            except:
-                svg_content = '<svg><text>Error loading</text></svg>'
+''')
             
-            filename = os.path.basename(rel_path)
-            html_content += f'''
+            for rel_path in sorted(categories[category]):
+                svg_content = read_inline_svg(os.path.join(base_dir, rel_path), sheet)
+                filename = os.path.basename(rel_path)
+                page.write(f'''
                 <div class="asset-card">
                     <div class="asset-preview">
                         {svg_content}
@@ -201,26 +208,37 @@ def generate_preview_html(output_dir='output/press-package'):
                     <div class="asset-name">{filename}</div>
                     <div class="asset-path">{rel_path}</div>
                 </div>
-'''
-        
-        html_content += '''
+''')
+            
+            page.write('''
             </div>
         </div>
-'''
-    
-    html_content += '''
+''')
+        
+        page.write('''
     </div>
-</body>
+''')
+        if sheet is not None:
+            page.write(sheet.markup())
+        page.write('''</body>
 </html>
-'''
-    
-    # Save preview
-    preview_path = os.path.join(base_dir, 'preview.html')
-    with open(preview_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+''')
     
     print(f"✓ Generated preview: {preview_path}")
+    if sheet is not None:
+        print(f"🧩 Sprite sheet: {len(sheet.entries)} shared defs/groups, "
+              f"{sheet.reused} repeats replaced by references")
     print(f"🌐 Open in browser: file://{os.path.abspath(preview_path)}")
 
+engine.register('press-preview', 'HTML index of everything in the press package',
+                'output/press-package', lambda cache, args: generate_preview_html(sprites=args.sprites),
+                options=('sprites',), preview=lambda args: generate_preview_html(sprites=args.sprites))
+
+
+def main():
+    """Main execution function"""
+    engine.main(['press-preview'], description='Generate the RIFT press package preview page')
+
+
 if __name__ == '__main__':
-    generate_preview_html()
+    main()
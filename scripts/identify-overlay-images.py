@@ -1,83 +1,66 @@
 #!/usr/bin/env python3
 """
 Identify images that might have logos, overlays, or text that need manual review.
-Uses file size and basic heuristics to flag potential overlay images.
+Uses file size and basic heuristics to flag potential overlay images, then
+scores the pixels of the remaining clean images for badges, banners and text
+(riftkit.detect) on a process pool.
+Dimensions are read from image headers on a thread pool and cached in
+.probe-cache.json, so a re-review only opens new or changed files. With
+--catalog they come from the asset catalog (riftkit.catalog) instead.
 """
 
+import argparse
 import os
 from pathlib import Path
-from PIL import Image
-import json
+
+from riftkit import profiling
+from riftkit.catalog import Catalog
+from riftkit.detect import detect_images
+from riftkit.probe import IMAGE_EXTENSIONS, Probe, ProbeCache, probe_files, probe_image, scan_images
 
 SOURCE_DIR = Path("/home/tau/RIFT/organized_bikes_refined")
 
+def classify_probe(probe):
+    """Flag a probed image that might contain overlays, logos, or text."""
+    if probe.error:
+        return {"flag": "error", "reason": probe.error}
+    width, height = probe.width, probe.height
+    
+    # Very small images are often logos/components
+    if width < 200 or height < 200:
+        return {"flag": "small_image", "reason": f"Very small ({width}x{height}) - might be component/logo"}
+    
+    # Check file size - very small files might be simple graphics
+    file_size = probe.size
+    if file_size < 50000:  # Less than 50KB
+        return {"flag": "small_file", "reason": f"Small file size ({file_size/1024:.1f}KB) - might be graphic/logo"}
+    
+    # Very large files might be high-res with overlays
+    if file_size > 5000000:  # More than 5MB
+        return {"flag": "large_file", "reason": f"Large file ({file_size/1024/1024:.1f}MB) - might have overlays"}
+    
+    return None
+
 def check_image_for_overlays(image_path):
     """Check if image might contain overlays, logos, or text."""
     try:
-        img = Image.open(image_path)
-        width, height = img.size
-        
-        # Very small images are often logos/components
-        if width < 200 or height < 200:
-            return {"flag": "small_image", "reason": f"Very small ({width}x{height}) - might be component/logo"}
-        
-        # Check file size - very small files might be simple graphics
-        file_size = image_path.stat().st_size
-        if file_size < 50000:  # Less than 50KB
-            return {"flag": "small_file", "reason": f"Small file size ({file_size/1024:.1f}KB) - might be graphic/logo"}
-        
-        # Very large files might be high-res with overlays
-        if file_size > 5000000:  # More than 5MB
-            return {"flag": "large_file", "reason": f"Large file ({file_size/1024/1024:.1f}MB) - might have overlays"}
-        
-        return None
-    except Exception as e:
+        stat = os.stat(image_path)
+    except OSError as e:
         return {"flag": "error", "reason": str(e)}
+    return classify_probe(probe_image(str(image_path), stat.st_size, stat.st_mtime_ns))
 
-def review_images():
-    """Review all images and flag potential issues."""
-    review_results = {
-        "potential_overlays": [],
-        "small_images": [],
-        "large_images": [],
-        "errors": []
-    }
-    
-    for bike_dir in SOURCE_DIR.iterdir():
-        if not bike_dir.is_dir() or bike_dir.name.startswith('.'):
-            continue
-        
-        bike_name = bike_dir.name
-        print(f"🔍 Reviewing {bike_name}...")
-        
-        # Check clean images (these should NOT have overlays)
-        clean_dir = bike_dir / "images" / "clean"
-        if clean_dir.exists():
-            for img_file in clean_dir.glob("*"):
-                if img_file.suffix.lower() in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-                    result = check_image_for_overlays(img_file)
-                    if result:
-                        review_results["potential_overlays"].append({
-                            "bike": bike_name,
-                            "file": str(img_file.relative_to(SOURCE_DIR)),
-                            "issue": result["flag"],
-                            "reason": result["reason"]
-                        })
-        
-        # Check detail images
-        detail_dir = bike_dir / "images" / "details"
-        if detail_dir.exists():
-            for img_file in detail_dir.glob("*"):
-                if img_file.suffix.lower() in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-                    result = check_image_for_overlays(img_file)
-                    if result and result["flag"] == "small_image":
-                        review_results["small_images"].append({
-                            "bike": bike_name,
-                            "file": str(img_file.relative_to(SOURCE_DIR))
-                        })
-    
-    # Save review results
-    review_file = SOURCE_DIR / "MANUAL_REVIEW_CHECKLIST.md"
+def classify_detection(detection):
+    """Flag an image whose pixels look like a badge, banner, logo or text."""
+    if detection.error:
+        return None
+    flags = detection.flags()
+    if not flags:
+        return None
+    return {"flag": flags[0], "reason": f"Content looks edited: {detection.reason()}"}
+
+def write_checklist(review_results, root=None):
+    """Write MANUAL_REVIEW_CHECKLIST.md into root (default SOURCE_DIR) and return its path."""
+    review_file = Path(root or SOURCE_DIR) / "MANUAL_REVIEW_CHECKLIST.md"
     with open(review_file, 'w') as f:
         f.write("# Manual Review Checklist\n\n")
         f.write("## Images That May Need Review\n\n")
@@ -98,10 +81,128 @@ def review_images():
         f.write("3. Move any component images to `components/` folder\n")
         f.write("4. Verify all images are correctly categorized\n")
         f.write("5. Remove duplicate files (_1 versions)\n")
+    return review_file
+
+def append_to_checklist(review_results, root=None, heading=None):
+    """Add one batch of results to the end of MANUAL_REVIEW_CHECKLIST.md and return its path.
+    
+    Used by watch-supplier-drops.py, which reviews each drop as it arrives
+    instead of rewriting the checklist for the whole tree.
+    """
+    review_file = Path(root or SOURCE_DIR) / "MANUAL_REVIEW_CHECKLIST.md"
+    items = review_results["potential_overlays"] + review_results["small_images"]
+    if not items:
+        return review_file
+    new_file = not review_file.exists()
+    with open(review_file, 'a') as f:
+        if new_file:
+            f.write("# Manual Review Checklist\n\n")
+        f.write(f"\n## {heading or 'New images'}\n\n")
+        for item in review_results["potential_overlays"]:
+            f.write(f"- [ ] **{item['bike']}**: `{item['file']}`\n")
+            f.write(f"  - Issue: {item['issue']}\n")
+            f.write(f"  - Reason: {item['reason']}\n")
+        for item in review_results["small_images"]:
+            f.write(f"- [ ] **{item['bike']}**: `{item['file']}`\n")
+            f.write("  - Issue: small_image\n")
+    return review_file
+
+def catalog_probes(assets, category):
+    """(bike, Probe) for the images in one category, from the asset catalog."""
+    return [(asset.bike, Probe(asset.full_path, asset.size, asset.mtime_ns,
+                               int(asset.width or 0), int(asset.height or 0), asset.format or '',
+                               '' if asset.width else 'unreadable header'))
+            for asset in assets.files(SOURCE_DIR, category=category, extensions=IMAGE_EXTENSIONS)]
+
+def review_images(workers=16, content=True, jobs=1, catalog=False):
+    """Review all images and flag potential issues."""
+    review_results = {
+        "potential_overlays": [],
+        "small_images": [],
+        "large_images": [],
+        "errors": []
+    }
+    
+    if catalog:
+        with Catalog() as assets:
+            assets.update(SOURCE_DIR)
+            clean_files = catalog_probes(assets, "images/clean")
+            detail_files = catalog_probes(assets, "images/details")
+        probes = [probe for _, probe in clean_files + detail_files]
+        print(f"📐 Took {len(probes)} image sizes from the asset catalog")
+    else:
+        # Collect clean/ and details/ images with the stat results scandir already has
+        clean_files, detail_files = [], []
+        for bike_entry in sorted(os.scandir(SOURCE_DIR), key=lambda e: e.name):
+            if not bike_entry.is_dir() or bike_entry.name.startswith('.'):
+                continue
+            print(f"🔍 Reviewing {bike_entry.name}...")
+            images_dir = os.path.join(bike_entry.path, "images")
+            # Clean images should NOT have overlays
+            clean_files += [(bike_entry.name, f) for f in scan_images(os.path.join(images_dir, "clean"))]
+            detail_files += [(bike_entry.name, f) for f in scan_images(os.path.join(images_dir, "details"))]
+        
+        cache = ProbeCache(str(SOURCE_DIR))
+        files = clean_files + detail_files
+        with profiling.stage('probe'):
+            probes = probe_files([f for _, f in files], cache=cache, workers=workers)
+        cache.save()
+        print(f"📐 Probed {len(probes)} images ({cache.hits} from cache, "
+              f"{len(probes) - cache.hits} read)")
+    
+    clean_results = [classify_probe(probe) for probe in probes[:len(clean_files)]]
+    
+    # Look at the pixels of clean images that passed the size checks
+    if content:
+        unflagged = [probe.path for probe, result in zip(probes, clean_results) if not result]
+        try:
+            with profiling.stage('detect'):
+                detections = detect_images(unflagged, jobs=jobs)
+        except ImportError:
+            print("⚠️  Pillow and NumPy are needed for content analysis; skipping it")
+        else:
+            by_path = {d.path: classify_detection(d) for d in detections}
+            clean_results = [result or by_path.get(probe.path)
+                             for probe, result in zip(probes, clean_results)]
+            flagged = sum(1 for result in by_path.values() if result)
+            print(f"🔬 Analyzed {len(detections)} clean images, {flagged} look edited")
+    
+    for (bike_name, _), probe, result in zip(clean_files, probes, clean_results):
+        if result:
+            review_results["potential_overlays"].append({
+                "bike": bike_name,
+                "file": os.path.relpath(probe.path, SOURCE_DIR),
+                "issue": result["flag"],
+                "reason": result["reason"]
+            })
+    
+    for (bike_name, _), probe in zip(detail_files, probes[len(clean_files):]):
+        result = classify_probe(probe)
+        if result and result["flag"] == "small_image":
+            review_results["small_images"].append({
+                "bike": bike_name,
+                "file": os.path.relpath(probe.path, SOURCE_DIR)
+            })
+    
+    review_file = write_checklist(review_results)
     
     print(f"\n✅ Review complete!")
     print(f"📄 Checklist saved to: {review_file}")
     print(f"\nFound {len(review_results['potential_overlays'])} potential issues")
 
 if __name__ == "__main__":
-    review_images()
+    parser = argparse.ArgumentParser(description="Flag bike images that need manual review")
+    parser.add_argument("--workers", type=int, default=16,
+                        help="threads reading image headers")
+    parser.add_argument("--no-content", action="store_true",
+                        help="skip pixel analysis of clean images")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="worker processes for pixel analysis (0 = one per CPU core)")
+    parser.add_argument("--catalog", action="store_true",
+                        help="take image sizes from the asset catalog instead of probing")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    with profiling.session(args):
+        review_images(args.workers, content=not args.no_content,
+                      jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1),
+                      catalog=args.catalog)
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Ingest a supplier drop in a single pass.
+Walks the extracted zip once and, for every file: picks its refined category
+by name, skips exact duplicates, and places it straight into the refined tree
+with a reflink (copying only when the filesystem cannot clone). Clean images
+are then probed and checked by content, and the refined summary and manual
+review checklist are written as before.
+
+Replaces running organize-bike-assets.py, refine-bike-organization.py,
+remove-duplicates.py and identify-overlay-images.py one after the other,
+which copied the whole drop twice and rescanned it twice more.
+
+Placements and moves are journaled (riftkit.journal), so re-running on the
+same drop only places new or changed files.
+
+With --zip the supplier archives are read in place instead of an extracted
+folder: member names are decoded from CP936/GBK, each member is streamed
+straight to its refined folder, and several archives are read at once.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from riftkit import profiling
+from riftkit.archive import MemberIndex, extract_with_digest, iter_members, member_digest, member_key
+from riftkit.dedupe import HEAD_BYTES, DuplicateIndex, iter_files
+from riftkit.detect import detect_images
+from riftkit.journal import PlacementJournal
+from riftkit.place import MODES, Placer
+from riftkit.probe import IMAGE_EXTENSIONS, ProbeCache, probe_files
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+def load_script(filename):
+    """Import one of the hyphenated scripts in this directory as a module."""
+    module_name = filename[:-3].replace('-', '_')
+    if module_name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / filename)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[module_name]
+
+
+organize = load_script("organize-bike-assets.py")
+refine = load_script("refine-bike-organization.py")
+identify = load_script("identify-overlay-images.py")
+
+SOURCE_DIR = organize.SOURCE_DIR
+TARGET_DIR = refine.TARGET_DIR
+
+
+def move_to(stats, journal, source, target_file, bike_dir, subdir, reason):
+    """Move a placed clean image into another category folder."""
+    destination = Path(journal.free_name(source, bike_dir / subdir, target_file.name))
+    journal.move(source, str(destination))
+    stats["by_category"]["images/clean"] -= 1
+    stats["by_category"][subdir] = stats["by_category"].get(subdir, 0) + 1
+    print(f"  ↪ {subdir:14} ← {target_file.name} ({reason})")
+    return destination
+
+
+def record_placement(stats, clean, details, bike_dir, source, target_file, placed_now):
+    """Count a placed file and queue it for the image checks.
+
+    Files an earlier run placed are queued too, marked as not placed now:
+    they only get the probe-based checklist, not the refine and content checks.
+    """
+    target_file = Path(target_file)
+    # An earlier run may have moved it on after a content check
+    subdir = target_file.parent.relative_to(bike_dir).as_posix()
+    stats["by_category"][subdir] = stats["by_category"].get(subdir, 0) + 1
+    stats["by_bike"][bike_dir.name] = stats["by_bike"].get(bike_dir.name, 0) + 1
+    if placed_now:
+        print(f"  ✓ {subdir:14} → {target_file.name}")
+
+    if target_file.name.lower().endswith(IMAGE_EXTENSIONS):
+        if subdir == "images/clean":
+            clean.append((bike_dir.name, source, target_file, placed_now))
+        elif subdir == "images/details":
+            details.append((bike_dir.name, source, target_file, placed_now))
+
+
+def bike_for_member(archive_path, name):
+    """Refined bike name for an archive member, from its folders or the archive's name."""
+    parts = name.split("/")[:-1] + [Path(archive_path).stem]
+    for part in parts:
+        for source_model, bike_name in organize.BIKE_MODELS.items():
+            if part in (source_model, source_model.split(" (")[0], bike_name):
+                return bike_name
+    return None
+
+
+def ingest_archive(archive_path, target_dir, journal, index_for=None):
+    """Stream one supplier zip into the refined tree.
+
+    Runs on a worker thread, so it only places files; the caller counts
+    them. Returns (placements, duplicates, members with no known bike).
+
+    index_for(bike_name), if given, returns a DuplicateIndex of the files
+    that bike already holds: members new to the journal that match one are
+    skipped as duplicates, and placed members are added to it.
+    """
+    placements, duplicates, unmatched = [], [], 0
+    with zipfile.ZipFile(archive_path) as archive:
+        indexes = {}
+        for info, name in iter_members(archive):
+            bike_name = bike_for_member(archive_path, name)
+            if bike_name is None:
+                unmatched += 1
+                continue
+            filename = name.rsplit("/", 1)[-1]
+            key = member_key(str(archive_path), name)
+            original = indexes.setdefault(bike_name, MemberIndex(archive)).add(info, name)
+            if not original and index_for is not None and journal.destination(key) is None:
+                original = index_for(bike_name).find(
+                    info.file_size, lambda: member_digest(archive, info, HEAD_BYTES),
+                    lambda: member_digest(archive, info))
+            if original:
+                duplicates.append((bike_name, name, original))
+                continue
+
+            subdir = refine.refined_subdir(refine.categorize_image(filename, Path(name)), name)
+            try:
+                target_file, placed_now = journal.place_stream(
+                    key, {"size": info.file_size, "crc": info.CRC},
+                    target_dir / bike_name / subdir, filename,
+                    lambda partial, info=info: ("stream", extract_with_digest(archive, info, partial)))
+            except (OSError, zipfile.BadZipFile) as e:
+                print(f"  ✗ Error extracting {name}: {e}")
+                continue
+            if placed_now and index_for is not None:
+                index_for(bike_name).insert(str(target_file), info.file_size)
+            placements.append((bike_name, key, target_file, placed_now))
+    return placements, duplicates, unmatched
+
+
+def check_placed(stats, journal, target_dir, clean, details, content=True, jobs=1):
+    """Apply the refine and review rules to newly placed clean/ and details/ images.
+
+    Small clean images move to components/ and edited-looking ones to
+    overlays/; images an earlier run placed were checked then and are only
+    reviewed. Returns the review results for what is left, in the form
+    identify-overlay-images.py writes to MANUAL_REVIEW_CHECKLIST.md.
+    """
+    # Header probe of the placed images; the cache is reused by identify-overlay-images.py
+    cache = ProbeCache(str(target_dir))
+    placed_images = clean + details
+    with profiling.stage('probe'):
+        probes = probe_files([(str(p), os.stat(p)) for _, _, p, _ in placed_images], cache=cache,
+                             workers=16)
+    clean_probes = probes[:len(clean)]
+
+    # Refine rules: small "clean" images are components, edited-looking ones overlays
+    checked, remaining = [], []
+    for (bike_name, source, target_file, placed_now), probe in zip(clean, clean_probes):
+        if not placed_now:
+            checked.append((bike_name, source, target_file, probe))
+        elif not probe.error and (probe.width < 500 or probe.height < 500):
+            move_to(stats, journal, source, target_file, target_dir / bike_name, "components",
+                    "small image")
+        else:
+            remaining.append((bike_name, source, target_file, probe))
+    if content and remaining:
+        print(f"\n🔬 Checking {len(remaining)} clean images by content...")
+        try:
+            with profiling.stage('detect'):
+                detections = detect_images([str(p) for _, _, p, _ in remaining], jobs=jobs)
+        except ImportError:
+            print("⚠️  Pillow and NumPy are needed for content analysis; keeping filename categories")
+        else:
+            kept = []
+            for item, detection in zip(remaining, detections):
+                flags = [] if detection.error else detection.flags()
+                if flags:
+                    bike_name, source, target_file, _ = item
+                    move_to(stats, journal, source, target_file, target_dir / bike_name, "overlays",
+                            f"{', '.join(flags)}: {detection.reason()}")
+                else:
+                    kept.append(item)
+            remaining = kept
+    remaining = checked + remaining
+    cache.save()
+
+    # Review checklist for what is left in clean/ and details/
+    review_results = {"potential_overlays": [], "small_images": [], "large_images": [], "errors": []}
+    for bike_name, _, target_file, probe in remaining:
+        result = identify.classify_probe(probe)
+        if result:
+            review_results["potential_overlays"].append({
+                "bike": bike_name,
+                "file": os.path.relpath(target_file, target_dir),
+                "issue": result["flag"],
+                "reason": result["reason"]
+            })
+    for (bike_name, _, target_file, _), probe in zip(details, probes[len(clean):]):
+        result = identify.classify_probe(probe)
+        if result and result["flag"] == "small_image":
+            review_results["small_images"].append({
+                "bike": bike_name,
+                "file": os.path.relpath(target_file, target_dir)
+            })
+    return review_results
+
+
+def ingest(source_dir=SOURCE_DIR, target_dir=TARGET_DIR, mode="auto", content=True, jobs=1,
+           archives=None):
+    """Organize, refine, dedupe and review a drop in one walk.
+
+    archives: supplier .zip files to read in place instead of source_dir.
+    """
+    start = time.perf_counter()
+    source_dir, target_dir = Path(source_dir), Path(target_dir)
+    placer = Placer(mode)
+    journal = PlacementJournal(target_dir)
+    stats = {"total": 0, "by_category": {}, "by_bike": {}}
+    duplicates = []
+    clean, details = [], []  # (bike_name, source path, placed path, placed now)
+
+    if archives:
+        # Several archives at once: inflating and writing leave the GIL
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(archives)))) as pool:
+            results = pool.map(lambda a: ingest_archive(a, target_dir, journal), archives)
+            for archive_path, (placements, archive_duplicates, unmatched) in zip(archives, results):
+                print(f"\n📦 Ingesting {Path(archive_path).name}...")
+                stats["total"] += len(placements) + len(archive_duplicates)
+                for bike_name, name, original in archive_duplicates:
+                    duplicates.append((bike_name, name, original))
+                    print(f"  ⊘ duplicate      → {os.path.basename(name)} (same bytes as {os.path.basename(original)})")
+                for bike_name, key, target_file, placed_now in placements:
+                    record_placement(stats, clean, details, target_dir / bike_name, key,
+                                     target_file, placed_now)
+                if unmatched:
+                    print(f"⚠️  {unmatched} files in {Path(archive_path).name} match no known bike model")
+    else:
+        # One walk: categorize, dedupe and place every file as it is found
+        for source_model, bike_name in organize.BIKE_MODELS.items():
+            source_path = organize.find_source_path(source_model, source_dir)
+            if not source_path:
+                print(f"⚠️  Source path not found for {source_model}")
+                continue
+            print(f"\n📦 Ingesting {bike_name}...")
+            bike_dir = target_dir / bike_name
+            index = DuplicateIndex()
+
+            for path, size in iter_files(str(source_path)):
+                stats["total"] += 1
+                filename = os.path.basename(path)
+                original = index.add(path, size)
+                if original:
+                    duplicates.append((bike_name, path, original))
+                    print(f"  ⊘ duplicate      → {filename} (same bytes as {os.path.basename(original)})")
+                    continue
+
+                subdir = refine.refined_subdir(refine.categorize_image(filename, Path(path)), path)
+                try:
+                    target_file, placed_now = journal.place(path, bike_dir / subdir,
+                                                            transfer=placer.place)
+                except OSError as e:
+                    print(f"  ✗ Error placing {filename}: {e}")
+                    continue
+                record_placement(stats, clean, details, bike_dir, path, target_file, placed_now)
+
+    with profiling.stage('check'):
+        review_results = check_placed(stats, journal, target_dir, clean, details, content=content, jobs=jobs)
+    journal.close()
+
+    stats["by_category"] = {k: v for k, v in stats["by_category"].items() if v}
+    summary_file = refine.write_summary(stats, target_dir)
+    review_file = identify.write_checklist(review_results, target_dir)
+
+    elapsed = time.perf_counter() - start
+    print("\n" + "="*60)
+    print("📊 INGEST SUMMARY")
+    print("="*60)
+    print(f"Total files processed: {stats['total']}")
+    print(f"Duplicates skipped: {len(duplicates)}")
+    if not archives:
+        print(f"Placement: {placer.summary()}")
+    print(f"Journal: {journal.summary()}")
+    print("\nBy category:")
+    for category, count in sorted(stats['by_category'].items()):
+        print(f"  {category:20}: {count:3} files")
+    print("="*60)
+    print(f"\n✅ Ingest complete in {elapsed:.1f}s!")
+    print(f"📁 Location: {target_dir}")
+    print(f"📄 Summary: {summary_file}")
+    print(f"📄 Checklist: {review_file} ({len(review_results['potential_overlays'])} potential issues)")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Organize, refine, dedupe and review a bike asset drop in one pass")
+    parser.add_argument("--source", type=Path, default=SOURCE_DIR,
+                        help=f"extracted supplier drop (default: {SOURCE_DIR})")
+    parser.add_argument("--target", type=Path, default=TARGET_DIR,
+                        help=f"refined output folder (default: {TARGET_DIR})")
+    parser.add_argument("--zip", nargs="+", type=Path, metavar="ARCHIVE",
+                        help="read supplier .zip files (or folders of them) in place instead of --source")
+    parser.add_argument("--link", choices=MODES, default="auto",
+                        help="how to place files: reflink, hardlink or copy (auto tries reflink, then copy; "
+                             "hardlink only for a throwaway extract)")
+    parser.add_argument("--no-content", action="store_true",
+                        help="skip pixel analysis of clean images")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="worker processes for pixel analysis (0 = one per CPU core)")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    archives = None
+    if args.zip:
+        archives = []
+        for path in args.zip:
+            archives.extend(sorted(path.glob("*.zip")) if path.is_dir() else [path])
+    with profiling.session(args):
+        ingest(args.source, args.target, mode=args.link, content=not args.no_content,
+               jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1), archives=archives)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Regenerate the bike specifications in lib/bikes-data.ts from the supplier
+*-Specifications.xlsx sheets and the requirements2/*.txt spec notes.
+Keys are normalized (Handelbar Sets -> Handlebar Sets, Tyre -> Tire, ...),
+and only sources whose content changed since the last run are parsed again.
+Sheets for models with no bike yet are only listed: bikes-data.ts is the
+storefront's fallback catalogue, so they are added (with a placeholder
+name and no price) only with --add-new.
+
+Run from the repository root: python3 scripts/ingest-bike-specs.py
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from riftkit import profiling
+from riftkit.specs import (SHEET_EXTENSIONS, SpecCache, find_sources, load_bikes, merge_specs,
+                           parse_sources, render_bikes)
+
+SOURCES = [Path("/home/tau/RIFT/new_bikes_extract"), Path("requirements2")]
+DATA_FILE = Path("lib/bikes-data.ts")
+PUBLIC_BIKES = Path("public/bikes")
+
+
+def ingest_specs(sources=SOURCES, data_file=DATA_FILE, dry_run=False, force=False, jobs=1, add_new=False):
+    """Parse changed spec sources and write their specs into data_file."""
+    start = time.perf_counter()
+    missing = [path for path in sources if not Path(path).exists()]
+    for path in missing:
+        print(f"⚠️  {path} not found; skipping it")
+    with profiling.stage('scan'):
+        paths = find_sources(path for path in sources if path not in missing)
+    print(f"📄 {len(paths)} spec sources")
+
+    cache = None if force else SpecCache()
+    with profiling.stage('parse'):
+        try:
+            parsed, parsed_count = parse_sources(paths, cache=cache, jobs=jobs)
+        except ImportError:
+            print("⚠️  openpyxl is needed to read .xlsx sheets; skipping them")
+            paths = [path for path in paths if not path.lower().endswith(SHEET_EXTENSIONS)]
+            parsed, parsed_count = parse_sources(paths, cache=cache, jobs=jobs)
+    for source in parsed:
+        if source.error:
+            print(f"  ✗ {os.path.basename(source.path)}: {source.error}")
+        elif not source.specs:
+            print(f"  · {os.path.basename(source.path)}: no spec rows ({source.title or 'empty'})")
+    print(f"  {parsed_count} parsed, {len(parsed) - parsed_count} unchanged since the last run")
+
+    with profiling.stage('merge'):
+        header, bikes = load_bikes(data_file)
+        updated, added, new_models = merge_specs(bikes, parsed, PUBLIC_BIKES, add_new=add_new)
+    for name in updated:
+        print(f"  🔄 {name}: specifications updated")
+    for name in added:
+        print(f"  ➕ {name}: added; fill in its name, description, price and category")
+    for model in new_models:
+        print(f"  · {model}: new sheet with no bike in {data_file}; rerun with --add-new to add it")
+
+    if (updated or added) and not dry_run:
+        with open(data_file, 'w', encoding='utf-8') as f:
+            f.write(render_bikes(header, bikes))
+    if cache:
+        cache.save()
+
+    elapsed = time.perf_counter() - start
+    if not (updated or added):
+        print(f"\n✅ {data_file} is up to date ({elapsed:.2f}s)")
+    else:
+        print(f"\n✅ {len(updated)} bikes updated, {len(added)} added in {elapsed:.2f}s"
+              f"{' (dry run, nothing written)' if dry_run else f': {data_file}'}")
+    return updated, added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate bike specifications from supplier sheets")
+    parser.add_argument("sources", nargs="*", type=Path, default=SOURCES,
+                        help=f"spec sheets, text notes or folders of them "
+                             f"(default: {' '.join(map(str, SOURCES))})")
+    parser.add_argument("--data", type=Path, default=DATA_FILE,
+                        help=f"bikes data file to update (default: {DATA_FILE})")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report what would change without writing the data file")
+    parser.add_argument("--force", action="store_true",
+                        help="parse every source again, ignoring the cache")
+    parser.add_argument("--add-new", action="store_true",
+                        help="add a placeholder bike (no price, Uncategorized) for each sheet with no bike")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="worker processes (0 = one per CPU core)")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    with profiling.session(args):
+        ingest_specs(args.sources, args.data, dry_run=args.dry_run, force=args.force,
+                     jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1), add_new=args.add_new)
+
+
+if __name__ == "__main__":
+    main()
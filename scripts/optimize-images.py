@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Optimize the JPEG and PNG files under public/ in place.
+Strips EXIF/XMP/ICC and thumbnails, bakes in EXIF orientation, converts to
+sRGB and recompresses (JPEG with its own quantization tables, PNG losslessly),
+then prints how many bytes each folder saved. Files optimized by an earlier
+run are skipped after one stat.
+
+Folders kept by the placement journal (organized_bikes_refined/) are left
+alone: they hold the supplier originals, and the next ingest would see the
+changed sizes and copy the originals back.
+
+Run from the repository root: python3 scripts/optimize-images.py
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from riftkit import profiling
+from riftkit.journal import JOURNAL_NAME
+from riftkit.optimize import OptimizeCache, find_images, optimize_files
+
+ROOTS = [Path("public")]
+
+
+def optimize_images(roots=ROOTS, dry_run=False, force=False, jobs=1):
+    """Optimize every image under roots and report the bytes saved."""
+    start = time.perf_counter()
+    totals = {"files": 0, "written": 0, "cached": 0, "before": 0, "after": 0, "errors": 0}
+    cache = OptimizeCache()
+
+    for root in roots:
+        if not root.exists():
+            print(f"⚠️  {root} not found; skipping it")
+            continue
+        if (root / JOURNAL_NAME).exists():
+            print(f"⚠️  {root} is kept by the placement journal (ingest would restore the originals); skipping it")
+            continue
+        files = list(find_images(str(root)))
+        todo = [path for path, stat in files if force or not cache.is_done(path, stat)]
+        totals["files"] += len(files)
+        totals["cached"] += len(files) - len(todo)
+        print(f"\n🗜️  {root}: {len(files)} images, {len(todo)} to optimize"
+              f"{' (dry run)' if dry_run else ''}...")
+
+        try:
+            with profiling.stage(f'optimize {root}'):
+                results = optimize_files(todo, dry_run=dry_run, jobs=jobs)
+        except ImportError:
+            print("⚠️  Pillow is needed to optimize images; skipping it")
+            return None
+
+        before = after = 0
+        for result in results:
+            rel_path = os.path.relpath(result.path, root)
+            profiling.record_asset(result.path, result.elapsed, [(result.path, result.written, result.after)])
+            if result.error:
+                totals["errors"] += 1
+                print(f"  ✗ {rel_path}: {result.error}")
+                continue
+            before += result.before
+            after += result.before - result.saved
+            if result.written:
+                totals["written"] += 1
+                print(f"  ✓ {rel_path:50} {result.before / 1024:8.1f}KB → {result.after / 1024:8.1f}KB "
+                      f"({', '.join(result.changes)})")
+            if not dry_run:
+                cache.mark(result.path)
+        if not dry_run:
+            cache.save()
+        if before:
+            print(f"  📉 {root}: {(before - after) / 1024:.1f}KB saved of {before / 1024:.1f}KB "
+                  f"({100 * (before - after) / before:.1f}%)")
+        totals["before"] += before
+        totals["after"] += after
+
+    elapsed = time.perf_counter() - start
+    saved = totals["before"] - totals["after"]
+    print("\n" + "="*60)
+    print("📊 OPTIMIZATION SUMMARY")
+    print("="*60)
+    print(f"Images found: {totals['files']} ({totals['cached']} already optimized)")
+    print(f"Rewritten: {totals['written']}{' (dry run, nothing written)' if dry_run else ''}")
+    print(f"Errors: {totals['errors']}")
+    print(f"Bytes saved: {saved / 1024 / 1024:.2f}MB of {totals['before'] / 1024 / 1024:.2f}MB processed")
+    print("="*60)
+    print(f"\n✅ Done in {elapsed:.1f}s")
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Strip metadata from and recompress JPEG/PNG images in place")
+    parser.add_argument("roots", nargs="*", type=Path, default=ROOTS,
+                        help=f"folders to optimize (default: {' '.join(map(str, ROOTS))})")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report what would be saved without rewriting anything")
+    parser.add_argument("--force", action="store_true",
+                        help="ignore the cache and look at every image again")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="worker processes (0 = one per CPU core)")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    with profiling.session(args):
+        optimize_images(args.roots, dry_run=args.dry_run, force=args.force,
+                        jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,17 @@
 """
 Organize bike assets from extracted zip files.
 Separates actual bike photos from spec screenshots and organizes by category.
+Every copy is hashed as it is written and logged in .placement-journal.jsonl,
+so re-runs skip finished files and resume interrupted ones.
 """
 
+import argparse
 import os
-import shutil
 from pathlib import Path
 
+from riftkit import profiling
+from riftkit.journal import PlacementJournal
+
 # Base paths
 SOURCE_DIR = Path("/home/tau/RIFT/temp_extract")
 TARGET_DIR = Path("/home/tau/RIFT/organized_bikes")
@@ -51,28 +56,36 @@ def categorize_file(filename):
     
     return "main"
 
-def organize_bike_assets():
-    """Organize all bike assets into proper structure."""
+def find_source_path(source_model, source_dir=None):
+    """Folder holding a model's files inside the extracted zip, or None."""
+    source_dir = Path(source_dir or SOURCE_DIR)
+    # Try different possible source paths
+    possible_paths = [
+        source_dir / source_model / source_model,
+        source_dir / source_model / source_model.split(" (")[0],  # Remove "(2)" etc
+        source_dir / source_model,
+    ]
+    
+    for path in possible_paths:
+        if path.exists() and any(path.rglob("*")):
+            return path
+    return None
+
+def organize_bike_assets(verify=False):
+    """Organize all bike assets into proper structure.
+    
+    Copies are journaled in TARGET_DIR, so a re-run only copies new or
+    changed files and an interrupted run picks up where it stopped.
+    """
     stats = {
         "total_files": 0,
         "organized": 0,
         "by_category": {}
     }
+    journal = PlacementJournal(TARGET_DIR)
     
     for source_model, target_model in BIKE_MODELS.items():
-        # Try different possible source paths
-        possible_paths = [
-            SOURCE_DIR / source_model / source_model,
-            SOURCE_DIR / source_model / source_model.split(" (")[0],  # Remove "(2)" etc
-            SOURCE_DIR / source_model,
-        ]
-        
-        source_path = None
-        for path in possible_paths:
-            if path.exists() and any(path.rglob("*")):
-                source_path = path
-                break
-        
+        source_path = find_source_path(source_model)
         target_base = TARGET_DIR / target_model
         
         if not source_path:
@@ -102,30 +115,24 @@ def organize_bike_assets():
                 else:  # main
                     target_subdir = target_base / "images" / "main"
                 
-                # Create target directory if needed
-                target_subdir.mkdir(parents=True, exist_ok=True)
-                
-                # Copy file with clean name
-                target_file = target_subdir / filename
-                
-                # Handle duplicates
-                counter = 1
-                while target_file.exists():
-                    name_parts = filename.rsplit('.', 1)
-                    if len(name_parts) == 2:
-                        target_file = target_subdir / f"{name_parts[0]}_{counter}.{name_parts[1]}"
-                    else:
-                        target_file = target_subdir / f"{filename}_{counter}"
-                    counter += 1
-                
                 try:
-                    shutil.copy2(file_path, target_file)
+                    target_file, copied = journal.place(file_path, target_subdir)
                     stats["organized"] += 1
                     stats["by_category"][category] = stats["by_category"].get(category, 0) + 1
-                    print(f"  ✓ {category:10} → {filename}")
+                    if copied:
+                        print(f"  ✓ {category:10} → {os.path.basename(target_file)}")
                 except Exception as e:
                     print(f"  ✗ Error copying {filename}: {e}")
     
+    journal.close()
+    print(f"\n📒 Journal: {journal.summary()}")
+    if verify:
+        with profiling.stage('verify'):
+            bad = journal.verify()
+        print(f"🔎 Verified copies against the journal: {len(bad)} missing or changed")
+        for path in bad:
+            print(f"  ✗ {path}")
+    
     # Print summary
     print("\n" + "="*60)
     print("📊 ORGANIZATION SUMMARY")
@@ -162,4 +169,10 @@ def organize_bike_assets():
     print(f"\n✅ Summary saved to: {summary_file}")
 
 if __name__ == "__main__":
-    organize_bike_assets()
+    parser = argparse.ArgumentParser(description="Organize extracted bike assets by category")
+    parser.add_argument("--verify", action="store_true",
+                        help="re-hash every journaled copy afterwards and report mismatches")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    with profiling.session(args):
+        organize_bike_assets(verify=args.verify)
@@ -5,14 +5,22 @@ Refine bike asset organization:
 - Separate logo/overlay/edited images
 - Keep clean bike images separate
 - Organize components properly
+
+Images that would land in images/clean/ are also checked by content
+(riftkit.detect): badges, banners, logos and text move them to overlays/.
+Copies are journaled like organize-bike-assets.py's, so re-runs skip
+finished files and a file whose category changed is moved, not copied again.
 """
 
+import argparse
 import os
-import shutil
 from pathlib import Path
-from PIL import Image
 import re
 
+from riftkit import profiling
+from riftkit.detect import detect_image, detect_images
+from riftkit.journal import PlacementJournal
+
 SOURCE_DIR = Path("/home/tau/RIFT/organized_bikes")
 TARGET_DIR = Path("/home/tau/RIFT/organized_bikes_refined")
 
@@ -45,8 +53,16 @@ COLOR_KEYWORDS = [
     "green", "yellow", "orange", "purple", "pink", "silver", "gold"
 ]
 
-def analyze_image_content(image_path):
-    """Analyze image to detect if it contains logos, text, or overlays."""
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.webp', '.gif']
+
+def analyze_image_content(image_path, detection=None):
+    """Analyze image to detect if it contains logos, text, or overlays.
+    
+    Pass a riftkit.detect Detection from a batch run to skip decoding here.
+    """
+    # Imported here so the filename rules, which ingest and the watcher reuse, work without Pillow
+    from PIL import Image
+
     try:
         img = Image.open(image_path)
         # Simple heuristic: check if image is very small (likely a component/logo)
@@ -54,9 +70,12 @@ def analyze_image_content(image_path):
         if width < 500 or height < 500:
             return {"likely_component": True, "likely_overlay": False}
         
-        # For now, rely on filename analysis
-        # In future, could use OCR or image analysis
-        return {"likely_component": False, "likely_overlay": False}
+        # Edge, flat-colour, text-stroke and corner-badge scores of the pixels
+        if detection is None:
+            detection = detect_image(str(image_path))
+        flags = [] if detection.error else detection.flags()
+        return {"likely_component": False, "likely_overlay": bool(flags),
+                "flags": flags, "reason": detection.reason()}
     except Exception as e:
         return {"likely_component": False, "likely_overlay": False}
 
@@ -100,7 +119,72 @@ def categorize_image(filename, filepath):
     # Default to main/clean image
     return "clean"
 
-def refine_organization():
+def refined_subdir(category, file_path):
+    """Folder under the bike's refined directory that a categorized file goes to."""
+    if category in ("components", "overlays", "comparisons", "specs"):
+        return category
+    if category in ("geometry", "details", "colors"):
+        return f"images/{category}"
+    if Path(file_path).suffix.lower() in ['.mp4', '.mov', '.avi', '.webm']:
+        return "videos"
+    return "images/clean"
+
+def check_clean_images(structures, jobs=1):
+    """Move images whose content looks edited out of images/clean."""
+    candidates = [file_path for structure in structures.values()
+                  for file_path in structure["images"]["clean"]
+                  if file_path.suffix.lower() in IMAGE_EXTENSIONS]
+    print(f"\n🔬 Checking {len(candidates)} clean images by content...")
+    try:
+        with profiling.stage('detect'):
+            detections = detect_images([str(p) for p in candidates], jobs=jobs)
+    except ImportError:
+        print("⚠️  Pillow and NumPy are needed for content analysis; keeping filename categories")
+        return
+    
+    results = {path: analyze_image_content(path, detection)
+             for path, detection in zip(candidates, detections)}
+    for structure in structures.values():
+        clean = []
+        for file_path in structure["images"]["clean"]:
+            result = results.get(file_path, {})
+            if result.get("likely_component"):
+                structure["components"].append(file_path)
+                print(f"  ↪ components   ← {file_path.name} (small image)")
+            elif result.get("likely_overlay"):
+                structure["overlays"].append(file_path)
+                print(f"  ↪ overlays     ← {file_path.name} ({', '.join(result['flags'])}: {result['reason']})")
+            else:
+                clean.append(file_path)
+        structure["images"]["clean"] = clean
+
+def write_summary(stats, target_dir=None):
+    """Write REFINED_ORGANIZATION.md into target_dir (default TARGET_DIR) and return its path."""
+    summary_file = Path(target_dir or TARGET_DIR) / "REFINED_ORGANIZATION.md"
+    with open(summary_file, 'w') as f:
+        f.write("# Refined Bike Assets Organization\n\n")
+        f.write("## Structure\n\n")
+        f.write("```\n")
+        f.write("bike-model/\n")
+        f.write("├── images/\n")
+        f.write("│   ├── clean/      # Clean bike photos (no logos/overlays)\n")
+        f.write("│   ├── details/     # Detail shots\n")
+        f.write("│   ├── colors/     # Color variations\n")
+        f.write("│   └── geometry/   # Geometry diagrams\n")
+        f.write("├── components/     # Component images (groupsets, brakes, etc.)\n")
+        f.write("├── overlays/       # Images with logos/watermarks/overlays\n")
+        f.write("├── comparisons/   # Comparison images\n")
+        f.write("├── specs/         # Specification screenshots\n")
+        f.write("└── videos/       # Video files\n")
+        f.write("```\n\n")
+        f.write("## Statistics\n\n")
+        f.write(f"- Total files: {stats['total']}\n")
+        f.write(f"\n### By Category\n\n")
+        for category, count in sorted(stats['by_category'].items()):
+            f.write(f"- **{category}**: {count} files\n")
+    return summary_file
+
+def refine_organization(content=True, jobs=1, verify=False):
     """Refine the organization with better categorization."""
     stats = {
         "total": 0,
@@ -108,7 +192,8 @@ def refine_organization():
         "by_bike": {}
     }
     
-    # Create new structure
+    # Categorize every file by name first
+    structures = {}
     for bike_dir in SOURCE_DIR.iterdir():
         if not bike_dir.is_dir() or bike_dir.name.startswith('.'):
             continue
@@ -116,9 +201,6 @@ def refine_organization():
         bike_name = bike_dir.name
         print(f"\n📦 Processing {bike_name}...")
         
-        target_bike_dir = TARGET_DIR / bike_name
-        target_bike_dir.mkdir(parents=True, exist_ok=True)
-        
         # Create refined structure
         structure = {
             "images": {
@@ -142,26 +224,24 @@ def refine_organization():
                 category = categorize_image(filename, file_path)
                 
                 # Determine target location
-                if category == "components":
-                    structure["components"].append(file_path)
-                elif category == "overlays":
-                    structure["overlays"].append(file_path)
-                elif category == "comparisons":
-                    structure["comparisons"].append(file_path)
-                elif category == "specs":
-                    structure["specs"].append(file_path)
-                elif category == "geometry":
-                    structure["images"]["geometry"].append(file_path)
-                elif category == "details":
-                    structure["images"]["details"].append(file_path)
-                elif category == "colors":
-                    structure["images"]["colors"].append(file_path)
-                elif file_path.suffix.lower() in ['.mp4', '.mov', '.avi', '.webm']:
-                    structure["videos"].append(file_path)
+                section, _, subcat = refined_subdir(category, file_path).partition("/")
+                if subcat:
+                    structure[section][subcat].append(file_path)
                 else:
-                    structure["images"]["clean"].append(file_path)
+                    structure[section].append(file_path)
+        
+        structures[bike_name] = structure
+    
+    # Then check the would-be clean images by content, all bikes in one batch
+    if content:
+        check_clean_images(structures, jobs)
+    
+    # Copy files to new structure
+    journal = PlacementJournal(TARGET_DIR)
+    for bike_name, structure in structures.items():
+        target_bike_dir = TARGET_DIR / bike_name
+        target_bike_dir.mkdir(parents=True, exist_ok=True)
         
-        # Copy files to new structure
         for category, files in structure.items():
             if category == "images":
                 for subcat, subfiles in files.items():
@@ -169,22 +249,31 @@ def refine_organization():
                         target_subdir = target_bike_dir / "images" / subcat
                         target_subdir.mkdir(parents=True, exist_ok=True)
                         for file_path in subfiles:
-                            target_file = target_subdir / file_path.name
-                            shutil.copy2(file_path, target_file)
+                            target_file, copied = journal.place(file_path, target_subdir)
                             stats["by_category"][f"images/{subcat}"] = stats["by_category"].get(f"images/{subcat}", 0) + 1
-                            print(f"  ✓ images/{subcat:10} → {file_path.name}")
+                            if copied:
+                                print(f"  ✓ images/{subcat:10} → {os.path.basename(target_file)}")
             else:
                 if files:
                     target_subdir = target_bike_dir / category
                     target_subdir.mkdir(parents=True, exist_ok=True)
                     for file_path in files:
-                        target_file = target_subdir / file_path.name
-                        shutil.copy2(file_path, target_file)
+                        target_file, copied = journal.place(file_path, target_subdir)
                         stats["by_category"][category] = stats["by_category"].get(category, 0) + 1
-                        print(f"  ✓ {category:12} → {file_path.name}")
+                        if copied:
+                            print(f"  ✓ {category:12} → {os.path.basename(target_file)}")
         
         stats["by_bike"][bike_name] = sum(len(files) if isinstance(files, list) else sum(len(v) for v in files.values() if isinstance(v, list)) for files in structure.values())
     
+    journal.close()
+    print(f"\n📒 Journal: {journal.summary()}")
+    if verify:
+        with profiling.stage('verify'):
+            bad = journal.verify()
+        print(f"🔎 Verified copies against the journal: {len(bad)} missing or changed")
+        for path in bad:
+            print(f"  ✗ {path}")
+    
     # Print summary
     print("\n" + "="*60)
     print("📊 REFINED ORGANIZATION SUMMARY")
@@ -198,33 +287,23 @@ def refine_organization():
         print(f"  {bike:20}: {count:3} files")
     print("="*60)
     
-    # Create summary document
-    summary_file = TARGET_DIR / "REFINED_ORGANIZATION.md"
-    with open(summary_file, 'w') as f:
-        f.write("# Refined Bike Assets Organization\n\n")
-        f.write("## Structure\n\n")
-        f.write("```\n")
-        f.write("bike-model/\n")
-        f.write("├── images/\n")
-        f.write("│   ├── clean/      # Clean bike photos (no logos/overlays)\n")
-        f.write("│   ├── details/     # Detail shots\n")
-        f.write("│   ├── colors/     # Color variations\n")
-        f.write("│   └── geometry/   # Geometry diagrams\n")
-        f.write("├── components/     # Component images (groupsets, brakes, etc.)\n")
-        f.write("├── overlays/       # Images with logos/watermarks/overlays\n")
-        f.write("├── comparisons/   # Comparison images\n")
-        f.write("├── specs/         # Specification screenshots\n")
-        f.write("└── videos/       # Video files\n")
-        f.write("```\n\n")
-        f.write("## Statistics\n\n")
-        f.write(f"- Total files: {stats['total']}\n")
-        f.write(f"\n### By Category\n\n")
-        for category, count in sorted(stats['by_category'].items()):
-            f.write(f"- **{category}**: {count} files\n")
+    summary_file = write_summary(stats)
     
     print(f"\n✅ Refined organization complete!")
     print(f"📁 Location: {TARGET_DIR}")
     print(f"📄 Summary: {summary_file}")
 
 if __name__ == "__main__":
-    refine_organization()
+    parser = argparse.ArgumentParser(description="Refine organized bike assets into finer categories")
+    parser.add_argument("--no-content", action="store_true",
+                        help="categorize by filename only, without checking clean images by content")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="worker processes for content analysis (0 = one per CPU core)")
+    parser.add_argument("--verify", action="store_true",
+                        help="re-hash every journaled copy afterwards and report mismatches")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    with profiling.session(args):
+        refine_organization(content=not args.no_content,
+                            jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1),
+                            verify=args.verify)
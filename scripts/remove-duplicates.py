@@ -1,32 +1,148 @@
 #!/usr/bin/env python3
 """
-Remove duplicate files with _1 suffix.
-Keeps the original and removes duplicates.
+Remove duplicate files from the refined bike assets.
+Byte-identical copies within one bike folder are removed, keeping the
+original (the name without a _1/_2 suffix); bikes that share a supplier photo
+keep their own copy, and those matches are listed in DUPLICATES_REPORT.md.
+Visually identical photos saved under different names or re-encoded are
+listed there too, for review.
+With --catalog, exact duplicates come from the content hashes in the asset
+catalog (riftkit.catalog), so only new or changed files are read.
 """
 
+import argparse
+import os
+import time
 from pathlib import Path
 
+from riftkit import profiling
+from riftkit.catalog import Catalog
+from riftkit.dedupe import (IMAGE_EXTENSIONS, find_exact_duplicates, find_near_duplicates,
+                            iter_files, perceptual_hashes, split_by_bike, split_keeper)
+
 SOURCE_DIR = Path("/home/tau/RIFT/organized_bikes_refined")
 
-def remove_duplicates():
-    """Remove duplicate files with _1 suffix."""
-    duplicates = []
+
+def remove_duplicates(source_dir=SOURCE_DIR, dry_run=False, near=True, method='dhash',
+                      threshold=6, jobs=1, catalog=False):
+    """Remove exact duplicates and report near duplicates."""
+    start = time.perf_counter()
+    with profiling.stage('scan'):
+        if catalog:
+            with Catalog() as assets:
+                assets.update(source_dir)
+                files = [(asset.full_path, asset.size) for asset in assets.files(source_dir)]
+                exact_groups = [[asset.full_path for asset in group]
+                                for group in assets.duplicates(source_dir)]
+        else:
+            files = list(iter_files(str(source_dir)))
+            exact_groups = None
+    total_bytes = sum(size for _, size in files)
+    print(f"🔍 Scanning {len(files)} files ({total_bytes / 1024 / 1024:.1f}MB) in {source_dir}")
+
+    # Exact duplicates: size -> first 64KB -> full BLAKE2b, removed within each bike
     removed = 0
-    
-    for file_path in SOURCE_DIR.rglob("*_1.*"):
-        if file_path.is_file():
-            # Find original file
-            original_name = file_path.name.replace("_1.", ".")
-            original_path = file_path.parent / original_name
-            
-            if original_path.exists():
-                duplicates.append((str(original_path), str(file_path)))
-                file_path.unlink()
-                removed += 1
-                print(f"✓ Removed duplicate: {file_path.name}")
-    
-    print(f"\n✅ Removed {removed} duplicate files")
+    freed = 0
+    duplicate_paths = set()
+    shared_groups = []
+    with profiling.stage('exact duplicates'):
+        for group in find_exact_duplicates(files) if exact_groups is None else exact_groups:
+            keepers = []
+            for bike_group in split_by_bike(group, str(source_dir)):
+                keeper, copies = split_keeper(bike_group)
+                keepers.append(keeper)
+                for path in copies:
+                    duplicate_paths.add(path)
+                    size = os.path.getsize(path)
+                    if not dry_run:
+                        os.unlink(path)
+                    removed += 1
+                    freed += size
+                    action = "Would remove" if dry_run else "Removed"
+                    print(f"✓ {action} duplicate: {os.path.relpath(path, source_dir)} "
+                          f"(same bytes as {os.path.basename(keeper)})")
+            if len(keepers) > 1:
+                shared_groups.append(keepers)
+
+    # Near duplicates among the images that are left
+    near_groups = None
+    if near:
+        images = [path for path, _ in files
+                  if path.lower().endswith(IMAGE_EXTENSIONS) and path not in duplicate_paths]
+        try:
+            with profiling.stage('perceptual hashes'):
+                hashes = perceptual_hashes(images, method=method, jobs=jobs)
+        except ImportError:
+            print("⚠️  Pillow and NumPy are needed for near-duplicate detection; skipping it")
+        else:
+            with profiling.stage('near duplicates'):
+                near_groups = find_near_duplicates(hashes, threshold=threshold)
+    if near_groups is not None or shared_groups:
+        write_report(source_dir, shared_groups, near_groups, method, threshold)
+
+    elapsed = time.perf_counter() - start
+    verb = "Would remove" if dry_run else "Removed"
+    print(f"\n✅ {verb} {removed} duplicate files ({freed / 1024 / 1024:.1f}MB) in {elapsed:.1f}s")
+    if shared_groups:
+        print(f"🔗 {len(shared_groups)} files shared between bikes (kept) listed in "
+              f"{source_dir / 'DUPLICATES_REPORT.md'}")
+    if near_groups:
+        print(f"🖼  {len(near_groups)} groups of near-duplicate images listed in "
+              f"{source_dir / 'DUPLICATES_REPORT.md'}")
     return removed
 
+
+def write_report(source_dir, shared_groups, near_groups, method, threshold):
+    """Write the files shared between bikes and the near-duplicate groups for manual review."""
+    report_file = Path(source_dir) / "DUPLICATES_REPORT.md"
+    with open(report_file, 'w') as f:
+        if shared_groups:
+            f.write("# Shared Between Bikes\n\n")
+            f.write("Byte-identical files in more than one bike folder. Each bike keeps its copy;\n")
+            f.write("check whether the photo really belongs to every bike listed.\n\n")
+            for i, group in enumerate(shared_groups, 1):
+                f.write(f"## Shared {i}\n\n")
+                for path in group:
+                    f.write(f"- `{os.path.relpath(path, source_dir)}`\n")
+                f.write("\n")
+        if near_groups is None:
+            return
+        f.write("# Near-Duplicate Images\n\n")
+        f.write(f"Perceptual hash: {method}, threshold: {threshold} of 64 bits.\n")
+        f.write("The first file in each group is the one to keep; the distance is the number\n")
+        f.write("of differing hash bits (0 = visually identical).\n\n")
+        if not near_groups:
+            f.write("### ✅ No near-duplicate images found\n")
+        for i, group in enumerate(near_groups, 1):
+            f.write(f"## Group {i}\n\n")
+            for path, distance in group:
+                f.write(f"- `{os.path.relpath(path, source_dir)}` (distance {distance})\n")
+            f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Remove duplicate bike asset files')
+    parser.add_argument('--source', type=Path, default=SOURCE_DIR,
+                        help=f'folder to deduplicate (default: {SOURCE_DIR})')
+    parser.add_argument('--dry-run', action='store_true', help='report duplicates without deleting')
+    parser.add_argument('--no-near', action='store_true', help='skip perceptual near-duplicate search')
+    parser.add_argument('--method', choices=('dhash', 'phash'), default='dhash',
+                        help='perceptual hash used for near duplicates')
+    parser.add_argument('--threshold', type=int, default=6,
+                        help='max differing hash bits for two images to count as near duplicates')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='worker processes for image hashing (0 = one per CPU core)')
+    parser.add_argument('--catalog', action='store_true',
+                        help='take content hashes from the asset catalog instead of rehashing')
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling.session(args):
+        remove_duplicates(args.source, dry_run=args.dry_run, near=not args.no_near,
+                          method=args.method, threshold=args.threshold,
+                          jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1),
+                          catalog=args.catalog)
+
+
 if __name__ == "__main__":
-    remove_duplicates()
+    main()
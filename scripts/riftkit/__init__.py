@@ -0,0 +1,6 @@
+"""
+RIFT build toolkit
+Shared helpers for the scripts in this directory. The generator scripts are
+run directly (python3 scripts/generate-*.py), which puts scripts/ on sys.path,
+so they can import from this package without any installation step.
+"""
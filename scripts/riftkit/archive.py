@@ -0,0 +1,144 @@
+"""
+Read supplier zip archives in place, without extracting them first.
+
+Supplier drops come from Windows machines set to Chinese, so most archives
+store member names in CP936/GBK without the UTF-8 flag. zipfile then
+decodes them as CP437 and names like 细节 come out as mojibake, which
+breaks the keyword matching in refine-bike-organization.py.
+decode_name() recovers the original name, trying in order:
+
+1. the UTF-8 flag (bit 11), when zipfile has already decoded correctly;
+2. an Info-ZIP Unicode Path extra field (0x7075) whose CRC matches;
+3. the raw bytes as UTF-8 (macOS Archive Utility sets no flag);
+4. the raw bytes as GB18030, a superset of CP936/GBK.
+
+Members are streamed straight to their destination and hashed on the way,
+so nothing is written to disk twice. Duplicate members are found from the
+central directory (size and CRC-32), and only a size and CRC match is read
+back to compare the bytes.
+"""
+
+import hashlib
+import os
+import struct
+import time
+import zipfile
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .dedupe import stream_digest
+from .journal import CHUNK_BYTES
+
+UTF8_FLAG = 0x800
+UNICODE_PATH_EXTRA = 0x7075
+FALLBACK_ENCODINGS = ('utf-8', 'gb18030')
+SKIP_PREFIXES = ('__MACOSX/',)
+
+
+def _unicode_path(info: zipfile.ZipInfo, raw: bytes) -> Optional[str]:
+    """Name from an Info-ZIP Unicode Path extra field, if it matches raw"""
+    extra = info.extra
+    while len(extra) >= 4:
+        header_id, size = struct.unpack('<HH', extra[:4])
+        data = extra[4:4 + size]
+        if header_id == UNICODE_PATH_EXTRA and len(data) >= 5 and data[0] == 1:
+            if struct.unpack('<L', data[1:5])[0] == zlib.crc32(raw):
+                try:
+                    return data[5:].decode('utf-8')
+                except UnicodeDecodeError:
+                    return None
+        extra = extra[4 + size:]
+    return None
+
+
+def decode_name(info: zipfile.ZipInfo) -> str:
+    """The member's name as the supplier's machine wrote it"""
+    if info.flag_bits & UTF8_FLAG:
+        return info.filename
+    try:
+        raw = info.filename.encode('cp437')
+    except UnicodeEncodeError:
+        return info.filename  # opened with metadata_encoding; already decoded
+    name = _unicode_path(info, raw)
+    if name:
+        return name
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return info.filename
+
+
+def iter_members(archive: zipfile.ZipFile) -> Iterator[Tuple[zipfile.ZipInfo, str]]:
+    """(info, decoded name) for every regular file, skipping folders and dotfiles"""
+    for info in archive.infolist():
+        if info.is_dir():
+            continue
+        name = decode_name(info).replace('\\', '/')
+        if name.startswith(SKIP_PREFIXES) or os.path.basename(name).startswith('.'):
+            continue
+        yield info, name
+
+
+def member_key(archive_path: str, name: str) -> str:
+    """How a member is named in the placement journal"""
+    return os.path.abspath(f"{archive_path}::{name}")
+
+
+def extract_with_digest(archive: zipfile.ZipFile, info: zipfile.ZipInfo, dst: str) -> str:
+    """Stream one member to dst and return the BLAKE2b of its bytes, in one read"""
+    h = hashlib.blake2b(digest_size=20)
+    with archive.open(info) as source, open(dst, 'wb') as target:
+        while True:
+            chunk = source.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            h.update(chunk)
+            target.write(chunk)
+        target.flush()
+        os.fsync(target.fileno())
+    try:
+        mtime = time.mktime(info.date_time + (0, 0, -1))
+        os.utime(dst, (mtime, mtime))
+    except (OverflowError, ValueError):
+        pass
+    return h.hexdigest()
+
+
+def member_digest(archive: zipfile.ZipFile, info: zipfile.ZipInfo, limit: Optional[int] = None) -> str:
+    """dedupe.file_digest() of a member's bytes, or of its first limit bytes"""
+    with archive.open(info) as source:
+        return stream_digest(source, limit)
+
+
+def same_bytes(archive: zipfile.ZipFile, a: zipfile.ZipInfo, b: zipfile.ZipInfo) -> bool:
+    """True if two members of the same archive decompress to the same bytes"""
+    with archive.open(a) as first, archive.open(b) as second:
+        while True:
+            chunk = first.read(CHUNK_BYTES)
+            if chunk != second.read(CHUNK_BYTES):
+                return False
+            if not chunk:
+                return True
+
+
+class MemberIndex:
+    """Exact-duplicate lookup for the members of one archive.
+
+    The central directory already holds every member's size and CRC-32, so
+    only members that agree on both are ever read to be compared.
+    """
+
+    def __init__(self, archive: zipfile.ZipFile):
+        self.archive = archive
+        self._by_crc: Dict[Tuple[int, int], List[Tuple[zipfile.ZipInfo, str]]] = {}
+
+    def add(self, info: zipfile.ZipInfo, name: str) -> Optional[str]:
+        """Record a member; returns the name of an earlier one with the same bytes, or None"""
+        earlier = self._by_crc.setdefault((info.file_size, info.CRC), [])
+        for other, other_name in earlier:
+            if same_bytes(self.archive, other, info):
+                return other_name
+        earlier.append((info, name))
+        return None
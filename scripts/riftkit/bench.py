@@ -0,0 +1,275 @@
+"""
+Fixtures, measurements and result files for run-benchmarks.py.
+
+Every benchmark case runs in its own Python process, so its peak RSS is its
+own and no import or cache warmed up by an earlier case flatters it. The
+parent snapshots the case's working tree before and after and counts the
+files that appeared or changed (and their bytes) and the files removed.
+
+The image pipeline runs over a synthetic organized_bikes tree made by
+build_bike_tree(): PNGs written here with zlib, so the same seed gives the
+same bytes on every machine with or without Pillow. File names cycle
+through BIKE_FILES, which covers every category refine-bike-organization
+sorts into, and include exact copies (`_1` names) and re-encoded near
+duplicates for remove-duplicates.py to find.
+
+Results are JSON files named after the commit they measured, in
+.benchmarks/ at the repository root; compare() lines two of them up.
+"""
+
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import statistics
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_DIR = os.path.join(REPO_ROOT, '.benchmarks')
+RESULTS_VERSION = 1
+
+# (file name, picture) cycled through for every bike; {n} is the file's number
+BIKE_FILES = [
+    ('side_view_{n}.png', 'photo'),
+    ('front_{n}.png', 'photo'),
+    ('hero_{n}.png', 'badge'),            # clean by name, edited by content
+    ('detail_closeup_{n}.png', 'photo'),
+    ('color_matte_black_{n}.png', 'photo'),
+    ('geometry_chart_{n}.png', 'flat'),
+    ('specification_{n}.png', 'flat'),
+    ('shimano_groupset_{n}.png', 'small'),
+    ('brake_rotor_{n}.png', 'small'),
+    ('logo_overlay_{n}.png', 'badge'),
+    ('comparison_{n}.png', 'photo'),
+    ('side_view_{n}_1.png', 'copy'),      # same bytes as side_view_{n}
+    ('front_{n}_web.png', 'reencoded'),   # same pixels as front_{n}, other bytes
+    ('promo_{n}.mp4', 'video'),
+]
+PHOTO_SIZE = (640, 480)
+SMALL_SIZE = (320, 240)
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+# ==================== FIXTURES ====================
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+
+def png_bytes(width: int, height: int, rows: Iterable[bytes], level: int = 6) -> bytes:
+    """An 8-bit RGB PNG from rows of width * 3 bytes"""
+    raw = b''.join(b'\x00' + row for row in rows)
+    return (PNG_SIGNATURE
+            + _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + _png_chunk(b'IDAT', zlib.compress(raw, level))
+            + _png_chunk(b'IEND', b''))
+
+
+def picture_rows(kind: str, width: int, height: int, rng: random.Random) -> List[bytes]:
+    """Pixel rows for one kind of picture: a photo-like gradient with a textured
+    subject, a flat diagram, or a photo with a flat badge in one corner"""
+    top = [rng.randrange(256) for _ in range(3)]
+    bottom = [rng.randrange(256) for _ in range(3)]
+    subject = range(width // 4 * 3, width // 4 * 9) if kind != 'flat' else range(0)
+    rows = []
+    for y in range(height):
+        color = bytes(t + (b - t) * y // height for t, b in zip(top, bottom))
+        row = bytearray(color * width)
+        if height // 4 <= y < height * 3 // 4 and subject:
+            row[subject.start:subject.stop] = rng.randbytes(len(subject))
+        if kind == 'flat' and y % 40 < 2:
+            row[:] = b'\x20' * len(row)   # grid lines
+        if kind == 'badge' and y < height // 6:
+            row[-width:] = b'\xff' * width   # the right third of the top rows
+        rows.append(bytes(row))
+    return rows
+
+
+def build_bike_tree(root: str, bikes: int = 4, files_per_bike: int = 14, seed: int = 0) -> Tuple[int, int]:
+    """Write a synthetic organized_bikes tree under root; returns (files, bytes)"""
+    files = total = 0
+    for bike in range(bikes):
+        bike_dir = os.path.join(root, f'RIFT BENCH {bike + 1:02d}')
+        os.makedirs(bike_dir, exist_ok=True)
+        pictures: Dict[str, Tuple[int, int, List[bytes]]] = {}
+        for index in range(files_per_bike):
+            template, kind = BIKE_FILES[index % len(BIKE_FILES)]
+            n = index // len(BIKE_FILES) + 1
+            name = template.format(n=n)
+            rng = random.Random(f'{seed}/{bike}/{index}')
+            if kind == 'video':
+                data = rng.randbytes(64 * 1024)
+            elif kind == 'copy':
+                with open(os.path.join(bike_dir, f'side_view_{n}.png'), 'rb') as f:
+                    data = f.read()
+            elif kind == 'reencoded':
+                width, height, rows = pictures[f'front_{n}.png']
+                data = png_bytes(width, height, rows, level=1)
+            else:
+                width, height = SMALL_SIZE if kind == 'small' else PHOTO_SIZE
+                rows = picture_rows(kind, width, height, rng)
+                pictures[name] = (width, height, rows)
+                data = png_bytes(width, height, rows)
+            with open(os.path.join(bike_dir, name), 'wb') as f:
+                f.write(data)
+            files += 1
+            total += len(data)
+    return files, total
+
+
+def fresh_copy(template: str, path: str) -> str:
+    """path replaced by a copy of the template tree"""
+    shutil.rmtree(path, ignore_errors=True)
+    shutil.copytree(template, path)
+    return path
+
+
+# ==================== MEASUREMENT ====================
+
+def snapshot(root: str) -> Dict[str, Tuple[int, int]]:
+    """path -> (size, mtime_ns) for every file under root"""
+    files = {}
+    for folder, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(folder, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files[path] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def changes(before: Dict[str, Tuple[int, int]], after: Dict[str, Tuple[int, int]]) -> Dict[str, int]:
+    """Files written (new or changed), their bytes, and files removed between two snapshots"""
+    written = [path for path, entry in after.items() if before.get(path) != entry]
+    return {'files': len(written), 'bytes': sum(after[path][0] for path in written),
+            'removed': sum(1 for path in before if path not in after)}
+
+
+def _own_peak_rss() -> Optional[int]:
+    """This process's own peak RSS in bytes from /proc (Linux), or None.
+
+    ru_maxrss is no use for it on Linux: it survives exec, so a process
+    started by a big parent reports the parent's peak.
+    """
+    try:
+        with open('/proc/self/status', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss() -> int:
+    """Peak resident set size in bytes of this process or any of its finished workers"""
+    scale = 1 if sys.platform == 'darwin' else 1024   # Linux reports kilobytes
+    own = _own_peak_rss()
+    if own is None:
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    return max(own, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale)
+
+
+def cpu_time() -> float:
+    """User plus system CPU seconds of this process and its finished workers"""
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, object]:
+    """One case's result: median times, the highest peak RSS, and the output of the last run"""
+    return {
+        'wall': statistics.median(s['wall'] for s in samples),
+        'cpu': statistics.median(s['cpu'] for s in samples),
+        'peak_rss': max(s['peak_rss'] for s in samples),
+        'files': samples[-1]['files'],
+        'bytes': samples[-1]['bytes'],
+        'removed': samples[-1]['removed'],
+        'samples': samples,
+    }
+
+
+# ==================== RESULT FILES ====================
+
+def git_revision() -> Tuple[str, bool]:
+    """(commit hash, whether the tree has uncommitted changes), or ('unknown', False)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, check=True,
+                                capture_output=True, text=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                               check=True, capture_output=True, text=True).stdout.strip() != ''
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+    return commit, dirty
+
+
+def new_results(**settings) -> Dict[str, object]:
+    """An empty result file: where and how the run happened, then a case table"""
+    commit, dirty = git_revision()
+    return {
+        'version': RESULTS_VERSION,
+        'commit': commit,
+        'dirty': dirty,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'settings': settings,
+        'cases': {},
+    }
+
+
+def default_results_path(results: Dict[str, object]) -> str:
+    name = results['commit'][:12] + ('-dirty' if results['dirty'] else '')
+    return os.path.join(RESULTS_DIR, f'{name}.json')
+
+
+def save_results(path: str, results: Dict[str, object]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def load_results(path: str) -> Dict[str, object]:
+    with open(path, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+    if results.get('version') != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported benchmark results version {results.get('version')!r}")
+    return results
+
+
+def compare(base: Dict[str, object], new: Dict[str, object], threshold: float = 0.10,
+            floor: float = 0.05) -> Tuple[List[Tuple[str, Optional[dict], Optional[dict]]], List[str]]:
+    """Cases of both runs side by side, and the names of the ones that regressed.
+
+    A case regresses when its wall time grows by more than threshold (a
+    fraction) and by more than floor seconds, or its peak RSS grows by more
+    than threshold, or it fails where it used to pass.
+    """
+    rows, regressions = [], []
+    for name in list(base['cases']) + [n for n in new['cases'] if n not in base['cases']]:
+        old, cur = base['cases'].get(name), new['cases'].get(name)
+        rows.append((name, old, cur))
+        if not old or not cur or 'error' in old:
+            continue
+        if 'error' in cur:
+            regressions.append(name)
+        elif (cur['wall'] - old['wall'] > max(floor, threshold * old['wall'])
+              or cur['peak_rss'] > old['peak_rss'] * (1 + threshold)):
+            regressions.append(name)
+    return rows, regressions
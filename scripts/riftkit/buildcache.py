@@ -0,0 +1,228 @@
+"""
+Content-addressed incremental build cache for the SVG generators.
+
+Every asset is keyed by a digest of its inputs: the source of the method that
+draws it, the arguments it is called with, and the generator-wide inputs
+(COLORS, font configs, dimension tables and the helper methods it calls).
+Assets whose digest matches the build manifest and whose outputs are still on
+disk are skipped. Everything else is rebuilt, and files are only rewritten when
+their bytes change, so unchanged assets keep their mtimes.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sys
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from riftkit import profiling
+
+MANIFEST_NAME = '.build-manifest.json'
+MANIFEST_VERSION = 1
+
+# Stack of (path, changed, size) lists for the assets currently being built
+_recorders: List[List[Tuple[str, bool, int]]] = []
+
+
+def digest(*parts) -> str:
+    """Stable short hash of arbitrary repr-able values"""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(repr(part).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def source_of(obj) -> str:
+    """Source text of a function or method, falling back to its name"""
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return getattr(obj, '__qualname__', repr(obj))
+
+
+def _is_plain_data(value) -> bool:
+    """True for nested dicts/lists/tuples of strings and numbers, whose repr is stable"""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain_data(item) for item in value)
+    if isinstance(value, dict):
+        return all(_is_plain_data(k) and _is_plain_data(v) for k, v in value.items())
+    return False
+
+
+def module_constants(module_name: str) -> Dict[str, object]:
+    """UPPER_CASE data constants of a module (COLORS, FONT_VARIATIONS, ...)"""
+    module = sys.modules[module_name]
+    return {name: value for name, value in sorted(vars(module).items())
+            if name.isupper() and _is_plain_data(value)}
+
+
+def asset_methods(cls, prefixes: Tuple[str, ...], exclude: Iterable[str] = ()) -> List[str]:
+    """Names of the asset-drawing methods of a generator class, in definition order"""
+    exclude = set(exclude)
+    return [name for name, value in vars(cls).items()
+            if callable(value) and name.startswith(prefixes) and name not in exclude]
+
+
+def note_output(path: str, changed: bool, size: int):
+    """Attribute a written (or confirmed unchanged) file to the asset being built"""
+    profiling.note_output(path, size)
+    if _recorders:
+        _recorders[-1].append((path, changed, size))
+
+
+def write_text(path: str, content: str) -> bool:
+    """Write content to path unless the file already holds exactly that text.
+
+    Returns True if the file was written.
+    """
+    data = content.encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            changed = f.read() != data
+    except OSError:
+        changed = True
+
+    if changed:
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    note_output(path, changed, len(data))
+    return changed
+
+
+@contextmanager
+def recording() -> Iterator[List[Tuple[str, bool, int]]]:
+    """Collect (path, changed, size) for every output written inside the block"""
+    outputs: List[Tuple[str, bool, int]] = []
+    _recorders.append(outputs)
+    try:
+        yield outputs
+    finally:
+        _recorders.pop()
+        if _recorders:
+            _recorders[-1].extend(outputs)
+
+
+class BuildCache:
+    """Build manifest for one output directory"""
+
+    def __init__(self, root: str, force: bool = False, salt: str = ''):
+        self.root = root
+        self.path = os.path.join(root, MANIFEST_NAME)
+        self.force = force
+        self.salt = salt
+        self.dirty = False
+        self.assets = self._load()
+        self.results: Dict[str, List[str]] = {'built': [], 'unchanged': [], 'skipped': []}
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != MANIFEST_VERSION:
+            return {}
+        return data.get('assets', {})
+
+    def is_fresh(self, key: str, fingerprint: str) -> bool:
+        """True if the asset's inputs are unchanged and its outputs are intact"""
+        entry = self.assets.get(key)
+        if self.force or entry is None or entry['inputs'] != digest(self.salt, fingerprint):
+            return False
+        for rel_path, size in entry['outputs'].items():
+            try:
+                if os.path.getsize(os.path.join(self.root, rel_path)) != size:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def skip(self, key: str):
+        """Note an asset that was up to date and not rebuilt"""
+        self.results['skipped'].append(key)
+
+    def record(self, key: str, fingerprint: str, outputs: List[Tuple[str, bool, int]]):
+        """Store the inputs digest and outputs of an asset that was just built"""
+        self.dirty = True
+        self.assets[key] = {
+            'inputs': digest(self.salt, fingerprint),
+            'outputs': {os.path.relpath(path, self.root): size for path, _, size in outputs},
+        }
+        if any(changed for _, changed, _ in outputs):
+            self.results['built'].extend(os.path.relpath(path, self.root)
+                                         for path, changed, _ in outputs if changed)
+        else:
+            self.results['unchanged'].append(key)
+
+    def build(self, key: str, fingerprint: str, fn: Callable, *args, **kwargs):
+        """Run fn unless the asset it draws is already up to date"""
+        if _recorders:
+            # Called from inside another asset, which owns these outputs
+            return fn(*args, **kwargs)
+        if self.is_fresh(key, fingerprint):
+            self.skip(key)
+            return None
+        with recording() as outputs, profiling.asset(os.path.join(self.root, key), outputs):
+            result = fn(*args, **kwargs)
+        self.record(key, fingerprint, outputs)
+        return result
+
+    def instrument(self, generator, names: Iterable[str]):
+        """Route calls to the named asset methods of a generator through the cache.
+
+        The generator-wide salt covers the module's constants and the source of
+        every method that is not itself an asset, so editing a shared helper
+        such as create_svg or get_rift_icon invalidates every asset.
+        """
+        names = list(names)
+        cls = type(generator)
+        helpers = [source_of(value) for name, value in vars(cls).items()
+                   if callable(value) and name not in names]
+        salt = digest(module_constants(cls.__module__), helpers)
+        for name in names:
+            setattr(generator, name, self._wrap(cls.__name__, name, getattr(generator, name), salt))
+
+    def _wrap(self, cls_name: str, name: str, method: Callable, salt: str) -> Callable:
+        source = source_of(method)
+
+        def cache_key(*args, **kwargs) -> Tuple[str, str]:
+            call = digest(args, sorted(kwargs.items()))
+            key = f"{cls_name}.{name}" if not (args or kwargs) else f"{cls_name}.{name}:{call[:12]}"
+            return key, digest(salt, source, call)
+
+        @functools.wraps(method)
+        def cached(*args, **kwargs):
+            key, fingerprint = cache_key(*args, **kwargs)
+            return self.build(key, fingerprint, method, *args, **kwargs)
+
+        # Exposed so callers that build out of process can check and record freshness
+        cached.cache_key = cache_key
+        cached.build_cache = self
+        return cached
+
+    def save(self):
+        """Atomically write the manifest back to disk if anything was rebuilt"""
+        if not self.dirty:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'assets': self.assets}, f,
+                      indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def print_report(self):
+        """Print what was rebuilt, what was regenerated byte-identical and what was skipped"""
+        built = self.results['built']
+        print(f"\n♻️  Build cache ({self.path}): {len(built)} files rewritten, "
+              f"{len(self.results['unchanged'])} assets regenerated unchanged, "
+              f"{len(self.results['skipped'])} assets skipped")
+        for rel_path in built:
+            print(f"   rebuilt: {rel_path}")
@@ -0,0 +1,242 @@
+"""
+Persistent SQLite catalog of the asset trees.
+
+The organize/refine/review/dedupe scripts and the preview generators each
+used to crawl their tree with rglob or os.walk and open images to learn
+their sizes. Catalog keeps one row per file instead:
+
+    assets(root, path, bike, category, ext, size, mtime_ns,
+           width, height, format, digest)
+
+root is the absolute tree the file was found in and path is relative to
+it. bike is the first folder for the bike trees (organized_bikes_refined,
+public/bikes), and category is the rest of the folder path (images/clean,
+components, ...). width/height come from the image header (riftkit.probe)
+or from the SVG root tag. digest is the BLAKE2b of the content.
+
+update() rescans a tree with os.scandir and only probes and hashes files
+whose size or mtime changed, so a refresh costs one stat per file. Queries
+after that (files(), duplicates(), summary()) are SQL on indexed columns
+and take milliseconds.
+"""
+
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from riftkit.dedupe import file_digest
+from riftkit.gallery import svg_dimensions
+from riftkit.probe import IMAGE_EXTENSIONS, probe_image
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_PATH = REPO_ROOT / '.asset-catalog.sqlite'
+SCHEMA_VERSION = 1
+
+# Trees the scripts work on: name -> (folder, whether the first folder is a bike)
+ROOTS = {
+    'refined': (REPO_ROOT / 'organized_bikes_refined', True),
+    'public-bikes': (REPO_ROOT / 'public' / 'bikes', True),
+    'output': (REPO_ROOT / 'output', False),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    root      TEXT NOT NULL,
+    path      TEXT NOT NULL,
+    bike      TEXT,
+    category  TEXT NOT NULL,
+    ext       TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    width     REAL,
+    height    REAL,
+    format    TEXT,
+    digest    TEXT,
+    PRIMARY KEY (root, path)
+);
+CREATE INDEX IF NOT EXISTS assets_bike ON assets (root, bike, category);
+CREATE INDEX IF NOT EXISTS assets_digest ON assets (digest);
+CREATE INDEX IF NOT EXISTS assets_size ON assets (size);
+"""
+
+
+class Asset(NamedTuple):
+    root: str
+    path: str          # relative to root, with / separators
+    bike: Optional[str]
+    category: str
+    ext: str
+    size: int
+    mtime_ns: int
+    width: Optional[float]
+    height: Optional[float]
+    format: Optional[str]
+    digest: Optional[str]
+
+    @property
+    def full_path(self) -> str:
+        return os.path.join(self.root, self.path)
+
+
+def place_in_tree(rel_path: str, has_bikes: bool) -> Tuple[Optional[str], str]:
+    """(bike, category) for a path relative to its tree"""
+    parts = rel_path.split('/')[:-1]
+    if has_bikes and parts:
+        return parts[0], '/'.join(parts[1:]) or 'root'
+    return None, '/'.join(parts) or 'root'
+
+
+def _walk(root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """(relative path, stat) of every file under root, skipping dotfiles"""
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            entries = list(os.scandir(os.path.join(root, rel_dir)))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(rel_path)
+            elif entry.is_file(follow_symlinks=False):
+                yield rel_path, entry.stat(follow_symlinks=False)
+
+
+def _describe(full_path: str, stat: os.stat_result) -> Tuple[Optional[float], Optional[float], Optional[str], Optional[str]]:
+    """(width, height, format, digest) of one file; the slow part of an update"""
+    lower = full_path.lower()
+    width = height = fmt = None
+    if lower.endswith('.svg'):
+        width, height = svg_dimensions(full_path)
+        fmt = 'svg'
+    elif lower.endswith(IMAGE_EXTENSIONS):
+        probe = probe_image(full_path, stat.st_size, stat.st_mtime_ns)
+        if not probe.error:
+            width, height, fmt = probe.width, probe.height, probe.format
+    try:
+        digest = file_digest(full_path)
+    except OSError:
+        digest = None
+    return width, height, fmt, digest
+
+
+class Catalog:
+    """The assets table, with incremental updates and a few canned queries"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = str(path)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        version = self.db.execute('PRAGMA user_version').fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.db.execute('DROP TABLE IF EXISTS assets')
+            self.db.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # ---- updating -----------------------------------------------------
+
+    def update(self, root, has_bikes: bool = True, workers: int = 8) -> Dict[str, int]:
+        """Bring root's rows in line with the disk; returns added/changed/removed/unchanged counts"""
+        root = os.path.abspath(str(root))
+        known = {path: (size, mtime_ns) for path, size, mtime_ns in self.db.execute(
+            'SELECT path, size, mtime_ns FROM assets WHERE root = ?', (root,))}
+        seen = set()
+        todo = []
+        for rel_path, stat in _walk(root):
+            seen.add(rel_path)
+            if known.get(rel_path) != (stat.st_size, stat.st_mtime_ns):
+                todo.append((rel_path, stat))
+
+        def work(item):
+            rel_path, stat = item
+            return item, _describe(os.path.join(root, rel_path), stat)
+
+        rows = []
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for (rel_path, stat), (width, height, fmt, digest) in pool.map(work, todo):
+                bike, category = place_in_tree(rel_path, has_bikes)
+                rows.append((root, rel_path, bike, category, os.path.splitext(rel_path)[1].lower(),
+                             stat.st_size, stat.st_mtime_ns, width, height, fmt, digest))
+        removed = [(root, path) for path in known if path not in seen]
+        with self.db:
+            self.db.executemany('INSERT OR REPLACE INTO assets VALUES (?,?,?,?,?,?,?,?,?,?,?)', rows)
+            self.db.executemany('DELETE FROM assets WHERE root = ? AND path = ?', removed)
+        added = sum(1 for rel_path, _ in todo if rel_path not in known)
+        return {'added': added, 'changed': len(todo) - added, 'removed': len(removed),
+                'unchanged': len(seen) - len(todo)}
+
+    def update_roots(self, names: Sequence[str] = tuple(ROOTS), workers: int = 8) -> Dict[str, Dict[str, int]]:
+        """update() every named tree in ROOTS that exists"""
+        results = {}
+        for name in names:
+            folder, has_bikes = ROOTS[name]
+            if folder.is_dir():
+                results[name] = self.update(folder, has_bikes, workers=workers)
+        return results
+
+    # ---- queries ------------------------------------------------------
+
+    def files(self, root=None, bike: Optional[str] = None, category: Optional[str] = None,
+              extensions: Optional[Sequence[str]] = None) -> List[Asset]:
+        """Rows matching every given filter, sorted by root and path.
+
+        category matches exactly, or as a prefix when it ends in '/'
+        ('images/' matches images/clean, images/details, ...).
+        """
+        clauses, args = [], []
+        if root is not None:
+            clauses.append('root = ?')
+            args.append(os.path.abspath(str(root)))
+        if bike is not None:
+            clauses.append('bike = ?')
+            args.append(bike)
+        if category is not None:
+            if category.endswith('/'):
+                clauses.append("substr(category, 1, ?) = ?")
+                args.extend([len(category), category])
+            else:
+                clauses.append('category = ?')
+                args.append(category)
+        if extensions:
+            clauses.append(f"ext IN ({','.join('?' * len(extensions))})")
+            args.extend(ext.lower() for ext in extensions)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        return [Asset(*row) for row in self.db.execute(
+            f'SELECT * FROM assets {where} ORDER BY root, path', args)]
+
+    def duplicates(self, root=None) -> List[List[Asset]]:
+        """Groups of files with the same digest, optionally within one tree"""
+        scope, args = ('AND root = ?', [os.path.abspath(str(root))]) if root is not None else ('', [])
+        rows = self.db.execute(f'''
+            SELECT * FROM assets WHERE digest IN (
+                SELECT digest FROM assets WHERE digest IS NOT NULL {scope}
+                GROUP BY digest HAVING COUNT(*) > 1) {scope}
+            ORDER BY digest, root, path''', args + args)
+        groups: Dict[str, List[Asset]] = {}
+        for row in rows:
+            asset = Asset(*row)
+            groups.setdefault(asset.digest, []).append(asset)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def summary(self, root=None) -> List[Tuple[str, Optional[str], str, int, int]]:
+        """(root, bike, category, files, bytes) for every group"""
+        scope, args = ('WHERE root = ?', [os.path.abspath(str(root))]) if root is not None else ('', [])
+        return list(self.db.execute(f'''
+            SELECT root, bike, category, COUNT(*), SUM(size) FROM assets {scope}
+            GROUP BY root, bike, category ORDER BY root, bike, category''', args))
@@ -0,0 +1,347 @@
+"""
+Duplicate and near-duplicate detection for bike asset folders.
+
+Exact duplicates are found in three narrowing passes, so most files are
+never read in full:
+
+1. group by file size (a stat, no reads);
+2. within a size group, hash the first 64KiB;
+3. within a head-hash group, hash the whole file with streamed BLAKE2b.
+
+DuplicateIndex applies the same passes to files that arrive one at a time.
+Copies are only removed within one bike folder (split_by_bike): two bikes
+can legitimately share a supplier photo.
+
+Near duplicates (re-encoded, resized or lightly edited copies of the same
+photo) are found with a 64-bit perceptual hash (dHash or pHash) and a
+BK-tree over Hamming distance. A lookup only visits the subtrees whose
+distance band can still hold a match, so it stays sub-linear. Perceptual
+hashing needs Pillow and NumPy; exact matching needs only the standard
+library.
+"""
+
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tif', '.tiff')
+HEAD_BYTES = 64 * 1024
+CHUNK_BYTES = 1024 * 1024
+HASH_SIZE = 8  # 8x8 -> 64-bit perceptual hashes
+
+# "name_1.jpg", "name_12.png": copies made by organize-bike-assets.py on re-run
+COPY_SUFFIX_RE = re.compile(r'_\d+$')
+
+
+# ==================== FILE WALKING ====================
+
+def iter_files(root: str, extensions: Optional[Tuple[str, ...]] = None) -> Iterator[Tuple[str, int]]:
+    """Yield (path, size) for every file under root, using scandir's cached stat"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                if extensions and not entry.name.lower().endswith(extensions):
+                    continue
+                yield entry.path, entry.stat(follow_symlinks=False).st_size
+
+
+# ==================== EXACT DUPLICATES ====================
+
+def stream_digest(f: BinaryIO, limit: Optional[int] = None) -> str:
+    """Streamed BLAKE2b of an open binary stream, or of its first limit bytes"""
+    h = hashlib.blake2b(digest_size=20)
+    remaining = limit
+    while remaining is None or remaining > 0:
+        chunk = f.read(CHUNK_BYTES if remaining is None else min(CHUNK_BYTES, remaining))
+        if not chunk:
+            break
+        h.update(chunk)
+        if remaining is not None:
+            remaining -= len(chunk)
+    return h.hexdigest()
+
+
+def file_digest(path: str, limit: Optional[int] = None) -> str:
+    """Streamed BLAKE2b of a file, or of its first limit bytes"""
+    with open(path, 'rb') as f:
+        return stream_digest(f, limit)
+
+
+def _group_by(paths: Iterable[str], key: Callable[[str], str]) -> List[List[str]]:
+    groups: Dict[str, List[str]] = {}
+    for path in paths:
+        try:
+            groups.setdefault(key(path), []).append(path)
+        except OSError:
+            continue
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def find_exact_duplicates(files: Iterable[Tuple[str, int]]) -> List[List[str]]:
+    """Groups of byte-identical files, from (path, size) pairs"""
+    by_size: Dict[int, List[str]] = {}
+    for path, size in files:
+        by_size.setdefault(size, []).append(path)
+
+    duplicates = []
+    for size, paths in by_size.items():
+        if len(paths) < 2:
+            continue
+        for head_group in _group_by(paths, lambda p: file_digest(p, HEAD_BYTES)):
+            if size <= HEAD_BYTES:
+                duplicates.append(sorted(head_group))
+            else:
+                duplicates.extend(sorted(group) for group in _group_by(head_group, file_digest))
+    return sorted(duplicates)
+
+
+class DuplicateIndex:
+    """Exact-duplicate lookup for files that arrive one at a time.
+
+    The same size -> head hash -> full hash narrowing as
+    find_exact_duplicates(), done lazily: a file is only hashed once another
+    file of the same size shows up, so a stream of unique sizes costs no
+    reads at all.
+    """
+
+    def __init__(self):
+        self._by_size: Dict[int, List[str]] = {}
+        self._digests: Dict[str, Tuple[str, Optional[str]]] = {}  # path -> (head, full)
+
+    def _head(self, path: str) -> str:
+        if path not in self._digests:
+            self._digests[path] = (file_digest(path, HEAD_BYTES), None)
+        return self._digests[path][0]
+
+    def _full(self, path: str, size: int) -> str:
+        head, full = self._digests[path]
+        if full is None:
+            full = head if size <= HEAD_BYTES else file_digest(path)
+            self._digests[path] = (head, full)
+        return full
+
+    def find(self, size: int, head: Callable[[], str], full: Callable[[], str]) -> Optional[str]:
+        """An indexed path with the same bytes as a candidate, or None.
+
+        head() and full() give the candidate's file_digest() over its first
+        HEAD_BYTES and over all of it; they are only called once an indexed
+        file has the same size (and, for full(), the same head).
+        """
+        earlier = self._by_size.get(size)
+        if not earlier:
+            return None
+        candidate_head, candidate_full = head(), None
+        for other in earlier:
+            if self._head(other) != candidate_head:
+                continue
+            if candidate_full is None:
+                candidate_full = candidate_head if size <= HEAD_BYTES else full()
+            if self._full(other, size) == candidate_full:
+                return other
+        return None
+
+    def insert(self, path: str, size: int):
+        """Record path without comparing it, e.g. a file already known to be unique"""
+        self._by_size.setdefault(size, []).append(path)
+
+    def add(self, path: str, size: int) -> Optional[str]:
+        """Record path; returns an earlier path with the same bytes, or None"""
+        original = self.find(size, lambda: self._head(path), lambda: self._full(path, size))
+        if original is None:
+            self.insert(path, size)
+        return original
+
+
+def keeper_rank(path: str) -> Tuple[int, int, str]:
+    """Sort key for picking which copy to keep: no _N suffix, shortest path, then name"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return (1 if COPY_SUFFIX_RE.search(stem) else 0, len(path), path)
+
+
+def split_keeper(group: Sequence[str]) -> Tuple[str, List[str]]:
+    """(path to keep, paths that duplicate it)"""
+    ordered = sorted(group, key=keeper_rank)
+    return ordered[0], ordered[1:]
+
+
+def split_by_bike(group: Sequence[str], root: str) -> List[List[str]]:
+    """A duplicate group partitioned by bike folder (the first folder under root).
+
+    Bikes may share a supplier photo, so copies are only redundant within
+    one bike; files directly under root form their own partition.
+    """
+    by_bike: Dict[str, List[str]] = {}
+    for path in group:
+        parts = os.path.relpath(path, root).split(os.sep)
+        by_bike.setdefault(parts[0] if len(parts) > 1 else '', []).append(path)
+    return [by_bike[bike] for bike in sorted(by_bike)]
+
+
+# ==================== PERCEPTUAL HASHES ====================
+
+def _grayscale(path: str, size: Tuple[int, int]):
+    """Decode an image straight to a small grayscale NumPy array"""
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(path) as img:
+        # Let the JPEG decoder downscale by 1/2..1/8 while decoding
+        img.draft('L', (size[0] * 4, size[1] * 4))
+        img = img.convert('L').resize(size, Image.BILINEAR)
+        return np.asarray(img, dtype=np.float32)
+
+
+def _bits_to_int(bits) -> int:
+    value = 0
+    for bit in bits.flatten():
+        value = (value << 1) | int(bit)
+    return value
+
+
+def dhash(path: str, hash_size: int = HASH_SIZE) -> int:
+    """Difference hash: sign of the horizontal gradient on a (size+1) x size thumbnail"""
+    pixels = _grayscale(path, (hash_size + 1, hash_size))
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+_DCT_CACHE = {}
+
+
+def _dct_matrix(n: int):
+    import numpy as np
+
+    if n not in _DCT_CACHE:
+        k = np.arange(n)[:, None]
+        i = np.arange(n)[None, :]
+        matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+        matrix[0] /= np.sqrt(2.0)
+        _DCT_CACHE[n] = matrix
+    return _DCT_CACHE[n]
+
+
+def phash(path: str, hash_size: int = HASH_SIZE, highfreq_factor: int = 4) -> int:
+    """Perceptual hash: low-frequency 2-D DCT coefficients against their median"""
+    import numpy as np
+
+    n = hash_size * highfreq_factor
+    pixels = _grayscale(path, (n, n))
+    dct = _dct_matrix(n)
+    coefficients = (dct @ pixels @ dct.T)[:hash_size, :hash_size]
+    return _bits_to_int(coefficients > np.median(coefficients[1:, 1:]))
+
+
+HASHERS = {'dhash': dhash, 'phash': phash}
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """Burkhard-Keller tree over Hamming distance for 64-bit hashes"""
+
+    def __init__(self):
+        self.root = None  # [hash, items, {distance: child}]
+        self.size = 0
+
+    def add(self, value: int, item):
+        self.size += 1
+        if self.root is None:
+            self.root = [value, [item], {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> List[Tuple[int, object]]:
+        """(distance, item) for every stored hash within radius of value"""
+        if self.root is None:
+            return []
+        found = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                found.extend((distance, item) for item in node[1])
+            # Triangle inequality: only children in [d - r, d + r] can match
+            for child_distance, child in node[2].items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+def _hash_one(args: Tuple[str, str]) -> Tuple[str, Optional[int]]:
+    method, path = args
+    try:
+        return path, HASHERS[method](path)
+    except Exception:
+        # Unreadable or not an image Pillow understands
+        return path, None
+
+
+def perceptual_hashes(paths: Sequence[str], method: str = 'dhash',
+                      jobs: int = 1) -> Dict[str, int]:
+    """Perceptual hash of every decodable image; decoding runs on a process pool"""
+    import numpy  # noqa: F401 - fail early, not once per image inside the workers
+    import PIL  # noqa: F401
+    work = [(method, path) for path in paths]
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_hash_one, work, chunksize=16))
+    else:
+        results = [_hash_one(item) for item in work]
+    return {path: value for path, value in results if value is not None}
+
+
+def find_near_duplicates(hashes: Dict[str, int], threshold: int = 6) -> List[List[Tuple[str, int]]]:
+    """Clusters of images whose hashes are within threshold bits of each other.
+
+    Each cluster lists (path, distance to the cluster's first image).
+    """
+    tree = BKTree()
+    parent: Dict[str, str] = {}
+
+    def find(path):
+        while parent[path] != path:
+            parent[path] = parent[parent[path]]
+            path = parent[path]
+        return path
+
+    for path in sorted(hashes):
+        parent[path] = path
+        for _, match in tree.search(hashes[path], threshold):
+            parent[find(match)] = find(path)
+        tree.add(hashes[path], path)
+
+    clusters: Dict[str, List[str]] = {}
+    for path in parent:
+        clusters.setdefault(find(path), []).append(path)
+
+    result = []
+    for members in clusters.values():
+        if len(members) < 2:
+            continue
+        keeper, others = split_keeper(members)
+        result.append([(keeper, 0)] + [(p, hamming(hashes[keeper], hashes[p])) for p in others])
+    return sorted(result)
@@ -0,0 +1,443 @@
+"""
+Shared asset-generation engine for the RIFT brand generators.
+
+Holds the pieces every generate-*.py script used to carry its own copy of:
+the brand palette, the SVG document wrapper, the rift icon and letterforms
+(drawn by riftkit.geometry) and the file writer. Generators register
+themselves here, so one process can run any or all of them (see
+generate-assets.py) and pay the interpreter start, import and
+directory-scan costs once.
+
+Writes go through a single buffered AssetWriter. It optionally outlines
+text into paths (riftkit.outline), minifies every SVG (riftkit.svgmin),
+compares each asset with the file already on disk, queues only the ones
+that changed, and creates every output directory in one pass when the
+buffer is flushed.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from riftkit import geometry, outline, profiling, svgmin
+from riftkit.buildcache import BuildCache, asset_methods, digest, note_output, source_of
+from riftkit.gallery import write_gallery
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Brand Colors
+COLORS = {
+    'emerald_dark': '#0d4d3f',
+    'emerald_mid': '#0f3d32',
+    'emerald_bright': '#065f46',
+    'emerald_accent': '#10b981',
+    'gold': '#fbbf24',
+    'white': '#ffffff',
+    'black': '#000000',
+    'dark': '#0a1f1a',
+}
+
+# Colour schemes for variant sweeps: icon, wordmark beside the icon, wordmark
+# on its own, and background
+PALETTES = {
+    'brand': {'icon': COLORS['gold'], 'text': COLORS['white'], 'accent': COLORS['gold'],
+              'background': COLORS['emerald_dark']},
+    'inverted': {'icon': COLORS['emerald_dark'], 'text': COLORS['emerald_dark'],
+                 'accent': COLORS['emerald_dark'], 'background': COLORS['gold']},
+    'gold-on-dark': {'icon': COLORS['gold'], 'text': COLORS['gold'], 'accent': COLORS['gold'],
+                     'background': COLORS['dark']},
+    'light': {'icon': COLORS['emerald_bright'], 'text': COLORS['emerald_dark'],
+              'accent': COLORS['emerald_dark'], 'background': COLORS['white']},
+    'mono-white': {'icon': COLORS['white'], 'text': COLORS['white'], 'accent': COLORS['white'],
+                   'background': COLORS['emerald_mid']},
+    'mono-black': {'icon': COLORS['black'], 'text': COLORS['black'], 'accent': COLORS['black'],
+                   'background': COLORS['white']},
+}
+
+# Inter web font import used by the original logo sets
+INTER_FONT_DEFS = '''<defs>
+        <style>
+            @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;700&amp;display=swap');
+        </style>
+    </defs>'''
+
+
+# ==================== SVG BUILDING BLOCKS ====================
+
+def background_rect(width: int, height: int, fill: Optional[str]) -> str:
+    """Full-canvas background rect, or an empty string for a transparent canvas"""
+    return f'<rect width="{width}" height="{height}" fill="{fill}"/>' if fill else ''
+
+
+def svg_document(width: int, height: int, *body: str, viewbox: str = None) -> str:
+    """Wrap body fragments in an SVG document, one fragment per indented line"""
+    if viewbox is None:
+        viewbox = f"0 0 {width} {height}"
+    inner = '\n    '.join(body)
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" viewBox="{viewbox}" width="{width}" height="{height}">
+    {inner}
+</svg>'''
+
+
+def geometry_precision() -> int:
+    """Decimals for path data built from riftkit.geometry: the writer's, or the default"""
+    precision = WRITER.minify_precision
+    return geometry.PRECISION if precision is None else precision
+
+
+def rift_icons(placements: Iterable[Tuple[float, float, float]], color: str = COLORS['gold'],
+               line_width: float = 3, crack_width: float = 2.5) -> List[str]:
+    """rift_icon() markup for each (x, y, scale), transformed in one batch"""
+    placements = list(placements)
+    shapes = geometry.path_data(geometry.ICON, [geometry.place(x, y, scale) for x, y, scale in placements],
+                                geometry_precision())
+    icons = []
+    for (_, _, scale), paths in zip(placements, shapes):
+        lines = ''.join(f'<path d="{d}" stroke="{color}" stroke-width="{line_width * scale}" '
+                        f'stroke-linecap="square"/>' for d in paths[:3])
+        cracks = ''.join(f'<path d="{d}" stroke="{color}" stroke-width="{crack_width * scale}" '
+                         f'stroke-linecap="square"/>' for d in paths[3:])
+        icons.append(f'<g>{lines}{cracks}</g>')
+    return icons
+
+
+def rift_icon(x: float, y: float, scale: float = 1.0, color: str = COLORS['gold'],
+              line_width: float = 3, crack_width: float = 2.5) -> str:
+    """The volcanic rift icon: three horizontal lines with angular cracks.
+
+    The icon is drawn in a 100-unit box placed at x, y and scaled by scale;
+    line_width and crack_width are in box units, so they scale with it.
+    """
+    return rift_icons([(x, y, scale)], color, line_width, crack_width)[0]
+
+
+def rift_letterforms(style: str, x: float, y: float, size: float) -> List[str]:
+    """Path data of R, I, F and T in a riftkit.geometry letterform style"""
+    return geometry.letterform_path_data(style, x, y, size, geometry_precision())
+
+
+def rift_text_geometric(x: float, y: float, size: float = 60, color: str = COLORS['white'],
+                        weight: str = 'bold') -> str:
+    """The geometric RIFT wordmark: stroked R-I-F-T letterforms, size units tall"""
+    stroke_width = (8 if weight == 'bold' else 6) * size / geometry.LETTERFORM_HEIGHT
+    r_path, i_path, f_path, t_path = rift_letterforms('geometric', x, y, size)
+    stroke = f'fill="none" stroke="{color}" stroke-width="{stroke_width}" stroke-linecap="square"'
+    return f'''<g>
+            <path d="{r_path}" {stroke} stroke-linejoin="miter"/>
+            <path d="{i_path}" {stroke}/>
+            <path d="{f_path}" {stroke}/>
+            <path d="{t_path}" {stroke}/>
+        </g>'''
+
+
+# ==================== BUFFERED WRITER ====================
+
+class AssetWriter:
+    """Buffered write-if-changed writer shared by every generator in the process"""
+
+    def __init__(self, max_buffered_bytes: int = 8 * 1024 * 1024,
+                 minify_precision: Optional[int] = svgmin.PRECISION):
+        self.max_buffered_bytes = max_buffered_bytes
+        self.minify_precision = minify_precision  # None writes SVGs as generated
+        self.outliner: Optional[outline.Outliner] = None  # set to outline <text> into paths
+        self.minify_stats: Dict[str, int] = {}
+        self.take_stats()
+        self.pending: Dict[str, bytes] = {}
+        self.pending_dirs = set()
+        self.created_dirs = set()
+        self.buffered_bytes = 0
+        self.files_written = 0
+        self.bytes_written = 0
+        self.files_unchanged = 0
+
+    def require_dir(self, path: str):
+        """Make sure a directory exists after the next flush, even if nothing is written into it"""
+        self.pending_dirs.add(os.path.normpath(path))
+
+    def write(self, path: str, content: Union[str, bytes], label: str = None) -> bool:
+        """Queue content (text, or bytes for raster output) for path unless the
+        file already holds exactly those bytes.
+
+        Returns True if the file will be (re)written.
+        """
+        if self.outliner is not None and path.endswith('.svg') and isinstance(content, str):
+            with profiling.stage('outline'):
+                content, outlined, kept = self.outliner.outline(content, geometry_precision())
+            self.add_minify_stats({'outlined': outlined, 'kept': kept})
+        if isinstance(content, bytes):
+            data = content
+        elif self.minify_precision is not None and path.endswith('.svg'):
+            before = len(content.encode('utf-8'))
+            with profiling.stage('minify'):
+                data = svgmin.minify_svg(content, self.minify_precision).encode('utf-8')
+            self.add_minify_stats({'files': 1, 'before': before, 'after': len(data)})
+        else:
+            data = content.encode('utf-8')
+        pending = self.pending.get(path)
+        if pending is not None:
+            changed = pending != data
+        else:
+            try:
+                with open(path, 'rb') as f:
+                    changed = f.read() != data
+            except OSError:
+                changed = True
+
+        if changed:
+            if pending is not None:
+                self.buffered_bytes -= len(pending)
+            self.pending[path] = data
+            self.buffered_bytes += len(data)
+        else:
+            self.files_unchanged += 1
+
+        note_output(path, changed, len(data))
+        if label is not None:
+            print(f"✓ Generated: {label}" if changed else f"· Unchanged: {label}")
+        if self.buffered_bytes >= self.max_buffered_bytes:
+            self.flush()
+        return changed
+
+    def take_stats(self) -> Dict[str, int]:
+        """The minify and outline counts so far, resetting them to zero"""
+        stats, self.minify_stats = self.minify_stats, {'files': 0, 'before': 0, 'after': 0,
+                                                      'outlined': 0, 'kept': 0}
+        return stats
+
+    def add_minify_stats(self, stats: Dict[str, int]):
+        """Count minified SVGs, including ones reported back by worker processes"""
+        for key, value in stats.items():
+            self.minify_stats[key] += value
+
+    def print_minify_report(self):
+        """Print how much minifying and outlining did since the last report, and start counting afresh"""
+        stats = self.take_stats()
+        if stats['files']:
+            saved = stats['before'] - stats['after']
+            print(f"\n🗜  SVG minify: {stats['files']} files, {stats['before'] / 1024:.1f}KB → "
+                  f"{stats['after'] / 1024:.1f}KB ({100 * saved / stats['before']:.1f}% smaller)")
+        if stats['outlined'] or stats['kept']:
+            print(f"🔤 Text outlined: {stats['outlined']} elements, {stats['kept']} left as text")
+        if self.outliner is not None and self.outliner.missing_families:
+            print(f"⚠️  No local font for: {', '.join(sorted(self.outliner.missing_families))} "
+                  f"(add .ttf/.otf files with --fonts-dir)")
+            self.outliner.missing_families.clear()
+
+    def flush(self):
+        """Create every needed directory once, then write the queued files"""
+        with profiling.stage('flush'):
+            self._flush()
+
+    def _flush(self):
+        dirs = self.pending_dirs | {os.path.dirname(path) or '.' for path in self.pending}
+        for directory in sorted(dirs - self.created_dirs):
+            os.makedirs(directory, exist_ok=True)
+        self.created_dirs |= dirs
+        self.pending_dirs.clear()
+
+        for path, data in self.pending.items():
+            with open(path, 'wb') as f:
+                f.write(data)
+            self.files_written += 1
+            self.bytes_written += len(data)
+        self.pending.clear()
+        self.buffered_bytes = 0
+
+
+WRITER = AssetWriter()
+
+
+def write_asset(path: str, content: Union[str, bytes], label: str = None) -> bool:
+    """Write an asset through the shared buffered writer"""
+    return WRITER.write(path, content, label)
+
+
+def require_dirs(*paths: str):
+    """Register output directories to be created on the next flush"""
+    for path in paths:
+        WRITER.require_dir(path)
+
+
+# ==================== GENERATOR REGISTRY ====================
+
+@dataclass
+class GeneratorEntry:
+    """A registered generator: how to build it and where its output goes"""
+    name: str
+    description: str
+    output_dir: str
+    build: Callable[[BuildCache, argparse.Namespace], None]
+    options: Tuple[str, ...] = field(default_factory=tuple)
+    # Redraws just the preview page from the files already in output_dir
+    preview: Optional[Callable[[argparse.Namespace], None]] = None
+
+
+REGISTRY: Dict[str, GeneratorEntry] = {}
+
+# Command-line options a generator can opt into, forwarded to it as keyword arguments
+OPTIONS = {
+    'jobs': (('--jobs', '-j'), dict(type=int, default=1,
+             help='worker processes for generators that support it (0 = one per CPU core)')),
+    'sprites': (('--sprites',), dict(action='store_true',
+                help='inline preview SVGs against one shared sprite sheet of defs and icons')),
+    'axis': (('--axis',), dict(action='append', default=[], metavar='AXIS=V1,V2',
+             help='values of one variant-matrix axis for generators that sweep one '
+                  "('all' for every choice; repeatable)")),
+    'where': (('--where',), dict(action='append', default=[], metavar='AXIS[!]=V1,V2',
+              help='keep (=) or drop (!=) matrix variants with these axis values (repeatable)')),
+}
+
+# Options that change the preview page, so a preview-only run forwards them too
+PREVIEW_OPTIONS = ('sprites',)
+
+
+def register(name: str, description: str, output_dir: str,
+             build: Callable[[BuildCache, argparse.Namespace], None],
+             options: Iterable[str] = (),
+             preview: Optional[Callable[[argparse.Namespace], None]] = None):
+    """Register a generator under a short name for the common CLI"""
+    REGISTRY[name] = GeneratorEntry(name, description, output_dir, build, tuple(options), preview)
+
+
+def register_class(name: str, cls, *, description: str, output_dir: str, entry: str,
+                   assets: Callable[[type], List[str]], options: Iterable[str] = ()):
+    """Register a class-based generator.
+
+    assets(cls) lists the asset-drawing methods to route through the build
+    cache; entry is the method that draws everything; options are CLI
+    arguments forwarded to entry as keyword arguments. A generate_preview_html
+    method on cls becomes the entry's preview, and gets the options among
+    PREVIEW_OPTIONS.
+    """
+    options = tuple(options)
+    preview_options = tuple(opt for opt in options if opt in PREVIEW_OPTIONS)
+
+    def build(cache: BuildCache, args: argparse.Namespace):
+        generator = cls(output_dir=output_dir)
+        cache.instrument(generator, assets(cls))
+        getattr(generator, entry)(**{opt: getattr(args, opt) for opt in options})
+
+    def preview(args: argparse.Namespace):
+        cls(output_dir=output_dir).generate_preview_html(**{opt: getattr(args, opt) for opt in preview_options})
+
+    register(name, description, output_dir, build, options,
+             preview if hasattr(cls, 'generate_preview_html') else None)
+
+
+def prefixed_assets(*prefixes: str, exclude: Iterable[str] = ()) -> Callable[[type], List[str]]:
+    """Asset lister for register_class: methods whose names start with any prefix"""
+    return lambda cls: asset_methods(cls, prefixes, exclude)
+
+
+def load_generator_scripts(scripts_dir: str = SCRIPTS_DIR):
+    """Import every generate-*.py script so it registers its generators"""
+    for filename in sorted(os.listdir(scripts_dir)):
+        if not (filename.startswith('generate-') and filename.endswith('.py')):
+            continue
+        if filename == 'generate-assets.py':
+            continue
+        module_name = filename[:-3].replace('-', '_')
+        if module_name in sys.modules:
+            continue
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(scripts_dir, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+
+
+def run(names: Iterable[str], args: argparse.Namespace):
+    """Build the named generators in order, flushing the writer after each one"""
+    engine_salt = digest(source_of(sys.modules[__name__]), source_of(svgmin), source_of(geometry),
+                         WRITER.minify_precision,
+                         WRITER.outliner and (source_of(outline), WRITER.outliner.fingerprint()))
+    for name in names:
+        entry = REGISTRY[name]
+        cache = BuildCache(entry.output_dir, force=args.force, salt=engine_salt)
+        with profiling.stage(f'generate:{name}'):
+            entry.build(cache, args)
+            WRITER.flush()
+        cache.save()
+        if WRITER.outliner is not None:
+            WRITER.outliner.save()
+        if any(cache.results.values()):
+            cache.print_report()
+        WRITER.print_minify_report()
+
+
+def build_parser(names: Optional[List[str]] = None,
+                 description: str = 'Generate RIFT brand assets') -> argparse.ArgumentParser:
+    """The command line for the named generators, or for picking any registered ones"""
+    fixed = names is not None
+    parser = argparse.ArgumentParser(description=description)
+    if not fixed:
+        parser.add_argument('generators', nargs='*', metavar='GENERATOR',
+                            help=f"generators to run (default: all): {', '.join(REGISTRY)}")
+        parser.add_argument('--list', action='store_true', help='list registered generators and exit')
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild every asset even if its inputs are unchanged')
+    parser.add_argument('--no-minify', action='store_true',
+                        help='write SVGs as generated, indented and unrounded')
+    parser.add_argument('--precision', type=int, default=svgmin.PRECISION,
+                        help=f'decimals kept in SVG coordinates (default: {svgmin.PRECISION})')
+    parser.add_argument('--outline-text', action='store_true',
+                        help='convert <text> to glyph outlines from local fonts (needs fonttools '
+                             'for fonts not yet in .glyph-cache.json)')
+    parser.add_argument('--fonts-dir', action='append', default=[], metavar='DIR',
+                        help='extra directory of .ttf/.otf files for --outline-text (repeatable)')
+    available = names if fixed else list(REGISTRY)
+    for option, (flags, kwargs) in OPTIONS.items():
+        if any(option in REGISTRY[name].options for name in available):
+            parser.add_argument(*flags, **kwargs)
+    profiling.add_arguments(parser)
+    return parser
+
+
+def main(names: List[str] = None, description: str = 'Generate RIFT brand assets'):
+    """Command-line entry point.
+
+    With names given, runs exactly those generators (used by the individual
+    generate-*.py scripts). Without, every script is loaded and the
+    generators to run are picked on the command line.
+    """
+    fixed = names is not None
+    if not fixed:
+        load_generator_scripts()
+    parser = build_parser(names if fixed else None, description)
+    args = parser.parse_args()
+
+    if not fixed:
+        if args.list:
+            for entry in REGISTRY.values():
+                print(f"{entry.name:24} {entry.output_dir:28} {entry.description}")
+            return
+        unknown = [name for name in args.generators if name not in REGISTRY]
+        if unknown:
+            parser.error(f"unknown generator(s): {', '.join(unknown)}")
+        names = args.generators or list(REGISTRY)
+    if getattr(args, 'jobs', 1) <= 0:
+        args.jobs = os.cpu_count() or 1
+    WRITER.minify_precision = None if args.no_minify else args.precision
+
+    with profiling.session(args):
+        if args.outline_text:
+            with profiling.stage('fonts'):
+                outliner = outline.Outliner(args.fonts_dir)
+            print(f"🔤 Outlining text with {len(outliner.faces)} local font faces")
+            if outliner.unreadable:
+                print(f"⚠️  {len(outliner.unreadable)} font files could not be read "
+                      f"(is fonttools installed?); text in their families stays text")
+            WRITER.outliner = outliner
+
+        run(names, args)
+        if len(names) > 1:
+            print(f"\n📦 {len(names)} generators: {WRITER.files_written} files written "
+                  f"({WRITER.bytes_written / 1024:.1f}KB), {WRITER.files_unchanged} unchanged")
+            # One browsable catalog over everything the generators have produced
+            catalog_root = os.path.commonpath([entry.output_dir for entry in REGISTRY.values()])
+            with profiling.stage('gallery'):
+                count = write_gallery(catalog_root, 'RIFT Brand Catalog')
+            print(f"🗂  Catalog: {os.path.join(catalog_root, 'gallery.html')} ({count} assets)")
@@ -0,0 +1,266 @@
+"""
+Lazy, paginated gallery pages with a JSON asset index.
+
+The per-generator preview pages render every asset at once, which gets slow
+for the larger sets (premium logos, font variations, the whole output tree).
+write_gallery() indexes a directory into assets.json - path, category,
+dimensions and byte size of every image - and writes gallery.html next to
+it. The gallery embeds the same index and shows it a page at a time with
+<img loading="lazy">, so the browser only decodes what is on screen and
+no web fonts are pulled in.
+"""
+
+import html
+import json
+import os
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from riftkit.preview import PreviewWriter
+
+IMAGE_EXTENSIONS = ('.svg', '.png', '.jpg', '.jpeg', '.webp', '.avif', '.gif')
+INDEX_NAME = 'assets.json'
+GALLERY_NAME = 'gallery.html'
+PAGE_SIZE = 48
+
+SVG_TAG_RE = re.compile(rb'<svg\b[^>]*>', re.S)
+ATTR_RE = rb'\b%s="\s*([0-9.]+)'
+VIEWBOX_RE = re.compile(rb'\bviewBox="\s*[-0-9.]+[\s,]+[-0-9.]+[\s,]+([0-9.]+)[\s,]+([0-9.]+)')
+
+
+def _number(value: bytes) -> float:
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def svg_dimensions(path: str) -> Tuple[Optional[float], Optional[float]]:
+    """Width and height of an SVG from its root tag, falling back to the viewBox"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(4096)
+    except OSError:
+        return None, None
+    tag = SVG_TAG_RE.search(head)
+    if not tag:
+        return None, None
+    width = re.search(ATTR_RE % b'width', tag.group(0))
+    height = re.search(ATTR_RE % b'height', tag.group(0))
+    if width and height:
+        return _number(width.group(1)), _number(height.group(1))
+    viewbox = VIEWBOX_RE.search(tag.group(0))
+    if viewbox:
+        return _number(viewbox.group(1)), _number(viewbox.group(2))
+    return None, None
+
+
+def default_category(rel_path: str) -> str:
+    """Directory an asset lives in, or 'root' for top-level files"""
+    directory = os.path.dirname(rel_path)
+    return directory.replace(os.sep, '/') if directory else 'root'
+
+
+def build_index(root: str, categorize: Callable[[str], str] = default_category) -> List[Dict]:
+    """Index every image under root, sorted by path"""
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            full_path = os.path.join(dirpath, filename)
+            rel_path = os.path.relpath(full_path, root)
+            width, height = (svg_dimensions(full_path) if filename.lower().endswith('.svg')
+                             else (None, None))
+            entries.append({
+                'path': rel_path.replace(os.sep, '/'),
+                'name': os.path.splitext(filename)[0],
+                'category': categorize(rel_path),
+                'width': width,
+                'height': height,
+                'bytes': os.path.getsize(full_path),
+            })
+    return entries
+
+
+GALLERY_HEAD = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <style>
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{
+            font-family: system-ui, -apple-system, sans-serif;
+            background: #0a1f1a;
+            color: #ffffff;
+            padding: 30px;
+        }}
+        h1 {{ color: #fbbf24; margin-bottom: 6px; }}
+        .subtitle {{ color: #10b981; margin-bottom: 20px; }}
+        .filters {{ display: flex; flex-wrap: wrap; gap: 8px; margin-bottom: 20px; }}
+        .filters button, .pager button {{
+            background: #0f3d32;
+            color: #ffffff;
+            border: 1px solid #065f46;
+            border-radius: 16px;
+            padding: 6px 14px;
+            cursor: pointer;
+        }}
+        .filters button.active {{ background: #fbbf24; color: #0a1f1a; border-color: #fbbf24; }}
+        .pager button:disabled {{ opacity: 0.4; cursor: default; }}
+        .pager {{ display: flex; align-items: center; gap: 12px; margin: 20px 0; color: #10b981; }}
+        .grid {{
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(240px, 1fr));
+            gap: 16px;
+        }}
+        .card {{
+            background: #0f3d32;
+            border: 1px solid #065f46;
+            border-radius: 8px;
+            padding: 12px;
+            color: inherit;
+            text-decoration: none;
+        }}
+        .card:hover {{ border-color: #fbbf24; }}
+        .thumb {{
+            height: 160px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            background: #0a1f1a;
+            border-radius: 4px;
+            margin-bottom: 10px;
+        }}
+        .thumb img {{ max-width: 100%; max-height: 100%; width: auto; height: auto; }}
+        .name {{ font-size: 0.85em; color: #fbbf24; word-break: break-all; }}
+        .meta {{ font-size: 0.75em; color: #10b981; opacity: 0.8; margin-top: 4px; }}
+    </style>
+</head>
+<body>
+    <h1>{title}</h1>
+    <p class="subtitle" id="summary"></p>
+    <div class="filters" id="filters"></div>
+    <div class="pager"><button id="prev">&larr; Prev</button><span id="status"></span><button id="next">Next &rarr;</button></div>
+    <div class="grid" id="grid"></div>
+    <div class="pager"><button id="prev-bottom">&larr; Prev</button><button id="next-bottom">Next &rarr;</button></div>
+    <script type="application/json" id="asset-index">
+'''
+
+GALLERY_TAIL = '''
+    </script>
+    <script>
+    (function () {{
+        var PAGE_SIZE = {page_size};
+        var assets = JSON.parse(document.getElementById('asset-index').textContent);
+        var categories = ['All'];
+        assets.forEach(function (a) {{
+            if (categories.indexOf(a.category) < 0) categories.push(a.category);
+        }});
+        var state = {{ category: 'All', page: 0 }};
+
+        function formatBytes(n) {{
+            return n < 1024 ? n + ' B' : (n / 1024).toFixed(1) + ' KB';
+        }}
+        function visible() {{
+            return state.category === 'All' ? assets
+                : assets.filter(function (a) {{ return a.category === state.category; }});
+        }}
+        function renderFilters() {{
+            var box = document.getElementById('filters');
+            box.textContent = '';
+            categories.forEach(function (name) {{
+                var button = document.createElement('button');
+                button.textContent = name;
+                button.className = name === state.category ? 'active' : '';
+                button.onclick = function () {{ state.category = name; state.page = 0; render(); }};
+                box.appendChild(button);
+            }});
+        }}
+        function render() {{
+            var items = visible();
+            var pages = Math.max(1, Math.ceil(items.length / PAGE_SIZE));
+            state.page = Math.min(Math.max(state.page, 0), pages - 1);
+            var grid = document.getElementById('grid');
+            grid.textContent = '';
+            items.slice(state.page * PAGE_SIZE, (state.page + 1) * PAGE_SIZE).forEach(function (a) {{
+                var card = document.createElement('a');
+                card.className = 'card';
+                card.href = a.path;
+                card.target = '_blank';
+                var thumb = document.createElement('div');
+                thumb.className = 'thumb';
+                var img = document.createElement('img');
+                img.loading = 'lazy';
+                img.decoding = 'async';
+                if (a.width && a.height) {{ img.width = a.width; img.height = a.height; }}
+                img.alt = a.name;
+                img.src = a.path;
+                thumb.appendChild(img);
+                var name = document.createElement('div');
+                name.className = 'name';
+                name.textContent = a.name;
+                var meta = document.createElement('div');
+                meta.className = 'meta';
+                meta.textContent = a.category + ' \\u00b7 ' +
+                    (a.width && a.height ? a.width + '\\u00d7' + a.height + ' \\u00b7 ' : '') + formatBytes(a.bytes);
+                card.appendChild(thumb);
+                card.appendChild(name);
+                card.appendChild(meta);
+                grid.appendChild(card);
+            }});
+            document.getElementById('summary').textContent =
+                assets.length + ' assets, ' + (categories.length - 1) + ' categories';
+            document.getElementById('status').textContent =
+                'Page ' + (state.page + 1) + ' of ' + pages + ' (' + items.length + ' shown)';
+            ['prev', 'prev-bottom'].forEach(function (id) {{ document.getElementById(id).disabled = state.page === 0; }});
+            ['next', 'next-bottom'].forEach(function (id) {{ document.getElementById(id).disabled = state.page >= pages - 1; }});
+            renderFilters();
+            history.replaceState(null, '', '#' + encodeURIComponent(state.category) + '/' + (state.page + 1));
+        }}
+        function step(delta) {{
+            return function () {{ state.page += delta; render(); window.scrollTo(0, 0); }};
+        }}
+        document.getElementById('prev').onclick = document.getElementById('prev-bottom').onclick = step(-1);
+        document.getElementById('next').onclick = document.getElementById('next-bottom').onclick = step(1);
+
+        var hash = decodeURIComponent(location.hash.slice(1)).split('/');
+        if (categories.indexOf(hash[0]) >= 0) state.category = hash[0];
+        if (hash[1]) state.page = (parseInt(hash[1], 10) || 1) - 1;
+        render();
+    }})();
+    </script>
+</body>
+</html>
+'''
+
+
+def _json_lines(entries: List[Dict]):
+    """The index as JSON, one asset per line"""
+    yield '[\n'
+    for i, entry in enumerate(entries):
+        yield json.dumps(entry, ensure_ascii=False) + (',\n' if i < len(entries) - 1 else '\n')
+    yield ']\n'
+
+
+def write_gallery(root: str, title: str, categorize: Callable[[str], str] = default_category,
+                  page_size: int = PAGE_SIZE) -> int:
+    """Write assets.json and gallery.html for every image under root.
+
+    Returns the number of indexed assets. Call engine.WRITER.flush() first
+    so that assets still sitting in the write buffer are indexed.
+    """
+    entries = build_index(root, categorize)
+
+    with PreviewWriter(os.path.join(root, INDEX_NAME)) as index:
+        for chunk in _json_lines(entries):
+            index.write(chunk)
+
+    with PreviewWriter(os.path.join(root, GALLERY_NAME)) as page:
+        page.write(GALLERY_HEAD.format(title=html.escape(title)))
+        for chunk in _json_lines(entries):
+            # Keep a stray "</script>" in a path from closing the index early
+            page.write(chunk.replace('</', '<\\/'))
+        page.write(GALLERY_TAIL.format(page_size=page_size))
+    return len(entries)
@@ -0,0 +1,214 @@
+"""
+Geometry kernel for the rift icon and the RIFT letterforms.
+
+The generators used to rebuild these shapes as f-strings, one `x + N*scale`
+expression per coordinate, in every file that draws them. Here each shape is
+written once as path data in its own unit space (the icon in a 100-unit box,
+the letterforms 60 units tall), parsed into a coordinate array at import,
+and placed with affine matrices:
+
+    d = path_data(ICON, [place(20, 50, 0.8)])[0]          # one d string per shape
+    sweep = path_data(LETTERFORMS['geometric'],
+                      [place(0, 0, size / 60) for size in range(10, 500)])
+
+path_data() transforms every point of every shape for every placement in
+one NumPy operation and fills a per-shape format template once per
+placement, so a size or colour sweep costs no Python work per coordinate.
+Without NumPy the same arithmetic runs in plain Python. Numbers are written
+at PRECISION decimals in packed form (`M20 80L100 80`), the same form the
+minifier produces, so the minifier has nothing left to do on them.
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from riftkit.svgmin import PRECISION
+
+# Points taken by each supported path command (absolute commands only)
+COMMAND_POINTS = {'M': 1, 'L': 1, 'Q': 2, 'C': 3, 'Z': 0}
+
+Matrix = Tuple[float, float, float, float, float, float]  # SVG matrix(a b c d e f)
+
+# Whole parts below this are looked up in a table of strings rather than converted one by one
+WHOLE_TABLE_LIMIT = 1 << 16
+
+TOKEN_RE = re.compile(r'[A-Za-z]|-?(?:\d+\.\d*|\.\d+|\d+)')
+
+
+class Shape(NamedTuple):
+    commands: str                             # one letter per command, e.g. 'MLLQ'
+    points: Tuple[Tuple[float, float], ...]   # operands of all commands, in order
+
+
+def shape(d: str) -> Shape:
+    """Parse absolute M/L/Q/C/Z path data into a Shape"""
+    tokens = TOKEN_RE.findall(d)
+    commands, points = [], []
+    i = 0
+    while i < len(tokens):
+        command = tokens[i]
+        if command not in COMMAND_POINTS:
+            raise ValueError(f"unsupported path command {command!r} in {d!r}")
+        count = COMMAND_POINTS[command]
+        operands = tokens[i + 1:i + 1 + 2 * count]
+        if len(operands) != 2 * count or any(t.isalpha() for t in operands):
+            raise ValueError(f"{command} needs {count} points in {d!r}")
+        commands.append(command)
+        points.extend((float(operands[j]), float(operands[j + 1])) for j in range(0, len(operands), 2))
+        i += 1 + 2 * count
+    return Shape(''.join(commands), tuple(points))
+
+
+# ==================== SHAPES ====================
+
+# The volcanic rift icon in its 100-unit box: three plates, then three pairs of cracks
+ICON_LINES = (
+    shape('M10 30 L90 30'),
+    shape('M15 60 L85 60'),
+    shape('M20 90 L80 90'),
+)
+ICON_CRACKS = (
+    shape('M25 15 L28 30 M75 15 L72 30'),
+    shape('M30 45 L33 60 M70 45 L67 60'),
+    shape('M50 75 L53 90 M50 75 L47 90'),
+)
+ICON = ICON_LINES + ICON_CRACKS
+
+# R, I, F and T for each letterform style, 60 units tall with the top left at 0 0
+LETTERFORMS: Dict[str, Tuple[Shape, Shape, Shape, Shape]] = {
+    'geometric': (
+        shape('M0 60 L0 0 L25 0 L30 15 L25 30 L0 30 M12 30 L30 60'),
+        shape('M50 0 L50 60 M40 0 L60 0 M40 60 L60 60'),
+        shape('M80 60 L80 0 L110 0 M80 28 L105 28'),
+        shape('M125 0 L165 0 M145 0 L145 60'),
+    ),
+    'elegant_serif': (
+        shape('M0 60 L0 0 Q20 0 25 12 Q28 20 25 28 L0 28 M10 28 Q25 45 32 60'),
+        shape('M52 0 L52 60 M42 0 Q47 3 52 3 Q57 3 62 0 M42 60 Q47 57 52 57 Q57 57 62 60'),
+        shape('M82 60 L82 0 Q95 0 108 0 M82 28 Q92 28 102 28'),
+        shape('M120 0 Q138 0 158 0 M139 0 L139 60'),
+    ),
+    'flowing_script': (
+        shape('M0 60 Q0 50 0 20 Q0 0 15 0 Q28 0 28 15 Q28 25 15 28 Q5 28 5 35 Q12 42 25 60'),
+        shape('M48 2 Q48 30 48 60'),
+        shape('M68 60 Q68 40 68 15 Q68 0 82 0 Q95 0 105 0 M68 28 Q75 27 88 28'),
+        shape('M115 3 Q130 0 148 3 M132 2 Q132 30 132 60'),
+    ),
+    'modern_sans': (
+        shape('M0 60 L0 5 Q0 0 5 0 L20 0 Q30 0 30 14 Q30 26 18 26 L0 26 M8 26 L30 60'),
+        shape('M52 0 L52 60'),
+        shape('M74 60 L74 0 L105 0 M74 28 L98 28'),
+        shape('M117 0 L155 0 M136 0 L136 60'),
+    ),
+    'italic_dynamic': (
+        shape('M8 60 L18 0 L38 0 Q43 12 38 25 L18 25 M23 25 L38 60'),
+        shape('M60 0 L50 60'),
+        shape('M70 60 L80 0 L108 0 M75 28 L98 28'),
+        shape('M120 0 L155 0 M138 0 L128 60'),
+    ),
+    'brush_stroke': (
+        shape('M0 60 Q-2 40 0 10 Q2 0 18 0 Q30 5 28 18 Q26 28 12 28 M12 30 Q20 45 30 60'),
+        shape('M50 0 Q51 30 49 60'),
+        shape('M69 60 Q70 30 69 3 Q80 0 98 2 M69 28 Q78 27 88 29'),
+        shape('M108 2 Q125 0 148 2 M128 2 Q129 30 128 60'),
+    ),
+    'condensed_elegant': (
+        shape('M0 60 L0 0 L15 0 Q22 8 15 22 L0 22 M7 22 L22 60'),
+        shape('M40 0 L40 60'),
+        shape('M58 60 L58 0 L78 0 M58 28 L73 28'),
+        shape('M88 0 L118 0 M103 0 L103 60'),
+    ),
+}
+LETTERFORM_HEIGHT = 60
+
+
+# ==================== TRANSFORMS ====================
+
+def place(x: float = 0, y: float = 0, scale: float = 1.0, rotate: float = 0.0) -> Matrix:
+    """Matrix for `translate(x, y) rotate(rotate) scale(scale)`; rotate is in degrees"""
+    if rotate:
+        cos, sin = math.cos(math.radians(rotate)), math.sin(math.radians(rotate))
+    else:
+        cos, sin = 1.0, 0.0
+    return (scale * cos, scale * sin, -scale * sin, scale * cos, float(x), float(y))
+
+
+def compose(outer: Matrix, inner: Matrix) -> Matrix:
+    """Matrix applying inner first, then outer (SVG's `outer inner` transform list)"""
+    a1, b1, c1, d1, e1, f1 = outer
+    a2, b2, c2, d2, e2, f2 = inner
+    return (a1 * a2 + c1 * b2, b1 * a2 + d1 * b2,
+            a1 * c2 + c1 * d2, b1 * c2 + d1 * d2,
+            a1 * e2 + c1 * f2 + e1, b1 * e2 + d1 * f2 + f1)
+
+
+@lru_cache(maxsize=None)
+def _fractions(precision: int) -> Tuple[str, ...]:
+    """Packed decimal tails indexed by value: 0 -> '', 5 -> '.05', 50 -> '.5' at precision 2"""
+    return tuple(f".{k:0{precision}d}".rstrip('0') if k else '' for k in range(10 ** precision))
+
+
+def _number(value: float, precision: int) -> str:
+    units = round(value * 10 ** precision)
+    whole, frac = divmod(abs(units), 10 ** precision)
+    return ('-' if units < 0 else '') + ('' if whole == 0 and frac else str(whole)) + _fractions(precision)[frac]
+
+
+def _transform(points: Sequence[Tuple[float, float]], matrices: Sequence[Matrix],
+               precision: int) -> List[List[str]]:
+    """Packed numbers [x0, y0, x1, y1, ...] of points under each matrix.
+
+    Coordinates are rounded to whole units of 10**-precision, so the text of
+    a number is its sign, whole part and a fraction looked up in a table;
+    0.5 is written .5 and 120.0 as 120.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return [[_number(v, precision)
+                 for px, py in points for v in (a * px + c * py + e, b * px + d * py + f)]
+                for a, b, c, d, e, f in matrices]
+    m = np.asarray(matrices, dtype=float).reshape(-1, 3, 2)   # rows: (a b) (c d) (e f)
+    p = np.asarray(points, dtype=float).reshape(-1, 2)
+    placed = p @ m[:, :2, :] + m[:, None, 2, :]
+    units = np.rint(placed.reshape(len(matrices), -1) * 10 ** precision).astype(np.int64)
+    whole, frac = np.divmod(np.abs(units), 10 ** precision)
+    largest = int(whole.max(initial=0))
+    if largest < WHOLE_TABLE_LIMIT:
+        text = np.array([str(i) for i in range(largest + 1)], dtype=object)[whole]
+    else:
+        text = whole.astype(str).astype(object)
+    text[(whole == 0) & (frac != 0)] = ''
+    text[units < 0] = '-' + text[units < 0]
+    text += np.array(_fractions(precision), dtype=object)[frac]
+    return text.tolist()
+
+
+@lru_cache(maxsize=None)
+def _template(commands: str) -> str:
+    return ''.join(command + ' '.join(['%s %s'] * COMMAND_POINTS[command]) for command in commands)
+
+
+def path_data(shapes: Sequence[Shape], matrices: Sequence[Matrix],
+              precision: int = PRECISION) -> List[List[str]]:
+    """Path data of every shape under every matrix: one list of d strings per matrix"""
+    if not matrices:
+        return []
+    points = [point for s in shapes for point in s.points]
+    templates = [_template(s.commands) for s in shapes]
+    bounds = []
+    offset = 0
+    for s in shapes:
+        bounds.append((offset, offset + 2 * len(s.points)))
+        offset += 2 * len(s.points)
+    return [[(template % tuple(row[start:end])).replace(' -', '-')
+             for template, (start, end) in zip(templates, bounds)]
+            for row in _transform(points, matrices, precision)]
+
+
+def letterform_path_data(style: str, x: float, y: float, size: float,
+                         precision: int = PRECISION) -> List[str]:
+    """d strings of R, I, F and T in a letterform style, top left at x y and size tall"""
+    return path_data(LETTERFORMS[style], [place(x, y, size / LETTERFORM_HEIGHT)], precision)[0]
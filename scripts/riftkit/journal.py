@@ -0,0 +1,294 @@
+"""
+Journaled, resumable placement of files into an output tree.
+
+organize-bike-assets.py and refine-bike-organization.py used to copy every
+file with shutil.copy2 on every run: a crash halfway through a drop meant
+starting over, nothing checked the copies, and a re-run found its own
+earlier copies in the way and wrote name_1.jpg, name_2.jpg next to them.
+
+PlacementJournal keeps an append-only JSON-lines log in the target folder:
+
+    {"op": "plan", "src": ..., "dst": ..., "size": ..., "mtime_ns": ...}
+    {"op": "done", "src": ..., "dst": ..., "size": ..., "mtime_ns": ...,
+     "method": "copy", "digest": ...}
+    {"op": "move", "src": ..., "dst": ..., "placed": true}
+
+A "plan" line is written before a file is placed and a "done" line after it
+has landed under its final name, so a run interrupted at any point resumes
+with exactly the files that are missing. Copies go to a .partial file that
+is renamed into place. The BLAKE2b digest of the content is computed in the
+same read pass that copies it, so verify() can later check every copy
+without reading the sources again.
+
+On a re-run, a file whose source size and mtime match its "done" line, and
+whose destination is still there with the right size, is skipped after one
+stat. Zip members (place_stream) are matched on size and CRC-32 instead. Each source keeps the destination it was given the first time, so
+nothing gets a _1 suffix unless two different sources really share a name.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from riftkit import profiling
+
+JOURNAL_NAME = '.placement-journal.jsonl'
+CHUNK_BYTES = 1024 * 1024
+PARTIAL_SUFFIX = '.partial'
+
+
+def copy_with_digest(src: str, dst: str) -> str:
+    """Copy src to dst (with copystat) and return the BLAKE2b of the bytes, in one read"""
+    h = hashlib.blake2b(digest_size=20)
+    with open(src, 'rb') as source, open(dst, 'wb') as target:
+        while True:
+            chunk = source.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            h.update(chunk)
+            target.write(chunk)
+        target.flush()
+        os.fsync(target.fileno())
+    shutil.copystat(src, dst)
+    return h.hexdigest()
+
+
+def unique_name(directory: str, filename: str, taken: Callable[[str], bool]) -> str:
+    """directory/filename, or name_1.ext, name_2.ext... while taken() says it is in use"""
+    candidate = os.path.join(directory, filename)
+    counter = 1
+    while taken(candidate):
+        name_parts = filename.rsplit('.', 1)
+        if len(name_parts) == 2:
+            candidate = os.path.join(directory, f"{name_parts[0]}_{counter}.{name_parts[1]}")
+        else:
+            candidate = os.path.join(directory, f"{filename}_{counter}")
+        counter += 1
+    return candidate
+
+
+class PlacementJournal:
+    """Append-only record of which source file went where"""
+
+    def __init__(self, root: str, name: str = JOURNAL_NAME):
+        self.root = str(root)
+        self.path = os.path.join(self.root, name)
+        self.entries: Dict[str, Dict] = {}   # source path -> latest state
+        self.owners: Dict[str, str] = {}     # destination (relative) -> source path
+        self.placed = 0
+        self.skipped = 0
+        self.placed_bytes = 0
+        self._lock = threading.RLock()
+        torn = self._load()
+        os.makedirs(self.root, exist_ok=True)
+        self._log = open(self.path, 'a', encoding='utf-8')
+        if torn:
+            self._log.write('\n')  # end the torn line so the next record parses
+
+    def _load(self) -> bool:
+        """Replay the log; True if it ends in a torn (unterminated) line"""
+        try:
+            f = open(self.path, 'r', encoding='utf-8')
+        except OSError:
+            return False
+        line = ''
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn line from a crash
+                src = record.get('src')
+                if not src:
+                    continue
+                entry = self.entries.setdefault(src, {})
+                if record['op'] in ('plan', 'done'):
+                    entry.update(record)
+                    entry['done'] = record['op'] == 'done'
+                elif record['op'] == 'move':
+                    self.owners.pop(entry.get('dst'), None)
+                    entry.setdefault('placed', entry.get('dst'))
+                    entry['dst'] = record['dst']
+                    if record.get('placed'):
+                        entry['placed'] = record['dst']
+                self.owners[entry['dst']] = src
+        return bool(line) and not line.endswith('\n')
+
+    def _append(self, record: Dict):
+        self._log.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._log.flush()
+
+    def _abs(self, rel: str) -> str:
+        return os.path.join(self.root, rel)
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(path, self.root)
+
+    # ---- queries ------------------------------------------------------
+
+    def destination(self, src: str) -> Optional[str]:
+        """Where src was placed (or planned) by an earlier run, as an absolute path"""
+        entry = self.entries.get(os.path.abspath(src))
+        return self._abs(entry['dst']) if entry else None
+
+    def is_done(self, src: str, version: Dict) -> bool:
+        """True if src, unchanged since, already sits at its recorded destination.
+
+        version is what identifies src's content: size and mtime_ns for a
+        file, size and crc for an archive member.
+        """
+        entry = self.entries.get(os.path.abspath(src))
+        if not entry or not entry.get('done'):
+            return False
+        if any(entry.get(key) != value for key, value in version.items()):
+            return False
+        try:
+            return os.stat(self._abs(entry['dst'])).st_size == entry['size']
+        except OSError:
+            return False
+
+    # ---- placing ------------------------------------------------------
+
+    def _taken_by_other(self, src: str, path: str) -> bool:
+        owner = self.owners.get(self._rel(path))
+        if owner is not None:
+            return owner != src
+        return os.path.lexists(path)
+
+    def place(self, src: str, target_dir: str, filename: Optional[str] = None,
+              transfer: Optional[Callable[[str, str], str]] = None) -> Tuple[str, bool]:
+        """Put src into target_dir unless an earlier run already did.
+
+        Returns (destination, placed_now). transfer(src, dst) can replace the
+        hashing copy, e.g. with riftkit.place.Placer.place to link instead;
+        its return value is logged as the method.
+        """
+        src = os.path.abspath(src)
+        stat = os.stat(src)
+
+        def write(partial):
+            if transfer is None:
+                return 'copy', copy_with_digest(src, partial)
+            return transfer(src, partial), None
+
+        return self._place(src, {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns},
+                           target_dir, filename or os.path.basename(src), write)
+
+    def place_stream(self, key: str, version: Dict, target_dir: str, filename: str,
+                     write: Callable[[str], Tuple[str, Optional[str]]]) -> Tuple[str, bool]:
+        """place() for content that is not a file of its own, e.g. a zip member.
+
+        key names the source in the journal, version identifies its content
+        (it must include 'size'), and write(path) creates path and returns
+        (method, digest).
+        """
+        return self._place(os.path.abspath(key), version, target_dir, filename, write)
+
+    def _place(self, src, version, target_dir, filename, write):
+        with self._lock:
+            if self.is_done(src, version):
+                self.skipped += 1
+                entry = self.entries[src]
+                # Placed into another folder last time (its category changed): move it.
+                # Later move() calls (e.g. after content checks) are kept as they are.
+                placed_dir = os.path.dirname(entry.get('placed', entry['dst']))
+                if placed_dir != self._rel(str(target_dir)):
+                    self.move(src, self.free_name(src, target_dir, filename), placed=True)
+                return self._abs(entry['dst']), False
+
+            dst = self.destination(src)
+            if dst is None:
+                dst = self.free_name(src, target_dir, filename)
+            record = dict({'src': src, 'dst': self._rel(dst)}, **version)
+            self._append(dict(record, op='plan'))
+            self.entries[src] = dict(record, done=False)
+            self.owners[record['dst']] = src
+
+        # The bytes are written outside the lock, so several sources can be placed at once
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        partial = dst + PARTIAL_SUFFIX
+        if os.path.lexists(partial):
+            os.unlink(partial)
+        start = time.perf_counter()
+        try:
+            method, digest = write(partial)
+            os.replace(partial, dst)
+        except BaseException:
+            if os.path.lexists(partial):
+                os.unlink(partial)
+            raise
+
+        with self._lock:
+            done = dict(record, method=method, digest=digest)
+            self._append(dict(done, op='done'))
+            self.entries[src] = dict(done, done=True)
+            self.placed += 1
+            self.placed_bytes += version['size']
+        profiling.record_asset(dst, time.perf_counter() - start, [(dst, True, version['size'])])
+        return dst, True
+
+    def move(self, src: str, new_dst: str, placed: bool = False):
+        """Rename src's placed file to new_dst and record it, so re-runs look there.
+
+        placed=True marks new_dst as the folder src is now placed in, rather
+        than a later reclassification that place() should leave alone.
+        """
+        src = os.path.abspath(src)
+        with self._lock:
+            entry = self.entries[src]
+            os.makedirs(os.path.dirname(new_dst), exist_ok=True)
+            os.rename(self._abs(entry['dst']), new_dst)
+            self.owners.pop(entry['dst'], None)
+            entry.setdefault('placed', entry['dst'])
+            entry['dst'] = self._rel(new_dst)
+            if placed:
+                entry['placed'] = entry['dst']
+            self.owners[entry['dst']] = src
+            record = {'op': 'move', 'src': src, 'dst': entry['dst']}
+            if placed:
+                record['placed'] = True
+            self._append(record)
+
+    def free_name(self, src: str, target_dir: str, filename: str) -> str:
+        """A name in target_dir that no other source owns"""
+        src = os.path.abspath(src)
+        return unique_name(str(target_dir), filename, lambda path: self._taken_by_other(src, path))
+
+    # ---- checking -----------------------------------------------------
+
+    def verify(self) -> List[str]:
+        """Re-hash every journaled copy; returns destinations that are missing or differ"""
+        bad = []
+        for entry in self.entries.values():
+            if not entry.get('done') or not entry.get('digest'):
+                continue
+            path = self._abs(entry['dst'])
+            h = hashlib.blake2b(digest_size=20)
+            try:
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(CHUNK_BYTES), b''):
+                        h.update(chunk)
+            except OSError:
+                bad.append(path)
+                continue
+            if h.hexdigest() != entry['digest']:
+                bad.append(path)
+        return sorted(bad)
+
+    def summary(self) -> str:
+        return (f"{self.placed} placed ({self.placed_bytes / 1024 / 1024:.1f}MB), "
+                f"{self.skipped} already done")
+
+    def close(self):
+        self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,154 @@
+"""
+Declarative variant matrices for generator sweeps.
+
+A VariantMatrix is a set of named axes, each a list of values, plus filter
+predicates. Iterating it lazily walks the Cartesian product and yields one
+variant per surviving combination, as a dict of axis name -> value:
+
+    matrix = VariantMatrix({'font': ['inter', 'oswald'], 'size': [256, 512]})
+    matrix = matrix.filter(lambda v: not (v['font'] == 'oswald' and v['size'] > 256))
+    for result in matrix.run(render, jobs=8):
+        ...
+
+Axis values should be short names (font names, palette names, pixel sizes)
+rather than the configs they stand for: variants then pickle cheaply, hash
+stably for the build cache and read well in filenames.
+
+run() renders variants in order. With jobs > 1 it cuts the product into
+chunks and keeps a few chunks per worker in flight, so results stream back
+as they finish and memory stays flat however large the product is.
+
+parse_axes() and parse_where() turn the --axis and --where command-line
+options into axis overrides and predicates.
+"""
+
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence
+
+Variant = Dict[str, Any]
+Predicate = Callable[[Variant], bool]
+
+# Chunks kept queued per worker process, so no worker waits for the parent
+CHUNKS_PER_WORKER = 4
+
+
+class VariantMatrix:
+    """Lazy Cartesian product of named axes, filtered by predicates"""
+
+    def __init__(self, axes: Dict[str, Sequence[Any]], where: Iterable[Predicate] = ()):
+        self.axes = {name: list(values) for name, values in axes.items()}
+        self.where = list(where)
+
+    def filter(self, *predicates: Predicate) -> 'VariantMatrix':
+        """Matrix keeping only the variants every predicate accepts"""
+        return VariantMatrix(self.axes, self.where + list(predicates))
+
+    def with_axes(self, **axes: Sequence[Any]) -> 'VariantMatrix':
+        """Matrix with the given axes' values replaced"""
+        unknown = set(axes) - set(self.axes)
+        if unknown:
+            raise KeyError(f"unknown axis: {', '.join(sorted(unknown))}")
+        return VariantMatrix({**self.axes, **axes}, self.where)
+
+    @property
+    def bound(self) -> int:
+        """Size of the unfiltered product: an upper bound on the variant count"""
+        count = 1
+        for values in self.axes.values():
+            count *= len(values)
+        return count
+
+    def __iter__(self) -> Iterator[Variant]:
+        names = list(self.axes)
+        for values in itertools.product(*self.axes.values()):
+            variant = dict(zip(names, values))
+            if all(predicate(variant) for predicate in self.where):
+                yield variant
+
+    def chunks(self, size: int) -> Iterator[List[Variant]]:
+        """The variants in lists of up to size"""
+        variants = iter(self)
+        while True:
+            chunk = list(itertools.islice(variants, size))
+            if not chunk:
+                return
+            yield chunk
+
+    def run(self, render: Callable[[Variant], Any], jobs: int = 1, chunk_size: int = 16) -> Iterator[Any]:
+        """Render every variant, yielding the results in matrix order as they finish.
+
+        With jobs > 1, render must be picklable (a module-level function or
+        a functools.partial of one); the predicates run in this process.
+        """
+        if jobs <= 1:
+            for variant in self:
+                yield render(variant)
+            return
+        chunks = self.chunks(chunk_size)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            pending = deque(pool.submit(_render_chunk, render, chunk)
+                            for chunk in itertools.islice(chunks, jobs * CHUNKS_PER_WORKER))
+            while pending:
+                results = pending.popleft().result()
+                for chunk in itertools.islice(chunks, 1):
+                    pending.append(pool.submit(_render_chunk, render, chunk))
+                yield from results
+
+
+def _render_chunk(render: Callable[[Variant], Any], chunk: List[Variant]) -> List[Any]:
+    return [render(variant) for variant in chunk]
+
+
+def _parse_value(text: str, choices: Sequence[Any]) -> Any:
+    """A command-line axis value: a number where the axis takes numbers"""
+    if text.isdigit() and any(isinstance(choice, int) for choice in choices):
+        return int(text)
+    return text
+
+
+def parse_axes(specs: Sequence[str], choices: Dict[str, Sequence[Any]]) -> Dict[str, List[Any]]:
+    """Axis overrides from `AXIS=V1,V2` specs; `AXIS=all` selects every choice.
+
+    Named values must be among the axis' choices; axes with numeric
+    choices (sizes) also accept any other number. Raises ValueError.
+    """
+    axes: Dict[str, List[Any]] = {}
+    for spec in specs:
+        name, sep, values = spec.partition('=')
+        if not sep or name not in choices:
+            raise ValueError(f"--axis {spec!r}: expected AXIS=VALUES with AXIS one of {', '.join(choices)}")
+        if values == 'all':
+            axes[name] = list(choices[name])
+            continue
+        parsed = [_parse_value(value, choices[name]) for value in values.split(',') if value]
+        unknown = [str(value) for value in parsed if not isinstance(value, int) and value not in choices[name]]
+        if unknown or not parsed:
+            raise ValueError(f"--axis {spec!r}: {name} takes {', '.join(map(str, choices[name]))}")
+        axes[name] = parsed
+    return axes
+
+
+def parse_where(specs: Sequence[str], choices: Dict[str, Sequence[Any]]) -> List[Predicate]:
+    """Predicates from `AXIS=V1,V2` (keep) and `AXIS!=V1,V2` (drop) specs. Raises ValueError."""
+    predicates = []
+    for spec in specs:
+        negate = '!=' in spec
+        name, _, values = spec.partition('!=' if negate else '=')
+        if name not in choices or not values:
+            raise ValueError(f"--where {spec!r}: expected AXIS=VALUES or AXIS!=VALUES "
+                             f"with AXIS one of {', '.join(choices)}")
+        selected = frozenset(_parse_value(value, choices[name]) for value in values.split(','))
+        predicates.append(_Membership(name, selected, negate))
+    return predicates
+
+
+class _Membership:
+    """Predicate: the variant's value on one axis is (or is not) in a set"""
+
+    def __init__(self, axis: str, values: frozenset, negate: bool):
+        self.axis, self.values, self.negate = axis, values, negate
+
+    def __call__(self, variant: Variant) -> bool:
+        return (variant[self.axis] in self.values) != self.negate
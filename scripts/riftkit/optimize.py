@@ -0,0 +1,232 @@
+"""
+Metadata stripping and recompression of JPEG and PNG files, in place.
+
+Supplier photos carry camera EXIF, embedded thumbnails, XMP and assorted
+ICC profiles that browsers either ignore or spend time on. optimize_file()
+rewrites one file so that it:
+
+- has no metadata left (EXIF, XMP, comments, thumbnails, ICC);
+- has its EXIF orientation baked into the pixels, so dropping the tag does
+  not turn it sideways;
+- is in sRGB, converted through its embedded profile when it has another
+  one, so it looks the same in colour-managed and unmanaged browsers;
+- is recompressed:
+  * JPEG: re-encoded with the file's own quantization tables and chroma
+    subsampling, optimized Huffman tables and progressive scans. Reusing
+    the tables keeps the requantization error to rounding, which is as
+    close to lossless as Pillow gets without jpegtran;
+  * PNG: losslessly, with an exact palette when there are 256 colours or
+    fewer, no alpha channel when every pixel is opaque, and zlib level 9.
+
+A rewrite that would be larger than the original is dropped, unless the
+orientation or colour profile had to be baked in.
+
+OptimizeCache records each file's size and mtime after it was optimized,
+so later runs skip it after one stat. It lives in .optimize-cache.json at
+the repository root, like the spec cache, so nothing extra lands in public/
+and gets deployed with the site.
+"""
+
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_PATH = os.path.join(REPO_ROOT, '.optimize-cache.json')
+CACHE_VERSION = 1
+EXTENSIONS = ('.jpg', '.jpeg', '.png')
+ORIENTATION_TAG = 0x0112
+
+# Image.info keys that describe the encoding rather than carry metadata
+KEPT_INFO = {'dpi', 'jfif', 'jfif_version', 'jfif_unit', 'jfif_density', 'progressive',
+             'progression', 'adobe', 'adobe_transform', 'icc_profile', 'transparency',
+             'gamma', 'srgb', 'interlace'}
+
+
+class Result(NamedTuple):
+    path: str
+    before: int
+    after: int
+    changes: Tuple[str, ...]   # what was done: 'metadata', 'orientation', 'srgb', ...
+    written: bool
+    error: Optional[str] = None
+    elapsed: float = 0.0       # seconds the worker spent on the file
+
+    @property
+    def saved(self) -> int:
+        return self.before - self.after if self.written else 0
+
+
+def _to_srgb(img, icc: bytes):
+    """img converted from its embedded profile to sRGB; None if it is sRGB already"""
+    from PIL import ImageCms
+
+    try:
+        source = ImageCms.ImageCmsProfile(io.BytesIO(icc))
+    except (OSError, ImageCms.PyCMSError):
+        return None  # unreadable profile: treat the pixels as sRGB
+    description = (ImageCms.getProfileDescription(source) or '').lower()
+    if 'srgb' in description and img.mode in ('RGB', 'RGBA'):
+        return None
+    mode = 'RGBA' if 'A' in img.getbands() else 'RGB'
+    return ImageCms.profileToProfile(img, source, ImageCms.createProfile('sRGB'),
+                                     renderingIntent=ImageCms.Intent.PERCEPTUAL,
+                                     outputMode=mode)
+
+
+def _encode_jpeg(img, original) -> bytes:
+    from PIL import JpegImagePlugin
+
+    options = {'optimize': True, 'progressive': True}
+    qtables = getattr(original, 'quantization', None)
+    if qtables:
+        options['qtables'] = qtables
+        sampling = JpegImagePlugin.get_sampling(original)
+        if sampling != -1:
+            options['subsampling'] = sampling
+    else:
+        options['quality'] = 95
+    out = io.BytesIO()
+    img.convert('RGB').save(out, 'JPEG', **options)
+    return out.getvalue()
+
+
+def _encode_png(img) -> Tuple[bytes, List[str]]:
+    from PIL import Image
+
+    changes = []
+    if img.mode in ('RGBA', 'LA') and img.getchannel('A').getextrema() == (255, 255):
+        img = img.convert(img.mode[:-1])
+        changes.append('alpha')
+    if img.mode in ('RGB', 'RGBA'):
+        colours = img.getcolors(256)
+        if colours is not None:
+            # Exact palette: every colour kept, so this stays lossless
+            palette_img = Image.new('P', img.size)
+            index = {colour: i for i, (_, colour) in enumerate(colours)}
+            palette_img.putdata([index[pixel] for pixel in img.getdata()])
+            flat = []
+            for _, colour in colours:
+                flat.extend(colour[:3])
+            palette_img.putpalette(flat)
+            if img.mode == 'RGBA':
+                palette_img.info['transparency'] = bytes(colour[3] for _, colour in colours)
+            elif isinstance(img.info.get('transparency'), tuple):
+                # RGB colour key (tRNS): the keyed colour's entry becomes the transparent one
+                key = tuple(img.info['transparency'][:3])
+                if key in index:
+                    palette_img.info['transparency'] = index[key]
+            img = palette_img
+            changes.append('palette')
+    out = io.BytesIO()
+    img.save(out, 'PNG', optimize=True, compress_level=9)
+    return out.getvalue(), changes
+
+
+def optimize_file(path: str, dry_run: bool = False) -> Result:
+    """Strip, orient, convert and recompress one file in place"""
+    from PIL import Image, ImageOps
+
+    before = os.path.getsize(path)
+    try:
+        with Image.open(path) as original:
+            original.load()
+            changes = []
+            if set(original.info) - KEPT_INFO:
+                changes.append('metadata')
+            img = original
+            if original.getexif().get(ORIENTATION_TAG, 1) not in (0, 1):
+                img = ImageOps.exif_transpose(original)
+                changes.append('orientation')
+            icc = original.info.get('icc_profile')
+            if icc:
+                changes.append('icc')
+                converted = _to_srgb(img, icc)
+                if converted is not None:
+                    img = converted
+                    changes.append('srgb')
+            if img.mode == 'CMYK':
+                img = img.convert('RGB')
+                changes.append('srgb')
+
+            if original.format == 'JPEG':
+                data = _encode_jpeg(img, original)
+            else:
+                data, png_changes = _encode_png(img)
+                changes.extend(png_changes)
+    except Exception as e:
+        return Result(path, before, before, (), False, str(e))
+
+    # Pixels had to change to keep the look once the tags are gone: write even if bigger
+    must_write = 'orientation' in changes or 'srgb' in changes
+    if len(data) >= before and not must_write:
+        return Result(path, before, before, tuple(changes), False)
+    if not dry_run:
+        partial = path + '.partial'
+        with open(partial, 'wb') as f:
+            f.write(data)
+        os.replace(partial, path)
+    return Result(path, before, len(data), tuple(changes + ['recompressed']), True)
+
+
+class OptimizeCache:
+    """Files already optimized, by (size, mtime_ns) after optimization"""
+
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = path
+        self.entries: Dict[str, List[int]] = {}
+        self.dirty = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    def _key(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), REPO_ROOT).replace(os.sep, '/')
+
+    def is_done(self, path: str, stat: os.stat_result) -> bool:
+        return self.entries.get(self._key(path)) == [stat.st_size, stat.st_mtime_ns]
+
+    def mark(self, path: str):
+        stat = os.stat(path)
+        self.entries[self._key(path)] = [stat.st_size, stat.st_mtime_ns]
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'files': self.entries}, f, indent=1, sort_keys=True)
+        self.dirty = False
+
+
+def find_images(root: str, extensions: Tuple[str, ...] = EXTENSIONS) -> Iterable[Tuple[str, os.stat_result]]:
+    """(path, stat) of every JPEG/PNG under root, skipping dot folders"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+        for filename in sorted(filenames):
+            if filename.lower().endswith(extensions) and not filename.startswith('.'):
+                path = os.path.join(dirpath, filename)
+                yield path, os.stat(path)
+
+
+def _optimize_one(args: Tuple[str, bool]) -> Result:
+    start = time.perf_counter()
+    result = optimize_file(*args)
+    return result._replace(elapsed=time.perf_counter() - start)
+
+
+def optimize_files(paths: List[str], dry_run: bool = False, jobs: int = 1) -> List[Result]:
+    """Optimize files on a process pool; results are in the order of paths"""
+    import PIL  # noqa: F401 - fail early, not once per file inside the workers
+    work = [(path, dry_run) for path in paths]
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(_optimize_one, work, chunksize=4))
+    return [_optimize_one(item) for item in work]
@@ -0,0 +1,415 @@
+"""
+Outline the <text> in generated SVGs into <path>s drawn from local font files.
+
+The logo generators set "RIFT" as <text font-family="'Rajdhani', sans-serif">
+and leave the font to the viewer: an exported SVG renders in whatever face
+happens to be installed, and the preview pages download every family from
+Google Fonts before they can paint. Outliner.outline() rewrites a document
+so that each <text> it can set becomes one <path> of glyph outlines,
+which renders the same everywhere, offline, with no font request at all.
+
+Fonts are looked up in FONT_DIRS plus any --fonts-dir: .ttf/.otf files,
+indexed by family, weight and style. A text is set in the first family of
+its font-family list that is found, at the nearest weight (variable fonts
+at the exact weight on their wght axis). Layout follows what browsers do
+for a single run: glyph advances from the font, letter-spacing between
+characters, text-anchor start/middle/end and y as the baseline. There is no
+kerning or complex shaping, and font-stretch is ignored, so this is meant
+for short Latin wordmarks. Texts that cannot be set faithfully (tspans,
+dx/dy/rotate, baseline shifts, a family with no local file, a character
+missing from the font) are left as text, and counted.
+
+Glyph outlines are cached in .glyph-cache.json at the repository root,
+keyed by font digest, weight and character, together with the font index,
+so a warm run neither parses a font nor imports fontTools
+(pip install fonttools), which is only needed to read fonts not yet cached.
+"""
+
+import hashlib
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from riftkit import geometry
+from riftkit.svgmin import IMPORT_RE, PRECISION, serialize
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_PATH = os.path.join(REPO_ROOT, '.glyph-cache.json')
+CACHE_VERSION = 1
+
+FONT_DIRS = [
+    os.path.join(REPO_ROOT, 'fonts'),
+    os.path.expanduser('~/.local/share/fonts'),
+    os.path.expanduser('~/.fonts'),
+    '/usr/local/share/fonts',
+    '/usr/share/fonts',
+]
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
+GENERIC_FAMILIES = {'serif', 'sans-serif', 'monospace', 'cursive', 'fantasy', 'system-ui'}
+WEIGHT_KEYWORDS = {'normal': 400, 'bold': 700}
+# Properties laid out here; they are dropped from the <path> that replaces a text
+TEXT_PROPERTIES = {'font-family', 'font-size', 'font-weight', 'font-style', 'font-stretch',
+                   'letter-spacing', 'text-anchor'}
+# Properties (or attributes) this layout cannot honour: texts using them stay text
+UNSUPPORTED = {'dx', 'dy', 'rotate', 'textLength', 'lengthAdjust', 'dominant-baseline',
+               'alignment-baseline', 'baseline-shift', 'writing-mode', 'direction',
+               'word-spacing', 'font-variant', 'font-feature-settings', 'text-decoration',
+               '{http://www.w3.org/XML/1998/namespace}space'}
+
+LENGTH_RE = re.compile(r'(-?(?:\d+\.\d*|\.\d+|\d+))(px|em)?')
+SPACES_RE = re.compile(r'\s+')
+
+
+class FontFace(NamedTuple):
+    path: str
+    digest: str
+    family: str
+    weight: int                               # usWeightClass, or the default of a variable font
+    italic: bool
+    weights: Optional[Tuple[float, float]]    # wght axis range of a variable font
+    units_per_em: int
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _coordinate(value: float) -> str:
+    return f"{round(value, 2) + 0.0:g}"
+
+
+def _read_face(path: str) -> Tuple[str, int, bool, Optional[Tuple[float, float]], int]:
+    """(family, weight, italic, wght range, units per em) from a font's tables"""
+    from fontTools.ttLib import TTFont
+    font = TTFont(path, lazy=True)
+    names = font['name']
+    family = names.getDebugName(16) or names.getDebugName(1)
+    weight, weights = font['OS/2'].usWeightClass, None
+    for axis in font['fvar'].axes if 'fvar' in font else ():
+        if axis.axisTag == 'wght':
+            weight, weights = round(axis.defaultValue), (axis.minValue, axis.maxValue)
+    italic = bool(font['OS/2'].fsSelection & 1 or font['head'].macStyle & 2)
+    return family, weight, italic, weights, font['head'].unitsPerEm
+
+
+def _glyph_outlines(path: str, weight: Optional[float], chars: Iterable[str]) -> Dict[str, Optional[list]]:
+    """char -> [advance, path data in font units], or None where the font lacks the glyph.
+
+    weight is the wght axis location for a variable font, None for a static one.
+    """
+    from fontTools.pens.basePen import BasePen
+    from fontTools.ttLib import TTFont
+
+    class PathPen(BasePen):
+        def __init__(self, glyph_set):
+            super().__init__(glyph_set)
+            self.parts: List[str] = []
+
+        def _moveTo(self, pt):
+            self.parts.append(f"M{_coordinate(pt[0])} {_coordinate(pt[1])}")
+
+        def _lineTo(self, pt):
+            self.parts.append(f"L{_coordinate(pt[0])} {_coordinate(pt[1])}")
+
+        def _qCurveToOne(self, pt1, pt2):
+            self.parts.append('Q' + ' '.join(_coordinate(v) for v in (*pt1, *pt2)))
+
+        def _curveToOne(self, pt1, pt2, pt3):
+            self.parts.append('C' + ' '.join(_coordinate(v) for v in (*pt1, *pt2, *pt3)))
+
+        def _closePath(self):
+            self.parts.append('Z')
+
+    font = TTFont(path)
+    cmap = font.getBestCmap()
+    glyph_set = font.getGlyphSet(location={'wght': weight} if weight is not None else None)
+    outlines = {}
+    for char in chars:
+        name = cmap.get(ord(char))
+        if name is None:
+            outlines[char] = None
+            continue
+        pen = PathPen(glyph_set)
+        glyph_set[name].draw(pen)
+        outlines[char] = [glyph_set[name].width, ''.join(pen.parts)]
+    return outlines
+
+
+def _families(value: str) -> List[str]:
+    """Family names of a font-family list, generic families dropped"""
+    names = [name.strip().strip('\'"').strip() for name in value.split(',')]
+    return [name for name in names if name and name.lower() not in GENERIC_FAMILIES]
+
+
+def _declarations(style: str) -> Dict[str, str]:
+    declarations = {}
+    for declaration in style.split(';'):
+        name, sep, value = declaration.partition(':')
+        if sep:
+            declarations[name.strip()] = value.strip()
+    return declarations
+
+
+def _length(value: str, font_size: float) -> Optional[float]:
+    """A length in user units: plain numbers, px and em; None for anything else"""
+    if value == 'normal':
+        return 0.0
+    match = LENGTH_RE.fullmatch(value.strip())
+    if not match:
+        return None
+    number = float(match.group(1))
+    return number * font_size if match.group(2) == 'em' else number
+
+
+class Outliner:
+    """Sets <text> as glyph outlines from local fonts, with an on-disk glyph cache"""
+
+    def __init__(self, font_dirs: Sequence[str] = (), cache_path: str = CACHE_PATH):
+        self.font_dirs = list(font_dirs) + FONT_DIRS
+        self.cache_path = cache_path
+        self.pid = os.getpid()
+        self.missing_families = set()
+        self.unreadable: List[str] = []   # fonts that could not be indexed (or fontTools is missing)
+        self._faces: Optional[List[FontFace]] = None
+        self._face_index: Dict[str, list] = {}
+        self._glyphs: Dict[str, Optional[list]] = {}
+        self._shapes: Dict[str, geometry.Shape] = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == CACHE_VERSION:
+            self._face_index = data.get('faces', {})
+            self._glyphs = data.get('glyphs', {})
+
+    def save(self):
+        """Merge new glyphs into the cache file and replace it atomically.
+
+        Worker processes save too, so whatever they set is kept.
+        """
+        if not self.dirty:
+            return
+        faces, glyphs = {}, {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                faces, glyphs = data.get('faces', {}), data.get('glyphs', {})
+        except (OSError, ValueError):
+            pass
+        faces.update(self._face_index)
+        glyphs.update(self._glyphs)
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'faces': faces, 'glyphs': glyphs}, f,
+                      ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+    # ===== FONT INDEX =====
+
+    @property
+    def faces(self) -> List[FontFace]:
+        """Every readable font file in the font directories, indexed on first use"""
+        if self._faces is None:
+            self._faces = []
+            for font_dir in self.font_dirs:
+                for folder, _, filenames in sorted(os.walk(font_dir)):
+                    for filename in sorted(filenames):
+                        if filename.lower().endswith(FONT_EXTENSIONS):
+                            face = self._index(os.path.abspath(os.path.join(folder, filename)))
+                            if face is not None:
+                                self._faces.append(face)
+        return self._faces
+
+    def _index(self, path: str) -> Optional[FontFace]:
+        """The face in a font file, read from the cache unless the file changed"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        entry = self._face_index.get(path)
+        if entry is None or entry[0] != [stat.st_size, stat.st_mtime_ns]:
+            try:
+                family, weight, italic, weights, units_per_em = _read_face(path)
+                with open(path, 'rb') as f:
+                    font_digest = hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+            except Exception:  # ImportError without fontTools, or a file it cannot read
+                self.unreadable.append(path)
+                return None
+            entry = [[stat.st_size, stat.st_mtime_ns], font_digest, family, weight, italic,
+                     list(weights) if weights else None, units_per_em]
+            self._face_index[path] = entry
+            self.dirty = True
+        _, font_digest, family, weight, italic, weights, units_per_em = entry
+        return FontFace(path, font_digest, family, weight, italic,
+                        tuple(weights) if weights else None, units_per_em)
+
+    def fingerprint(self) -> List[Tuple[str, str, int, bool]]:
+        """What the indexed fonts are, for build cache keys: outlines change with them"""
+        return sorted((face.digest, face.family, face.weight, face.italic) for face in self.faces)
+
+    def match(self, families: Sequence[str], weight: int, italic: bool) -> Optional[Tuple[FontFace, float]]:
+        """The face for the first family that has one, and the weight to draw it at"""
+        for family in families:
+            candidates = [face for face in self.faces if face.family.lower() == family.lower()]
+            if not candidates:
+                continue
+            styled = [face for face in candidates if face.italic == italic] or candidates
+            for face in styled:
+                if face.weights and face.weights[0] <= weight <= face.weights[1]:
+                    return face, weight
+            # Nearest weight; on a tie the heavier face for bold text, the lighter otherwise
+            face = min(styled, key=lambda f: (abs(f.weight - weight), (f.weight < weight) == (weight > 400)))
+            return face, (min(max(weight, face.weights[0]), face.weights[1]) if face.weights else face.weight)
+        self.missing_families.update(families)
+        return None
+
+    # ===== GLYPHS =====
+
+    def glyphs(self, face: FontFace, weight: float, text: str) -> Optional[List[Tuple[float, geometry.Shape]]]:
+        """(advance, outline) in font units for each character, or None if any is missing"""
+        keys = [f"{face.digest}|{weight:g}|{ord(char):04X}" for char in text]
+        todo = sorted({char for char, key in zip(text, keys) if key not in self._glyphs})
+        if todo:
+            try:
+                outlines = _glyph_outlines(face.path, weight if face.weights else None, todo)
+            except Exception:  # ImportError without fontTools, or a damaged font
+                return None
+            for char, outline in outlines.items():
+                self._glyphs[f"{face.digest}|{weight:g}|{ord(char):04X}"] = outline
+            self.dirty = True
+        placed = []
+        for key in keys:
+            glyph = self._glyphs[key]
+            if glyph is None:
+                return None
+            advance, d = glyph
+            if d not in self._shapes:
+                self._shapes[d] = geometry.shape(d)
+            placed.append((advance, self._shapes[d]))
+        return placed
+
+    # ===== DOCUMENTS =====
+
+    def outline(self, svg: str, precision: int = PRECISION) -> Tuple[str, int, int]:
+        """(document, texts outlined, texts left as text) for an SVG document.
+
+        Documents without text, or that do not parse, come back unchanged.
+        """
+        if '<text' not in svg:
+            return svg, 0, 0
+        try:
+            root = ET.fromstring(svg)
+        except ET.ParseError:
+            return svg, 0, 0
+        parents = {child: parent for parent in root.iter() for child in parent}
+        texts = [elem for elem in root.iter() if _local(elem.tag) == 'text']
+        outlined = 0
+        for text in texts:
+            path = self._outline_text(text, parents, precision)
+            if path is not None:
+                parent = parents[text]
+                path.tail = text.tail
+                parent[list(parent).index(text)] = path
+                outlined += 1
+        if outlined == 0:
+            result = svg
+        else:
+            if outlined == len(texts):
+                _drop_web_fonts(root, parents)
+            result = serialize(root)
+        if self.dirty and os.getpid() != self.pid:
+            self.save()   # a pool worker: the parent never sees these glyphs
+        return result, outlined, len(texts) - outlined
+
+    def _outline_text(self, text: ET.Element, parents: Dict[ET.Element, ET.Element],
+                      precision: int) -> Optional[ET.Element]:
+        """A <path> drawing text, or None if it has to stay text"""
+        if len(text) or not (text.text or '').strip():
+            return None
+
+        def computed(name: str, default: Optional[str]) -> Optional[str]:
+            node = text
+            while node is not None:
+                value = _declarations(node.get('style', '')).get(name, node.get(name))
+                if value is not None:
+                    return value
+                node = parents.get(node)
+            return default
+
+        try:
+            x, y = float(text.get('x', 0)), float(text.get('y', 0))
+        except ValueError:
+            return None   # coordinate lists
+        if any(computed(name, None) is not None for name in UNSUPPORTED):
+            return None
+        font_size = _length(computed('font-size', '16'), 16)
+        weight_text = computed('font-weight', 'normal')
+        weight = WEIGHT_KEYWORDS.get(weight_text, int(weight_text) if weight_text.isdigit() else None)
+        if not font_size or weight is None:
+            return None
+        spacing = _length(computed('letter-spacing', 'normal'), font_size)
+        anchor = computed('text-anchor', 'start')
+        if spacing is None or anchor not in ('start', 'middle', 'end'):
+            return None
+        italic = computed('font-style', 'normal') in ('italic', 'oblique')
+
+        matched = self.match(_families(computed('font-family', '')), weight, italic)
+        if matched is None:
+            return None
+        face, draw_weight = matched
+        content = SPACES_RE.sub(' ', text.text).strip()
+        glyphs = self.glyphs(face, draw_weight, content)
+        if glyphs is None:
+            return None
+
+        scale = font_size / face.units_per_em
+        # Anchored on the inked run: spacing between characters, none after the last
+        width = sum(advance * scale for advance, _ in glyphs) + spacing * (len(glyphs) - 1)
+        pen_x = x - {'start': 0, 'middle': width / 2, 'end': width}[anchor]
+        parts = []
+        for advance, glyph in glyphs:
+            if glyph.commands:
+                parts.extend(geometry.path_data([glyph], [(scale, 0, 0, -scale, pen_x, y)], precision)[0])
+            pen_x += advance * scale + spacing
+
+        path = ET.Element(text.tag[:-len('text')] + 'path')
+        for name, value in text.attrib.items():
+            if name not in TEXT_PROPERTIES and name not in ('x', 'y', 'style'):
+                path.set(name, value)
+        style = ';'.join(f"{name}:{value}" for name, value in _declarations(text.get('style', '')).items()
+                         if name not in TEXT_PROPERTIES)
+        if style:
+            path.set('style', style)
+        path.set('d', ''.join(parts))
+        path.set('aria-label', content)
+        return path
+
+
+def _drop_web_fonts(root: ET.Element, parents: Dict[ET.Element, ET.Element]):
+    """Remove web font @imports, and any <style> (and <defs>) they leave empty"""
+    for style in [elem for elem in root.iter() if _local(elem.tag) == 'style']:
+        css = IMPORT_RE.sub(lambda m: '' if 'fonts.googleapis.com' in m.group(0) else m.group(0),
+                            style.text or '')
+        if css.strip():
+            style.text = css
+            continue
+        parent = parents[style]
+        parent.remove(style)
+        if _local(parent.tag) == 'defs' and len(parent) == 0 and parent in parents:
+            parents[parent].remove(parent)
+
+
+def has_text(path: str) -> bool:
+    """Whether an SVG file still holds <text> (and so needs its fonts where it is shown)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return '<text' in f.read()
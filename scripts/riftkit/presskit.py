@@ -0,0 +1,395 @@
+"""
+Reproducible press-kit bundles of output/press-package, as zip or tar.zst.
+
+export_bundle() packs the files an audience needs (AUDIENCES) under one
+top-level folder, with a MANIFEST.json listing each file's size and
+SHA-256 so recipients can check them with sha256sum. The same files always
+give the same bundle bytes: members are sorted, every timestamp is
+SOURCE_DATE_EPOCH (1980-01-01 when unset), owners and modes are fixed, and
+nothing about the machine or the time of the build is recorded.
+
+Every member is compressed on its own, which makes members independent:
+
+- in a zip that is how the format works anyway; the writer here emits the
+  headers itself so it can take compressed data it did not produce;
+- a tar.zst is a chain of zstd frames, one per member holding its tar
+  header and data, which zstd decompresses as a single tar stream. A
+  skippable frame at the end (ignored by zstd) indexes the frames.
+
+So members are compressed in parallel on a thread pool (zlib and zstd
+release the GIL), at most 2 × jobs of them in flight, and written in order
+as they finish. A member whose SHA-256 and compression settings match the
+bundle being replaced is copied from it as compressed bytes, so rebuilding
+a kit after a one-logo change compresses one file.
+
+tar.zst needs the zstandard package; zip needs nothing beyond the standard
+library.
+"""
+
+import fnmatch
+import hashlib
+import io
+import json
+import os
+import struct
+import tarfile
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from riftkit import profiling
+from riftkit.journal import CHUNK_BYTES
+
+FORMATS = ('zip', 'tar.zst')
+LEVELS = {'zip': 9, 'tar.zst': 19}
+MANIFEST_NAME = 'MANIFEST.json'
+MANIFEST_VERSION = 1
+BUNDLE_PREFIX = 'rift-press-kit'
+
+# Files each audience gets, as fnmatch patterns over paths in the press package
+# ('*' also matches '/'); dotfiles such as the build manifest are never included
+AUDIENCES = {
+    'full': ('*',),
+    'social': ('social-media/*', 'banners/*', 'overlays/*', 'logos/*', 'README.md', 'QUICK_START.md'),
+    'print': ('ads/*', 'frames/*', 'logos/*', 'README.md', 'QUICK_START.md'),
+}
+
+ZIP_EPOCH = 315532800   # 1980-01-01T00:00:00Z, the earliest date a zip can hold
+FILE_MODE = 0o644
+
+# Local file header, central directory header and end of central directory
+LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+END_RECORD = struct.Struct('<IHHHHIIH')
+ZIP_VERSION = 20
+ZIP_MADE_BY = (3 << 8) | ZIP_VERSION   # Unix, so external attributes carry the file mode
+UTF8_FLAG = 0x800
+ZIP_LIMIT = 0xFFFFFFFF
+
+SKIPPABLE_MAGIC = 0x184D2A5E
+INDEX_MAGIC = b'RKIX'
+
+
+class Member(NamedTuple):
+    path: str       # file on disk
+    name: str       # name in the bundle
+    size: int
+    sha256: str
+
+
+class Compressed(NamedTuple):
+    """One member ready to be written: the compressed bytes and what the
+    container needs to know about them"""
+    data: bytes
+    method: int = zipfile.ZIP_DEFLATED
+    crc: int = 0
+    size: int = 0
+
+
+# ==================== SELECTING AND HASHING ====================
+
+def source_date_epoch() -> int:
+    """Timestamp recorded for every member"""
+    return max(ZIP_EPOCH, int(os.environ.get('SOURCE_DATE_EPOCH', ZIP_EPOCH)))
+
+
+def select_files(source_dir: str, patterns: Sequence[str]) -> List[str]:
+    """Paths under source_dir (relative, '/'-separated, sorted) matching any pattern"""
+    selected = []
+    for dirpath, dirnames, filenames in os.walk(source_dir):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        for filename in filenames:
+            if filename.startswith('.'):
+                continue
+            rel_path = os.path.relpath(os.path.join(dirpath, filename), source_dir).replace(os.sep, '/')
+            if any(fnmatch.fnmatchcase(rel_path, pattern) for pattern in patterns):
+                selected.append(rel_path)
+    return sorted(selected)
+
+
+def _sha256(path: str) -> Tuple[int, str]:
+    h = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_BYTES), b''):
+            h.update(chunk)
+            size += len(chunk)
+    return size, h.hexdigest()
+
+
+def hash_members(source_dir: str, root: str, rel_paths: Sequence[str], jobs: int = 1) -> List[Member]:
+    """Size and SHA-256 of every selected file, as bundle members under root/"""
+    paths = [os.path.join(source_dir, rel_path) for rel_path in rel_paths]
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        hashes = list(pool.map(_sha256, paths))
+    return [Member(path, f"{root}/{rel_path}", size, sha256)
+            for path, rel_path, (size, sha256) in zip(paths, rel_paths, hashes)]
+
+
+def build_manifest(root: str, audience: str, fmt: str, level: int, members: Sequence[Member]) -> bytes:
+    """MANIFEST.json: the bundle's settings and every file's size and SHA-256"""
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'name': root,
+        'audience': audience,
+        'format': fmt,
+        'level': level,
+        'files': [{'path': m.name[len(root) + 1:], 'size': m.size, 'sha256': m.sha256} for m in members],
+    }
+    return (json.dumps(manifest, indent=1, sort_keys=True) + '\n').encode('utf-8')
+
+
+def _copy_range(source, offset: int, length: int, out):
+    """Stream length bytes at offset in source to out"""
+    source.seek(offset)
+    while length:
+        chunk = source.read(min(CHUNK_BYTES, length))
+        if not chunk:
+            raise ValueError("previous bundle is truncated")
+        out.write(chunk)
+        length -= len(chunk)
+
+
+# ==================== CONTAINERS ====================
+
+class ZipBundle:
+    """Zip written header by header, so compressed members can come from anywhere"""
+
+    suffix = '.zip'
+
+    def __init__(self, level: int, epoch: int):
+        self.level = level
+        t = time.gmtime(epoch)
+        self.dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+        self.dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+        self.central: List[bytes] = []
+
+    def compress(self, name: str, data: bytes) -> Compressed:
+        """Raw deflate of data, or data itself when deflate does not make it smaller"""
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+        deflated = compressor.compress(data) + compressor.flush()
+        crc = zlib.crc32(data)
+        if len(deflated) >= len(data):
+            return Compressed(data, zipfile.ZIP_STORED, crc, len(data))
+        return Compressed(deflated, zipfile.ZIP_DEFLATED, crc, len(data))
+
+    def write(self, out, name: str, item: Compressed):
+        self._add(out, name, item, len(item.data))
+        out.write(item.data)
+
+    def _add(self, out, name: str, item: Compressed, compressed_size: int):
+        offset = out.tell()
+        if max(offset, item.size, compressed_size) > ZIP_LIMIT:
+            raise ValueError("press kit too large for a zip without Zip64; use --format tar.zst")
+        encoded = name.encode('utf-8')
+        fields = (item.method, self.dos_time, self.dos_date, item.crc, compressed_size, item.size, len(encoded))
+        out.write(LOCAL_HEADER.pack(0x04034B50, ZIP_VERSION, UTF8_FLAG, *fields, 0) + encoded)
+        self.central.append(CENTRAL_HEADER.pack(0x02014B50, ZIP_MADE_BY, ZIP_VERSION, UTF8_FLAG, *fields,
+                                                0, 0, 0, 0, (0o100000 | FILE_MODE) << 16, offset) + encoded)
+
+    def finish(self, out):
+        start = out.tell()
+        for record in self.central:
+            out.write(record)
+        size = out.tell() - start
+        if start > ZIP_LIMIT or len(self.central) > 0xFFFF:
+            raise ValueError("press kit too large for a zip without Zip64; use --format tar.zst")
+        out.write(END_RECORD.pack(0x06054B50, 0, 0, len(self.central), len(self.central), size, start, 0))
+
+    # ----- the bundle being replaced -----
+
+    def open_previous(self, path: str) -> Tuple[Optional[bytes], Dict[str, zipfile.ZipInfo]]:
+        """(its manifest, its members by name)"""
+        with zipfile.ZipFile(path) as archive:
+            members = {info.filename: info for info in archive.infolist()}
+            manifest_name = next((name for name in members if name.endswith('/' + MANIFEST_NAME)), None)
+            manifest = archive.read(manifest_name) if manifest_name else None
+        return manifest, members
+
+    def copy(self, out, name: str, previous, info: zipfile.ZipInfo):
+        """Write a member with the compressed bytes it has in the previous bundle"""
+        previous.seek(info.header_offset)
+        header = previous.read(LOCAL_HEADER.size)
+        name_length, extra_length = struct.unpack('<HH', header[26:30])
+        item = Compressed(b'', info.compress_type, info.CRC, info.file_size)
+        self._add(out, name, item, info.compress_size)
+        _copy_range(previous, info.header_offset + LOCAL_HEADER.size + name_length + extra_length,
+                    info.compress_size, out)
+
+
+class TarZstBundle:
+    """tar.zst as one zstd frame per member, indexed in a trailing skippable frame"""
+
+    suffix = '.tar.zst'
+
+    def __init__(self, level: int, epoch: int):
+        import zstandard
+        self.zstd = zstandard
+        self.level = level
+        self.epoch = epoch
+        self.frames: List[Tuple[str, int, int]] = []
+
+    def compress(self, name: str, data: bytes) -> Compressed:
+        """One frame: the member's tar header, its data and the padding to a whole block"""
+        info = tarfile.TarInfo(name)
+        info.size, info.mtime, info.mode = len(data), self.epoch, FILE_MODE
+        info.uid = info.gid = 0
+        info.uname = info.gname = ''
+        block = info.tobuf(tarfile.PAX_FORMAT, 'utf-8', 'surrogateescape')
+        padding = b'\0' * (-len(data) % tarfile.BLOCKSIZE)
+        compressor = self.zstd.ZstdCompressor(level=self.level, write_checksum=True)
+        return Compressed(compressor.compress(block + data + padding), size=len(data))
+
+    def write(self, out, name: str, item: Compressed):
+        self.frames.append((name, out.tell(), len(item.data)))
+        out.write(item.data)
+
+    def finish(self, out):
+        # End-of-archive blocks, then the frame index for the next build
+        out.write(self.zstd.ZstdCompressor(level=self.level).compress(b'\0' * 2 * tarfile.BLOCKSIZE))
+        index = json.dumps({'version': MANIFEST_VERSION, 'frames': self.frames},
+                           separators=(',', ':')).encode('utf-8')
+        payload = index + struct.pack('<I', len(index)) + INDEX_MAGIC
+        out.write(struct.pack('<II', SKIPPABLE_MAGIC, len(payload)) + payload)
+
+    # ----- the bundle being replaced -----
+
+    def open_previous(self, path: str) -> Tuple[Optional[bytes], Dict[str, Tuple[int, int]]]:
+        """(its manifest, its member frames by name as (offset, length))"""
+        with open(path, 'rb') as f:
+            f.seek(-8, os.SEEK_END)
+            length, magic = struct.unpack('<I4s', f.read(8))
+            if magic != INDEX_MAGIC:
+                return None, {}
+            f.seek(-8 - length, os.SEEK_END)
+            index = json.loads(f.read(length))
+            frames = {name: (offset, size) for name, offset, size in index['frames']}
+            manifest_name = next((name for name in frames if name.endswith('/' + MANIFEST_NAME)), None)
+            if manifest_name is None:
+                return None, frames
+            f.seek(frames[manifest_name][0])
+            block = self.zstd.ZstdDecompressor().decompress(f.read(frames[manifest_name][1]))
+        with tarfile.open(fileobj=io.BytesIO(block + b'\0' * 2 * tarfile.BLOCKSIZE)) as tar:
+            manifest = tar.extractfile(tar.next()).read()
+        return manifest, frames
+
+    def copy(self, out, name: str, previous, frame: Tuple[int, int]):
+        """Write a member's frame exactly as it is in the previous bundle"""
+        self.frames.append((name, out.tell(), frame[1]))
+        _copy_range(previous, frame[0], frame[1], out)
+
+
+CONTAINERS = {'zip': ZipBundle, 'tar.zst': TarZstBundle}
+
+
+# ==================== EXPORT ====================
+
+def _compress_file(container, member: Member) -> Tuple[Compressed, float]:
+    start = time.perf_counter()
+    with open(member.path, 'rb') as f:
+        data = f.read()
+    return container.compress(member.name, data), time.perf_counter() - start
+
+
+def _in_order(pool, container, plan, window: int) -> Iterator[Tuple[Member, object, Optional[Tuple]]]:
+    """(member, previous locator, compressed) in plan order, compressing the
+    members without a locator on the pool with at most window in flight"""
+    queue = deque()
+    items = iter(plan)
+    in_flight = 0
+
+    def fill():
+        nonlocal in_flight
+        while in_flight < window:
+            item = next(items, None)
+            if item is None:
+                return
+            member, locator = item
+            future = None if locator is not None else pool.submit(_compress_file, container, member)
+            in_flight += future is not None
+            queue.append((member, locator, future))
+
+    fill()
+    while queue:
+        member, locator, future = queue.popleft()
+        result = None
+        if future is not None:
+            result = future.result()
+            in_flight -= 1
+        fill()
+        yield member, locator, result
+
+
+def bundle_name(audience: str) -> str:
+    return f"{BUNDLE_PREFIX}-{audience}" if audience != 'full' else BUNDLE_PREFIX
+
+
+def export_bundle(source_dir: str, out_dir: str, audience: str = 'full', fmt: str = 'zip',
+                  level: Optional[int] = None, jobs: int = 1, force: bool = False) -> Dict[str, object]:
+    """Write (or refresh) one audience's press kit; returns what it did.
+
+    The stats hold the bundle path, file count, files compressed and reused,
+    bytes in and out, and whether the bundle was already up to date.
+    """
+    level = LEVELS[fmt] if level is None else level
+    root = bundle_name(audience)
+    bundle_path = os.path.join(out_dir, root + CONTAINERS[fmt].suffix)
+    container = CONTAINERS[fmt](level, source_date_epoch())
+
+    with profiling.stage('hash'):
+        members = hash_members(source_dir, root, select_files(source_dir, AUDIENCES[audience]), jobs)
+    manifest = build_manifest(root, audience, fmt, level, members)
+    stats = {'path': bundle_path, 'files': len(members), 'compressed': 0, 'reused': 0,
+             'bytes': sum(m.size for m in members), 'unchanged': False}
+
+    previous_manifest, previous_members = None, {}
+    if not force and os.path.exists(bundle_path):
+        try:
+            previous_manifest, previous_members = container.open_previous(bundle_path)
+        except Exception as e:   # any unreadable bundle is just rebuilt
+            print(f"⚠️  {bundle_path} cannot be read ({e}); rebuilding it from scratch")
+    if previous_manifest == manifest:
+        stats.update(unchanged=True, reused=len(members), size=os.path.getsize(bundle_path))
+        return stats
+
+    # Members of the old bundle are only worth reusing if they hold the same bytes compressed the same way
+    reusable = {}
+    if previous_manifest:
+        old = json.loads(previous_manifest)
+        if (old.get('format'), old.get('level')) == (fmt, level):
+            old_hashes = {f"{old['name']}/{entry['path']}": entry['sha256'] for entry in old['files']}
+            reusable = {m.name: previous_members[m.name] for m in members
+                        if old_hashes.get(m.name) == m.sha256 and m.name in previous_members}
+    plan = [(m, reusable.get(m.name)) for m in members]
+
+    os.makedirs(out_dir, exist_ok=True)
+    partial = bundle_path + '.partial'
+    previous = open(bundle_path, 'rb') if reusable else None
+    try:
+        with open(partial, 'wb') as out, ThreadPoolExecutor(max_workers=max(1, jobs)) as pool, \
+                profiling.stage('write'):
+            container.write(out, f"{root}/{MANIFEST_NAME}", container.compress(f"{root}/{MANIFEST_NAME}", manifest))
+            for member, locator, result in _in_order(pool, container, plan, 2 * max(1, jobs)):
+                if result is None:
+                    container.copy(out, member.name, previous, locator)
+                    stats['reused'] += 1
+                    continue
+                item, elapsed = result
+                container.write(out, member.name, item)
+                stats['compressed'] += 1
+                profiling.record_asset(member.path, elapsed, [(member.path, True, member.size)])
+            container.finish(out)
+    except BaseException:
+        if os.path.exists(partial):
+            os.unlink(partial)
+        raise
+    finally:
+        if previous is not None:
+            previous.close()
+    os.replace(partial, bundle_path)
+    stats['size'] = os.path.getsize(bundle_path)
+    profiling.note_output(bundle_path, stats['size'])
+    return stats
@@ -0,0 +1,79 @@
+"""
+Streaming writer for the generators' preview.html pages.
+
+A page is written chunk by chunk to a temporary file next to its target as
+the generator produces it, so memory stays flat however many assets the page
+lists. When the page is closed the temporary file replaces the old page only
+if the bytes differ, which leaves an unchanged preview's mtime alone.
+"""
+
+import os
+
+from riftkit.buildcache import note_output
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _same_bytes(path_a: str, path_b: str) -> bool:
+    """True if both files exist and hold identical bytes"""
+    try:
+        if os.path.getsize(path_a) != os.path.getsize(path_b):
+            return False
+        with open(path_a, 'rb') as a, open(path_b, 'rb') as b:
+            while True:
+                chunk = a.read(CHUNK_SIZE)
+                if chunk != b.read(CHUNK_SIZE):
+                    return False
+                if not chunk:
+                    return True
+    except OSError:
+        return False
+
+
+class PreviewWriter:
+    """Write-if-changed HTML page written incrementally.
+
+    Use as a context manager, or call close() once the last chunk is written.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.bytes_written = 0
+        self.changed = False
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(self.tmp_path, 'w', encoding='utf-8', newline='')
+
+    def write(self, text: str):
+        """Append a chunk of HTML to the page"""
+        self._file.write(text)
+
+    def close(self) -> bool:
+        """Finish the page, replacing the old one if it changed.
+
+        Returns True if the page on disk was rewritten.
+        """
+        self._file.close()
+        self.bytes_written = os.path.getsize(self.tmp_path)
+        self.changed = not _same_bytes(self.tmp_path, self.path)
+        if self.changed:
+            os.replace(self.tmp_path, self.path)
+        else:
+            os.remove(self.tmp_path)
+        note_output(self.path, self.changed, self.bytes_written)
+        return self.changed
+
+    def discard(self):
+        """Drop a half-written page and keep whatever was there before"""
+        self._file.close()
+        os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+        return False
@@ -0,0 +1,193 @@
+"""
+Header-only image probing with a sidecar cache.
+
+probe_image() reads just enough of a file to get its pixel dimensions. That
+is the IHDR chunk for PNG, the logical screen descriptor for GIF, the
+VP8/VP8L/VP8X header for WebP, and the first SOF marker for JPEG. Nothing
+is decoded. Unrecognised formats fall back to Pillow, whose Image.open is
+also lazy.
+
+probe_files() takes (path, stat) pairs, which os.scandir hands out without
+extra system calls, and probes them on a thread pool since the work is I/O
+bound. ProbeCache keeps the results in a JSON sidecar keyed by
+(path, size, mtime), so a re-run only opens files that are new or changed.
+"""
+
+import json
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+CACHE_NAME = '.probe-cache.json'
+CACHE_VERSION = 1
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+# JPEG start-of-frame markers carry the dimensions (DHT, JPG and DAC excluded)
+SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+@dataclass
+class Probe:
+    """What the header says about one image"""
+    path: str
+    size: int
+    mtime_ns: int
+    width: int = 0
+    height: int = 0
+    format: str = ''
+    error: str = ''
+
+
+# ==================== HEADER PARSERS ====================
+
+def _jpeg_size(f) -> Optional[Tuple[int, int]]:
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue  # standalone markers have no length
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in SOF_MARKERS:
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack('>HH', data[1:5])
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _read_header(path: str) -> Tuple[int, int, str]:
+    """(width, height, format) from the file header"""
+    with open(path, 'rb') as f:
+        head = f.read(32)
+        if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+            width, height = struct.unpack('>II', head[16:24])
+            return width, height, 'png'
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            width, height = struct.unpack('<HH', head[6:10])
+            return width, height, 'gif'
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            chunk = head[12:16]
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', head[26:30])
+                return width & 0x3FFF, height & 0x3FFF, 'webp'
+            if chunk == b'VP8L':
+                bits = struct.unpack('<I', head[21:25])[0]
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1, 'webp'
+            if chunk == b'VP8X':
+                width = int.from_bytes(head[24:27], 'little') + 1
+                height = int.from_bytes(head[27:30], 'little') + 1
+                return width, height, 'webp'
+        if head[:2] == b'\xff\xd8':
+            size = _jpeg_size(f)
+            if size:
+                return size[0], size[1], 'jpeg'
+
+    # Anything else: Pillow only parses the header until pixels are requested
+    from PIL import Image
+    with Image.open(path) as img:
+        return img.width, img.height, (img.format or '').lower()
+
+
+def probe_image(path: str, size: int, mtime_ns: int) -> Probe:
+    """Probe one file, recording any failure on the result instead of raising"""
+    probe = Probe(path, size, mtime_ns)
+    try:
+        probe.width, probe.height, probe.format = _read_header(path)
+    except Exception as e:
+        probe.error = str(e) or type(e).__name__
+    return probe
+
+
+# ==================== CACHE ====================
+
+class ProbeCache:
+    """JSON sidecar of probe results keyed by (path, size, mtime)"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.path = os.path.join(root, CACHE_NAME)
+        self.entries: Dict[str, list] = {}
+        self.dirty = False
+        self.hits = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, path: str, size: int, mtime_ns: int) -> Optional[Probe]:
+        entry = self.entries.get(os.path.relpath(path, self.root))
+        if entry is None or entry[0] != size or entry[1] != mtime_ns:
+            return None
+        self.hits += 1
+        return Probe(path, size, mtime_ns, *entry[2:])
+
+    def put(self, probe: Probe):
+        self.entries[os.path.relpath(probe.path, self.root)] = [
+            probe.size, probe.mtime_ns, probe.width, probe.height, probe.format, probe.error]
+        self.dirty = True
+
+    def save(self):
+        """Atomically write the cache back, dropping files that no longer exist"""
+        if not self.dirty:
+            return
+        self.entries = {rel: entry for rel, entry in self.entries.items()
+                        if os.path.exists(os.path.join(self.root, rel))}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'entries': self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+# ==================== PROBING ====================
+
+def scan_images(directory: str, extensions: Tuple[str, ...] = IMAGE_EXTENSIONS) -> Iterator[Tuple[str, os.stat_result]]:
+    """(path, stat) for the images directly inside directory, sorted by name"""
+    try:
+        entries = sorted(os.scandir(directory), key=lambda e: e.name)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_file() and entry.name.lower().endswith(extensions):
+            yield entry.path, entry.stat()
+
+
+def probe_files(files: Iterable[Tuple[str, os.stat_result]], cache: Optional[ProbeCache] = None,
+                workers: int = 16) -> List[Probe]:
+    """Probe files in input order, reusing cached results and threading the rest"""
+    files = list(files)
+    results: List[Optional[Probe]] = [None] * len(files)
+    todo = []
+    for i, (path, stat) in enumerate(files):
+        cached = cache.get(path, stat.st_size, stat.st_mtime_ns) if cache else None
+        if cached is not None:
+            results[i] = cached
+        else:
+            todo.append(i)
+
+    if todo:
+        def work(i):
+            path, stat = files[i]
+            return i, probe_image(path, stat.st_size, stat.st_mtime_ns)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for i, probe in pool.map(work, todo):
+                results[i] = probe
+                if cache is not None and not probe.error:
+                    cache.put(probe)
+    return results
@@ -0,0 +1,271 @@
+"""
+Opt-in profiling shared by every script: --profile, --cprofile, --tracemalloc.
+
+    parser = argparse.ArgumentParser(...)
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    with profiling.session(args):
+        remove_duplicates(...)
+
+Inside a session, code marks its phases with `with profiling.stage('hash'):`
+(stages nest, and a stage entered many times adds up), the build cache
+times every asset it builds, and every file written through the asset
+writer, a PreviewWriter or write_text is noted with its size. When the
+session ends it prints the slowest stages and assets and the largest
+outputs, and saves the full tables to .profile/<script>.json at the
+repository root. Outside a session the hooks cost a global lookup.
+Stages and asset() time the thread that opened the session; other threads
+(probe and placement pools) report through record_asset() and note_output().
+
+--cprofile runs cProfile over the session: the report lists the top
+functions and .profile/<script>.prof keeps the stats for pstats or
+snakeviz. --tracemalloc traces Python allocations: each stage gets its
+peak traced memory and the report lists the allocation sites still
+holding the most memory at exit. Work in
+pool worker processes is timed by wall clock as the parent sees it;
+cProfile and tracemalloc only see the parent.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROFILE_DIR = os.path.join(REPO_ROOT, '.profile')
+
+# Rows shown per table in the printed report (the JSON keeps them all)
+TOP = 15
+
+ACTIVE: Optional['Session'] = None
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Add the shared profiling options to a script's parser"""
+    group = parser.add_argument_group('profiling')
+    group.add_argument('--profile', action='store_true',
+                       help='time stages and assets, and report the slowest and the largest outputs at exit')
+    group.add_argument('--cprofile', action='store_true',
+                       help='--profile plus cProfile: top functions, stats saved to .profile/<script>.prof')
+    group.add_argument('--tracemalloc', action='store_true',
+                       help='--profile plus tracemalloc: peak memory per stage and the largest allocation sites')
+
+
+class _Frame:
+    """A stage being timed"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.peak = 0
+
+
+class Session:
+    """Timings and outputs collected while profiling one script run"""
+
+    def __init__(self, script: str, cprofile: bool = False, trace_memory: bool = False):
+        self.script = script
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.assets: Dict[str, Dict[str, float]] = {}
+        self.outputs: Dict[str, int] = {}
+        self.stack: List[_Frame] = []
+        self.thread = threading.get_ident()
+        self.trace_memory = trace_memory
+        self.profiler = None
+        if cprofile:
+            import cProfile
+            self.profiler = cProfile.Profile()
+        self.wall = self.cpu = 0.0
+        self.peak_memory = 0
+        self.top_allocations: List[Tuple[str, int, int]] = []
+
+    # ===== COLLECTING =====
+
+    def start(self):
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def stop(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.wall, self.cpu = time.perf_counter() - self.wall, time.process_time() - self.cpu
+        if self.trace_memory:
+            import tracemalloc
+            self._traced_peak()
+            stats = tracemalloc.take_snapshot().statistics('lineno')
+            self.top_allocations = [(str(stat.traceback), stat.size, stat.count) for stat in stats[:TOP]]
+            tracemalloc.stop()
+
+    def _traced_peak(self) -> int:
+        """Traced peak since the last reset, pushed into every open stage, then reset"""
+        import tracemalloc
+        peak = tracemalloc.get_traced_memory()[1]
+        self.peak_memory = max(self.peak_memory, peak)
+        for frame in self.stack:
+            frame.peak = max(frame.peak, peak)
+        tracemalloc.reset_peak()
+        return peak
+
+    def enter(self, name: str):
+        if self.trace_memory:
+            self._traced_peak()
+        self.stack.append(_Frame(' / '.join([frame.name for frame in self.stack] + [name])))
+
+    def exit(self):
+        if self.trace_memory:
+            self._traced_peak()
+        frame = self.stack.pop()
+        entry = self.stages.setdefault(frame.name, {'wall': 0.0, 'cpu': 0.0, 'calls': 0, 'peak': 0})
+        entry['wall'] += time.perf_counter() - frame.wall
+        entry['cpu'] += time.process_time() - frame.cpu
+        entry['calls'] += 1
+        entry['peak'] = max(entry['peak'], frame.peak)
+
+    def record_asset(self, name: str, wall: float, cpu: Optional[float],
+                     outputs: Iterable[Tuple[str, bool, int]] = ()):
+        """Time of one asset, listed under its first output file if it wrote any
+        (cache keys of parameterized methods end in a digest); cpu is None for
+        assets timed inside a pool worker"""
+        outputs = list(outputs)
+        for path, _, size in outputs:
+            self.outputs[path] = size
+        if outputs:
+            name = outputs[0][0] + (f' (+{len(outputs) - 1} more)' if len(outputs) > 1 else '')
+        size = sum(size for _, _, size in outputs)
+        entry = self.assets.setdefault(name, {'wall': 0.0, 'cpu': 0.0, 'bytes': 0})
+        entry['wall'] += wall
+        entry['cpu'] = None if cpu is None or entry['cpu'] is None else entry['cpu'] + cpu
+        entry['bytes'] += size
+
+    # ===== REPORTING =====
+
+    def tables(self) -> Dict[str, list]:
+        """Stages and assets slowest first, outputs largest first"""
+        return {
+            'stages': sorted(([name, *entry.values()] for name, entry in self.stages.items()),
+                             key=lambda row: -row[1]),
+            'assets': sorted(([name, *entry.values()] for name, entry in self.assets.items()),
+                             key=lambda row: -row[1]),
+            'outputs': sorted(([path, size] for path, size in self.outputs.items()),
+                              key=lambda row: -row[1]),
+        }
+
+    def save(self, directory: str = PROFILE_DIR) -> str:
+        """Write the tables (and cProfile stats) under directory; returns the JSON path"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{self.script}.json')
+        report = {'script': self.script, 'argv': sys.argv[1:], 'wall': self.wall, 'cpu': self.cpu,
+                  'columns': {'stages': ['stage', 'wall', 'cpu', 'calls', 'peak'],
+                              'assets': ['asset', 'wall', 'cpu', 'bytes'],
+                              'outputs': ['path', 'bytes']},
+                  **self.tables()}
+        if self.top_allocations:
+            report['peak_memory'] = self.peak_memory
+            report['allocations'] = self.top_allocations
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+        if self.profiler is not None:
+            self.profiler.dump_stats(os.path.join(directory, f'{self.script}.prof'))
+        return path
+
+    def print_report(self):
+        tables = self.tables()
+        print("\n" + "=" * 60)
+        print(f"⏱  PROFILE: {self.script} — {self.wall:.2f}s wall, {self.cpu:.2f}s CPU")
+        print("=" * 60)
+        if tables['stages']:
+            print(f"\nSlowest stages ({min(TOP, len(tables['stages']))} of {len(tables['stages'])}):")
+            for name, wall, cpu, calls, peak in tables['stages'][:TOP]:
+                memory = f" {peak / 1024 / 1024:7.1f}MB" if self.trace_memory else ''
+                print(f"  {wall:8.3f}s {cpu:8.3f}s cpu {calls:6}×{memory}  {name}")
+        if tables['assets']:
+            print(f"\nSlowest assets ({min(TOP, len(tables['assets']))} of {len(tables['assets'])}):")
+            for name, wall, cpu, size in tables['assets'][:TOP]:
+                cpu_text = f"{cpu:8.3f}s cpu" if cpu is not None else f"{'—':>9} cpu"
+                print(f"  {wall * 1000:9.1f}ms {cpu_text} {size / 1024:9.1f}KB  {name}")
+        if tables['outputs']:
+            total = sum(size for _, size in tables['outputs'])
+            print(f"\nLargest outputs ({min(TOP, len(tables['outputs']))} of {len(tables['outputs'])}, "
+                  f"{total / 1024:.1f}KB in all):")
+            for path, size in tables['outputs'][:TOP]:
+                print(f"  {size / 1024:9.1f}KB  {os.path.relpath(path)}")
+        if self.profiler is not None:
+            import pstats
+            print("\nTop functions by cumulative time:")
+            pstats.Stats(self.profiler, stream=sys.stdout).sort_stats('cumulative').print_stats(TOP)
+        if self.top_allocations:
+            print(f"\nLargest allocation sites still held at exit (peak traced "
+                  f"{self.peak_memory / 1024 / 1024:.1f}MB):")
+            for site, size, count in self.top_allocations:
+                print(f"  {size / 1024:9.1f}KB {count:7} blocks  {site}")
+
+
+# ==================== HOOKS ====================
+
+@contextmanager
+def session(args: argparse.Namespace, script: Optional[str] = None) -> Iterator[Optional[Session]]:
+    """Profile the block if args asked for it, then print and save the report"""
+    global ACTIVE
+    cprofile, trace_memory = getattr(args, 'cprofile', False), getattr(args, 'tracemalloc', False)
+    if not (getattr(args, 'profile', False) or cprofile or trace_memory) or ACTIVE is not None:
+        yield ACTIVE
+        return
+    script = script or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    ACTIVE = Session(script, cprofile, trace_memory)
+    ACTIVE.start()
+    try:
+        yield ACTIVE
+    finally:
+        current, ACTIVE = ACTIVE, None
+        current.stop()
+        current.print_report()
+        print(f"\n📄 Profile: {current.save()}")
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a phase of the work under name (nested inside any enclosing stage)"""
+    current = ACTIVE
+    if current is None or threading.get_ident() != current.thread:
+        yield
+        return
+    current.enter(name)
+    try:
+        yield
+    finally:
+        current.exit()
+
+
+@contextmanager
+def asset(name: str, outputs: List[Tuple[str, bool, int]]) -> Iterator[None]:
+    """Time the build of one asset; outputs is its recording() list, read at the end"""
+    current = ACTIVE
+    if current is None or threading.get_ident() != current.thread:
+        yield
+        return
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        current.record_asset(name, time.perf_counter() - wall, time.process_time() - cpu, outputs)
+
+
+def record_asset(name: str, wall: float, outputs: Iterable[Tuple[str, bool, int]] = ()):
+    """Report an asset made by a pool worker or thread, with the wall time it took there"""
+    if ACTIVE is not None:
+        ACTIVE.record_asset(name, wall, None, outputs)
+
+
+def note_output(path: str, size: int):
+    """Note a file written (or confirmed unchanged) and its size"""
+    if ACTIVE is not None:
+        ACTIVE.outputs[path] = size
@@ -0,0 +1,215 @@
+"""
+Rasterize generated SVGs to PNG, PDF and multi-resolution ICO.
+
+Browsers want favicon.ico, app stores want PNG and printers want PDF, but
+the generators only draw SVG. rasterize() takes a list of RasterJobs and
+renders them with whichever local renderer is installed, in order of
+preference:
+
+    cairosvg       PNG, PDF   pip install cairosvg (needs the cairo library)
+    rsvg-convert   PNG, PDF   librsvg's command-line tool
+    resvg_py       PNG        pip install resvg-py (self-contained wheel)
+
+Each format goes to the first renderer that can produce it. ICO files are
+assembled here from PNG frames, one per size (PNG-compressed entries, which
+every browser and Windows since Vista read), so any PNG renderer makes them.
+
+Rendered frames are kept in a content-addressed cache (.render-cache/ in
+the output directory) keyed by the SVG bytes, format, size and renderer.
+A rerun renders only SVGs whose bytes changed; everything else is copied
+out of the cache. Frames that do need rendering go to a process pool in
+one batch, so a 16-256px sweep is one pass rather than one call per size.
+"""
+
+import hashlib
+import os
+import shutil
+import struct
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from riftkit.engine import write_asset
+from riftkit.gallery import svg_dimensions
+
+CACHE_DIR = '.render-cache'
+
+# Renderer -> formats it can write, in order of preference
+RENDERERS = {
+    'cairosvg': ('png', 'pdf'),
+    'rsvg-convert': ('png', 'pdf'),
+    'resvg_py': ('png',),
+}
+
+ICO_HEADER = struct.Struct('<HHH')
+ICO_ENTRY = struct.Struct('<BBBBHHII')
+
+
+class RasterJob(NamedTuple):
+    output: str                             # .png, .pdf or .ico path
+    frames: Tuple[Tuple[str, int, int], ...]  # (svg path, width, height); one per size for .ico
+
+    @property
+    def format(self) -> str:
+        return os.path.splitext(self.output)[1][1:].lower()
+
+
+def raster_job(svg_path: str, output: str, width: Optional[int] = None,
+               height: Optional[int] = None) -> RasterJob:
+    """Render svg_path to output (.png or .pdf), at its own size unless one is given"""
+    if width is None or height is None:
+        svg_width, svg_height = svg_dimensions(svg_path)
+        if width is None and height is None:
+            width, height = round(svg_width), round(svg_height)
+        elif width is None:
+            width = round(svg_width * height / svg_height)
+        else:
+            height = round(svg_height * width / svg_width)
+    return RasterJob(output, ((svg_path, width, height),))
+
+
+def ico_job(output: str, svg_sizes: Sequence[Tuple[str, int]]) -> RasterJob:
+    """One .ico holding a square frame per (svg path, size), each drawn from its own SVG"""
+    return RasterJob(output, tuple((svg_path, size, size) for svg_path, size in svg_sizes))
+
+
+def available_renderers() -> List[str]:
+    """Renderers in RENDERERS order that are installed"""
+    found = []
+    for name in RENDERERS:
+        if name == 'rsvg-convert':
+            if shutil.which(name):
+                found.append(name)
+            continue
+        try:
+            __import__(name)
+        except (ImportError, OSError):  # cairosvg raises OSError when libcairo is missing
+            continue
+        found.append(name)
+    return found
+
+
+def pick_renderers(formats) -> Dict[str, str]:
+    """format -> renderer for every format some installed renderer can write.
+
+    Raises ImportError when no renderer is installed at all.
+    """
+    installed = available_renderers()
+    if not installed:
+        raise ImportError('no SVG renderer installed (cairosvg, rsvg-convert or resvg_py)')
+    chosen = {}
+    for fmt in formats:
+        for name in installed:
+            if fmt in RENDERERS[name]:
+                chosen[fmt] = name
+                break
+    return chosen
+
+
+def _render(args: Tuple[str, bytes, str, int, int]) -> bytes:
+    """Render one frame; runs in a worker process"""
+    renderer, svg, fmt, width, height = args
+    if renderer == 'cairosvg':
+        import cairosvg
+        convert = cairosvg.svg2pdf if fmt == 'pdf' else cairosvg.svg2png
+        return convert(bytestring=svg, output_width=width, output_height=height)
+    if renderer == 'rsvg-convert':
+        return subprocess.run(['rsvg-convert', '-f', fmt, '-w', str(width), '-h', str(height)],
+                              input=svg, stdout=subprocess.PIPE, check=True).stdout
+    import resvg_py
+    return bytes(resvg_py.svg_to_bytes(svg_string=svg.decode('utf-8'), width=width, height=height))
+
+
+def pack_ico(frames: Sequence[Tuple[int, int, bytes]]) -> bytes:
+    """ICO file from (width, height, png bytes) frames, smallest first"""
+    frames = sorted(frames)
+    offset = ICO_HEADER.size + ICO_ENTRY.size * len(frames)
+    entries, images = [], []
+    for width, height, png in frames:
+        # 0 means 256 in the one-byte size fields
+        entries.append(ICO_ENTRY.pack(width % 256, height % 256, 0, 0, 1, 32, len(png), offset))
+        images.append(png)
+        offset += len(png)
+    return ICO_HEADER.pack(0, 1, len(frames)) + b''.join(entries) + b''.join(images)
+
+
+class RenderCache:
+    """Rendered frames on disk, one file per frame key"""
+
+    def __init__(self, root: str):
+        self.dir = os.path.join(root, CACHE_DIR)
+
+    @staticmethod
+    def key(svg: bytes, fmt: str, width: int, height: int, renderer: str) -> str:
+        h = hashlib.blake2b(svg, digest_size=16)
+        h.update(f"\0{fmt}\0{width}x{height}\0{renderer}".encode('utf-8'))
+        return f"{h.hexdigest()}.{fmt}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.dir, key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes):
+        os.makedirs(self.dir, exist_ok=True)
+        path = os.path.join(self.dir, key)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(path + '.tmp', path)
+
+
+def rasterize(jobs: Sequence[RasterJob], root: str, workers: int = 1) -> Dict[str, object]:
+    """Render jobs and write their outputs through the shared asset writer.
+
+    root is the generator's output directory: output labels are relative to
+    it and the render cache lives in it. The SVGs must already be on disk
+    (flush the writer first). Returns counts of rendered and cached frames
+    and, per format with no installed renderer, how many outputs were
+    skipped. Raises ImportError when no renderer is installed.
+    """
+    renderers = pick_renderers({'png' if job.format == 'ico' else job.format for job in jobs})
+    cache = RenderCache(root)
+    stats: Dict[str, object] = {'rendered': 0, 'cached': 0, 'skipped': {}}
+
+    svgs: Dict[str, bytes] = {}
+    frames: Dict[Tuple[str, str, int, int], str] = {}   # (svg path, fmt, w, h) -> cache key
+    todo: Dict[str, Tuple[str, bytes, str, int, int]] = {}
+    ready = []
+    for job in jobs:
+        fmt = 'png' if job.format == 'ico' else job.format
+        renderer = renderers.get(fmt)
+        if renderer is None:
+            stats['skipped'][job.format] = stats['skipped'].get(job.format, 0) + 1
+            continue
+        for svg_path, width, height in job.frames:
+            if svg_path not in svgs:
+                with open(svg_path, 'rb') as f:
+                    svgs[svg_path] = f.read()
+            key = cache.key(svgs[svg_path], fmt, width, height, renderer)
+            frames[(svg_path, fmt, width, height)] = key
+            if key not in todo and cache.get(key) is None:
+                todo[key] = (renderer, svgs[svg_path], fmt, width, height)
+        ready.append((job, fmt))
+
+    keys = list(todo)
+    if workers > 1 and len(keys) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(_render, [todo[key] for key in keys]))
+    else:
+        rendered = [_render(todo[key]) for key in keys]
+    for key, data in zip(keys, rendered):
+        cache.put(key, data)
+    stats['rendered'] = len(keys)
+    stats['cached'] = len(set(frames.values())) - len(keys)
+
+    for job, fmt in ready:
+        data = [cache.get(frames[(svg_path, fmt, width, height)])
+                for svg_path, width, height in job.frames]
+        if job.format == 'ico':
+            content = pack_ico([(width, height, png) for (_, width, height), png in zip(job.frames, data)])
+        else:
+            content = data[0]
+        write_asset(job.output, content, os.path.relpath(job.output, root))
+    return stats
@@ -0,0 +1,207 @@
+"""
+Responsive WebP/AVIF derivatives of the bike photos, for srcset.
+
+The product pages load the supplier JPEGs in public/bikes at full size,
+often 3000px and several MB each. build_derivatives() encodes every photo
+at a ladder of widths in each modern format and returns a manifest the
+frontend can turn into <picture>/<source srcset> markup:
+
+    {"/bikes/EM19/image-1.jpg": {
+        "width": 3000, "height": 2000,
+        "sources": {"avif": {"320": "/bikes-srcset/EM19/image-1.3f9c2a1b7e-320w.avif", ...},
+                    "webp": {...}}}}
+
+Derivative names include a digest of the source bytes and the encoder
+settings. A photo whose derivatives already exist under those names is not
+decoded at all, and the names can be served with an immutable cache
+header. Widths above the photo's own width are never produced; the
+photo's own width stands in for the first one above it.
+
+Encoding runs on a process pool, one task per photo, so each photo is
+decoded and EXIF-rotated once for all of its derivatives. Needs Pillow
+with WebP support. AVIF comes from Pillow 11.3+ or the pillow-avif-plugin
+package, and is skipped with a warning when neither is there.
+"""
+
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from riftkit import profiling
+from riftkit.dedupe import file_digest
+from riftkit.journal import PARTIAL_SUFFIX
+
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+WIDTHS = (320, 640, 960, 1280, 1920)
+FORMATS = ('avif', 'webp')
+ENCODER_OPTIONS = {
+    'webp': {'quality': 80, 'method': 6},
+    'avif': {'quality': 60, 'speed': 6},
+}
+DIGEST_CHARS = 10
+
+
+def available_formats(formats: Sequence[str] = FORMATS) -> List[str]:
+    """The requested formats this Pillow can encode"""
+    from PIL import features
+
+    if 'avif' in formats and not features.check('avif'):
+        try:
+            import pillow_avif  # noqa: F401 - registers the AVIF plugin
+        except ImportError:
+            pass
+    supported = []
+    for fmt in formats:
+        try:
+            ok = features.check(fmt)
+        except ValueError:
+            from PIL import Image
+            ok = fmt.upper() in Image.SAVE
+        if ok:
+            supported.append(fmt)
+    return supported
+
+
+def ladder(width: int, widths: Sequence[int] = WIDTHS) -> List[int]:
+    """Target widths for a photo width pixels wide, without upscaling"""
+    targets = [w for w in widths if w < width]
+    if not targets or targets[-1] < max(widths):
+        targets.append(min(width, max(widths)))
+    return targets
+
+
+def settings_key(widths: Sequence[int], formats: Sequence[str]) -> bytes:
+    """Encoder settings that change the output, for the derivative digest"""
+    return repr((tuple(widths), tuple(formats),
+                 sorted((f, sorted(ENCODER_OPTIONS[f].items())) for f in formats))).encode()
+
+
+def derivative_name(rel_path: str, digest: str, width: int, fmt: str) -> str:
+    stem = os.path.splitext(rel_path)[0]
+    return f"{stem}.{digest}-{width}w.{fmt}"
+
+
+def _encode_one(task: Tuple) -> Tuple[str, Optional[Dict], Optional[str], float]:
+    """Decode one photo and write all of its missing derivatives; the last
+    item is the time that took"""
+    rel_path, source, out_dir, digest, widths, formats = task
+    start = time.perf_counter()
+    from PIL import Image, ImageOps
+
+    partial = None
+    try:
+        with Image.open(source) as img:
+            img = ImageOps.exif_transpose(img)
+            img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+            width, height = img.size
+            outputs = {fmt: {} for fmt in formats}
+            for target in ladder(width, widths):
+                resized = None
+                for fmt in formats:
+                    name = derivative_name(rel_path, digest, target, fmt)
+                    outputs[fmt][target] = name
+                    path = os.path.join(out_dir, name)
+                    if os.path.exists(path):
+                        continue
+                    if resized is None:
+                        size = (target, max(1, round(height * target / width)))
+                        resized = img if size == img.size else img.resize(size, Image.LANCZOS)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    partial = path + PARTIAL_SUFFIX
+                    resized.save(partial, fmt.upper(), **ENCODER_OPTIONS[fmt])
+                    os.replace(partial, path)
+                    partial = None
+    except Exception as e:
+        if partial is not None and os.path.lexists(partial):
+            os.unlink(partial)
+        return rel_path, None, str(e), time.perf_counter() - start
+    return rel_path, {'width': width, 'height': height, 'outputs': outputs}, None, time.perf_counter() - start
+
+
+def build_derivatives(source_dir: str, out_dir: str, url_prefix: str, out_url_prefix: str,
+                      previous: Optional[Dict] = None, widths: Sequence[int] = WIDTHS,
+                      formats: Sequence[str] = FORMATS, jobs: int = 1) -> Tuple[Dict, Dict]:
+    """Encode every photo under source_dir into out_dir.
+
+    previous is the manifest from the last run; a photo whose digest and
+    derivatives are unchanged is taken from it without decoding. Returns
+    (manifest, stats) and removes derivatives no photo refers to any more.
+    """
+    import PIL  # noqa: F401 - fail early, not once per photo inside the workers
+
+    previous = previous or {}
+    settings = settings_key(widths, formats)
+    out_abs = os.path.abspath(out_dir)
+    manifest: Dict[str, Dict] = {}
+    tasks = []
+    stats = {'photos': 0, 'cached': 0, 'encoded': 0, 'errors': []}
+
+    for dirpath, dirnames, filenames in os.walk(source_dir):
+        dirnames[:] = sorted(d for d in dirnames
+                             if os.path.abspath(os.path.join(dirpath, d)) != out_abs)
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(SOURCE_EXTENSIONS) or filename.startswith('.'):
+                continue
+            source = os.path.join(dirpath, filename)
+            rel_path = os.path.relpath(source, source_dir).replace(os.sep, '/')
+            url = f"{url_prefix}/{rel_path}"
+            stats['photos'] += 1
+
+            h = hashlib.blake2b(file_digest(source).encode() + settings, digest_size=8)
+            digest = h.hexdigest()[:DIGEST_CHARS]
+            entry = previous.get(url)
+            if entry and entry.get('digest') == digest and all(
+                    os.path.exists(os.path.join(out_dir, _rel(out_url_prefix, path)))
+                    for sources in entry['sources'].values() for path in sources.values()):
+                manifest[url] = entry
+                stats['cached'] += 1
+                continue
+            tasks.append((rel_path, source, out_dir, digest, tuple(widths), tuple(formats)))
+
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_encode_one, tasks))
+    else:
+        results = [_encode_one(task) for task in tasks]
+
+    digests = {task[0]: task[3] for task in tasks}
+    for rel_path, result, error, elapsed in results:
+        profiling.record_asset(os.path.join(source_dir, rel_path), elapsed)
+        if error:
+            stats['errors'].append((rel_path, error))
+            continue
+        stats['encoded'] += 1
+        manifest[f"{url_prefix}/{rel_path}"] = {
+            'digest': digests[rel_path],
+            'width': result['width'],
+            'height': result['height'],
+            'sources': {fmt: {str(w): f"{out_url_prefix}/{name}" for w, name in sorted(names.items())}
+                        for fmt, names in result['outputs'].items()},
+        }
+
+    stats['removed'] = _remove_stale(out_dir, out_url_prefix, manifest)
+    return dict(sorted(manifest.items())), stats
+
+
+def _rel(out_url_prefix: str, url: str) -> str:
+    return url[len(out_url_prefix) + 1:]
+
+
+def _remove_stale(out_dir: str, out_url_prefix: str, manifest: Dict) -> int:
+    """Delete derivatives in out_dir that the manifest no longer lists, and
+    any .partial file an interrupted encode left behind"""
+    keep = {os.path.normpath(os.path.join(out_dir, _rel(out_url_prefix, path)))
+            for entry in manifest.values()
+            for sources in entry['sources'].values() for path in sources.values()}
+    removed = 0
+    for dirpath, _, filenames in os.walk(out_dir):
+        for filename in filenames:
+            if not filename.endswith(tuple('.' + fmt for fmt in ENCODER_OPTIONS) + (PARTIAL_SUFFIX,)):
+                continue
+            path = os.path.normpath(os.path.join(dirpath, filename))
+            if path not in keep:
+                os.unlink(path)
+                removed += 1
+    return removed
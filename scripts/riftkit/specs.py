@@ -0,0 +1,353 @@
+"""
+Bike specifications from supplier sheets, for lib/bikes-data.ts.
+
+Suppliers send one `<model>-Specifications.xlsx` per bike: a first sheet
+of (key, value) rows such as ("Frame", "high modulus Carbon fiber, ...").
+Our own spec notes live in requirements2/*.txt: the bike's name on the
+first line, then `Key: value` lines. Both become a flat dict of spec
+fields with normalized keys (the sheets spell the same field "Handelbar
+Sets", "Tyre" or "Tire" depending on who filled them in) and tidied
+values (full-width commas, runs of spaces).
+
+Sheets are read with openpyxl in read-only mode, which streams rows
+instead of loading the workbook. SpecCache remembers each source's BLAKE2b
+digest and parsed result, so a rerun only parses sources whose bytes
+changed; parse_sources() spreads the rest over a process pool.
+
+lib/bikes-data.ts is the JSON that scripts/export-bikes.ts writes, with
+each bike's `specifications` a JSON string inside it. load_bikes() and
+render_bikes() read and write it byte-for-byte the way export-bikes.ts
+does, so an unchanged bike produces no diff.
+"""
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from riftkit.dedupe import file_digest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CACHE_PATH = REPO_ROOT / '.spec-cache.json'
+CACHE_VERSION = 1
+DATA_HEADER = 'export const initialBikes = '
+
+SHEET_SUFFIX = '-specifications'
+TEXT_EXTENSIONS = ('.txt',)
+SHEET_EXTENSIONS = ('.xlsx',)
+
+# Bookkeeping fields in `specifications` that do not come from a sheet
+META_KEYS = ('model', 'specFile', 'images', 'specSheetUrl')
+
+# Spellings seen in supplier sheets -> the key we publish (matched lowercased)
+KEY_ALIASES = {
+    'handelbar sets': 'Handlebar Sets',
+    'handelbar set': 'Handlebar Sets',
+    'handlebar set': 'Handlebar Sets',
+    'handlebar': 'Handlebar Sets',
+    'tyre': 'Tire',
+    'tyres': 'Tire',
+    'tires': 'Tire',
+    'hub': 'Hubs',
+    'head set': 'Head Sets',
+    'headset': 'Head Sets',
+    'headsets': 'Head Sets',
+    'derailleur lever': 'Derailleur Handle',
+    'shift lever': 'Derailleur Handle',
+    'shifters': 'Derailleur Handle',
+    'frame height': 'Frame Size',
+    'crankset': 'Cranksets',
+    'cassette': 'Cassettes',
+    'seatpost': 'Seat Post',
+    'colour': 'Bike Color',
+    'color': 'Bike Color',
+    'bike colour': 'Bike Color',
+    'weight': 'Net Weight',
+    'accessory': 'Accessories',
+}
+
+_SPACES = re.compile(r'\s+')
+_FULL_WIDTH = str.maketrans({'，': ', ', '；': '; ', '：': ': ', '（': '(', '）': ')'})
+
+
+class SpecSource(NamedTuple):
+    path: str
+    title: str                  # model for sheets, bike name for text notes
+    specs: Dict[str, str]
+    digest: Optional[str]
+    error: Optional[str] = None
+
+    @property
+    def is_sheet(self) -> bool:
+        return self.path.lower().endswith(SHEET_EXTENSIONS)
+
+
+def normalize_key(key: str) -> str:
+    """Published name of a sheet key"""
+    key = _SPACES.sub(' ', key.translate(_FULL_WIDTH)).strip().rstrip(':').strip()
+    return KEY_ALIASES.get(key.lower(), key)
+
+
+def normalize_value(value) -> str:
+    """Cell value as tidy text; whole-number floats lose their .0"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return _SPACES.sub(' ', str(value).translate(_FULL_WIDTH)).strip()
+
+
+def rows_to_specs(rows: Iterable[Sequence]) -> Dict[str, str]:
+    """Spec dict from (key, value, ...) rows.
+
+    Rows without a value are section headings and are skipped. A value
+    without a key continues the row above it (suppliers put "Manual+Warranty
+    card" under Accessories that way).
+    """
+    specs: Dict[str, str] = {}
+    last_key = None
+    for row in rows:
+        key = normalize_value(row[0]) if len(row) > 0 and row[0] is not None else ''
+        value = normalize_value(row[1]) if len(row) > 1 and row[1] is not None else ''
+        if not value:
+            continue
+        if not key:
+            if last_key:
+                specs[last_key] = f"{specs[last_key]}; {value}"
+            continue
+        key = normalize_key(key)
+        specs[key] = f"{specs[key]}; {value}" if key in specs else value
+        last_key = key
+    return specs
+
+
+def sheet_model(path: str) -> str:
+    """Model named by a sheet's file name: `CYCLONE-3rd (105 big)-Specifications.xlsx` -> `CYCLONE-3rd (105 big)`"""
+    stem = Path(path).stem
+    if stem.lower().endswith(SHEET_SUFFIX):
+        stem = stem[:-len(SHEET_SUFFIX)]
+    return stem.strip()
+
+
+def read_sheet(path: str) -> Tuple[str, Dict[str, str]]:
+    """(model, specs) from the first sheet of a workbook"""
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        specs = rows_to_specs(workbook.worksheets[0].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+    return sheet_model(path), specs
+
+
+def read_text(path: str) -> Tuple[str, Dict[str, str]]:
+    """(bike name, specs) from a text note: the name, then `Key: value` or tab-separated lines"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        lines = [line.strip() for line in f]
+    lines = [line for line in lines if line]
+    if not lines:
+        return '', {}
+    rows = []
+    for line in lines[1:]:
+        key, sep, value = line.partition('\t')
+        if not sep:
+            key, sep, value = line.translate(_FULL_WIDTH).partition(':')
+        rows.append((key, value) if sep else ('', line))
+    return lines[0], rows_to_specs(rows)
+
+
+def _parse_one(args: Tuple[str, Optional[str]]) -> SpecSource:
+    path, digest = args
+    try:
+        title, specs = read_sheet(path) if path.lower().endswith(SHEET_EXTENSIONS) else read_text(path)
+    except Exception as e:  # a corrupt sheet should not stop the others
+        return SpecSource(path, sheet_model(path), {}, digest, str(e))
+    return SpecSource(path, title, specs, digest)
+
+
+def find_sources(paths: Iterable) -> List[str]:
+    """Spec sheets and text notes among paths, looking inside folders (not recursively)"""
+    found = []
+    for path in map(str, paths):
+        if os.path.isdir(path):
+            names = sorted(os.listdir(path))
+            found.extend(os.path.join(path, name) for name in names
+                         if name.lower().endswith(SHEET_EXTENSIONS + TEXT_EXTENSIONS)
+                         and not name.startswith(('.', '~$')))
+        elif os.path.isfile(path):
+            found.append(path)
+    return [os.path.abspath(path) for path in found]
+
+
+class SpecCache:
+    """Parsed sources by path, reused while size/mtime or the digest are unchanged"""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = str(path)
+        self.entries: Dict[str, dict] = {}
+        self.dirty = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data.get('sources', {})
+        except (OSError, ValueError):
+            pass
+
+    def lookup(self, path: str) -> Tuple[Optional[SpecSource], Optional[str]]:
+        """(cached source, digest); the digest is only computed when the stat changed"""
+        entry = self.entries.get(path)
+        stat = os.stat(path)
+        if entry and entry['stat'] == [stat.st_size, stat.st_mtime_ns]:
+            return SpecSource(path, entry['title'], entry['specs'], entry['digest']), entry['digest']
+        digest = file_digest(path)
+        if entry and entry['digest'] == digest:
+            entry['stat'] = [stat.st_size, stat.st_mtime_ns]
+            self.dirty = True
+            return SpecSource(path, entry['title'], entry['specs'], digest), digest
+        return None, digest
+
+    def store(self, source: SpecSource):
+        if source.error:
+            return
+        stat = os.stat(source.path)
+        self.entries[source.path] = {'stat': [stat.st_size, stat.st_mtime_ns], 'digest': source.digest,
+                                     'title': source.title, 'specs': source.specs}
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        with open(self.path, 'w', encoding='utf-8') as f:
+            # Not sort_keys: the order of each source's specs is the order they are published in
+            json.dump({'version': CACHE_VERSION, 'sources': self.entries}, f, indent=1,
+                      ensure_ascii=False)
+        self.dirty = False
+
+
+def parse_sources(paths: List[str], cache: Optional[SpecCache] = None,
+                  jobs: int = 1) -> Tuple[List[SpecSource], int]:
+    """(sources in the order of paths, how many were parsed rather than cached)"""
+    results: Dict[str, SpecSource] = {}
+    work = []
+    for path in paths:
+        cached, digest = cache.lookup(path) if cache else (None, file_digest(path))
+        if cached:
+            results[path] = cached
+        else:
+            work.append((path, digest))
+    if any(path.lower().endswith(SHEET_EXTENSIONS) for path, _ in work):
+        import openpyxl  # noqa: F401 - fail early, not once per sheet inside the workers
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            parsed = list(pool.map(_parse_one, work))
+    else:
+        parsed = [_parse_one(item) for item in work]
+    for source in parsed:
+        results[source.path] = source
+        if cache:
+            cache.store(source)
+    return [results[path] for path in paths], len(work)
+
+
+# ---- lib/bikes-data.ts -------------------------------------------------
+
+def load_bikes(path) -> Tuple[str, List[dict]]:
+    """(comment header, bikes) from a bikes-data.ts file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    header, found, body = text.partition(DATA_HEADER)
+    if not found:
+        raise ValueError(f"{path} has no `{DATA_HEADER.strip()}`")
+    return header, json.loads(body.strip().rstrip(';'))
+
+
+def render_bikes(header: str, bikes: List[dict]) -> str:
+    """bikes-data.ts text, formatted the way export-bikes.ts writes it"""
+    return f"{header}{DATA_HEADER}{json.dumps(bikes, indent=2, ensure_ascii=False)};\n"
+
+
+def encode_specs(specs: dict) -> str:
+    """`specifications` column text, as JSON.stringify would write it"""
+    return json.dumps(specs, separators=(',', ':'), ensure_ascii=False)
+
+
+def bike_model(title: str) -> str:
+    """Published model for a supplier model name: `CYCLONE-3rd (105 big)` -> `CYCLONE-3rd`"""
+    return title.split(' (')[0].strip()
+
+
+def model_images(public_dir, model: str) -> List[str]:
+    """/bikes/... URLs of the images directly in public/bikes/<model>"""
+    folder = Path(public_dir) / model
+    if not folder.is_dir():
+        return []
+    return [f"/bikes/{model}/{p.name}" for p in sorted(folder.iterdir())
+            if p.is_file() and p.suffix.lower() in ('.jpg', '.jpeg', '.png', '.webp')]
+
+
+def merge_specs(bikes: List[dict], sources: List[SpecSource], public_dir,
+                add_new: bool = False) -> Tuple[List[str], List[str], List[str]]:
+    """Rewrite the specifications of bikes that have a source.
+
+    Sheets match a bike by model, text notes by name. A bike keeps its
+    META_KEYS; every other spec field is replaced by the source's. Sources
+    without any spec rows leave their bike alone.
+
+    A sheet for a model with no bike is only added when add_new is set: the
+    new bike has a placeholder name, no price and no category, and
+    bikes-data.ts is the storefront's fallback catalogue. Returns the names
+    of the updated and the added bikes, and the models of new sheets left out.
+    """
+    by_model, by_name = {}, {}
+    for bike in bikes:
+        try:
+            specs = json.loads(bike.get('specifications') or '{}')
+        except ValueError:
+            specs = {}
+        if specs.get('model'):
+            by_model[specs['model']] = (bike, specs)
+        by_name[bike['name'].lower()] = (bike, specs)
+
+    updated, added, new_models = [], [], []
+    for source in sources:
+        if source.error or not source.specs:
+            continue
+        model = bike_model(source.title) if source.is_sheet else None
+        match = by_model.get(model) if source.is_sheet else by_name.get(source.title.lower())
+        if match is None:
+            if not source.is_sheet:
+                continue
+            if not add_new:
+                if model not in new_models:
+                    new_models.append(model)
+                continue
+            images = model_images(public_dir, model)
+            bike = {
+                'id': max((b['id'] for b in bikes), default=0) + 1,
+                'name': f"RIFT {model}",
+                'description': '',
+                'basePrice': 0,
+                'imageUrl': images[0] if images else None,
+                'videoUrl': None,
+                'specifications': encode_specs({'model': model, 'specFile': source.path,
+                                                'images': images, **source.specs}),
+                'category': 'Uncategorized',
+                'createdAt': time.strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            bikes.append(bike)
+            by_model[model] = (bike, json.loads(bike['specifications']))
+            added.append(bike['name'])
+            continue
+
+        bike, old_specs = match
+        specs = {key: old_specs[key] for key in META_KEYS if key in old_specs}
+        if source.is_sheet:
+            specs['specFile'] = source.path
+        specs.update(source.specs)
+        text = encode_specs(specs)
+        if text != bike['specifications']:
+            bike['specifications'] = text
+            updated.append(bike['name'])
+    return updated, added, new_models
@@ -0,0 +1,200 @@
+"""
+Sprite sheet for preview pages that inline many SVGs.
+
+Inlining complete SVG documents repeats every shared gradient, filter and
+rift icon once per asset. SpriteSheet pulls them out instead:
+
+- every <defs> child is keyed by a hash of its content (with its id removed
+  and its references resolved), so identical defs from different assets end
+  up as one entry under one id;
+- every self-contained group with enough children (the rift icon and its
+  bike/cog variants) is stored once and drawn with <use>.
+
+Each asset keeps only its own markup, with references rewritten to the
+shared ids. The sheet itself is written once, after the cards, as a hidden
+inline SVG.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple
+
+from riftkit.buildcache import digest
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+XLINK_NS = '{http://www.w3.org/1999/xlink}'
+
+# Groups with at least this many descendant elements are worth sharing
+MIN_GROUP_ELEMENTS = 4
+
+REF_RE = re.compile(r'url\(#([^)\s]+)\)|href="#([^"]+)"')
+
+
+def _strip_namespaces(elem: ET.Element):
+    """Drop the SVG namespace from tags so fragments serialize without prefixes"""
+    for node in elem.iter():
+        if not isinstance(node.tag, str):
+            continue  # comment
+        if node.tag.startswith(SVG_NS):
+            node.tag = node.tag[len(SVG_NS):]
+        for name in [n for n in node.attrib if n.startswith(XLINK_NS)]:
+            node.attrib['xlink:' + name[len(XLINK_NS):]] = node.attrib.pop(name)
+
+
+def _serialize(elem: ET.Element) -> str:
+    """Markup of one element, without its trailing text"""
+    tail, elem.tail = elem.tail, None
+    try:
+        return ET.tostring(elem, encoding='unicode')
+    finally:
+        elem.tail = tail
+
+
+def _rewrite_refs(markup: str, ids: Dict[str, str]) -> str:
+    """Point url(#id) and href="#id" references at their new ids"""
+    def replace(match):
+        old = match.group(1) or match.group(2)
+        new = ids.get(old)
+        if new is None:
+            return match.group(0)
+        return f'url(#{new})' if match.group(1) else f'href="#{new}"'
+    return REF_RE.sub(replace, markup)
+
+
+def _rewrite_tree_refs(root: ET.Element, ids: Dict[str, str]):
+    """_rewrite_refs for every attribute and <style> text under root"""
+    for node in root.iter():
+        if not isinstance(node.tag, str):
+            continue
+        for name, value in node.attrib.items():
+            if name in ('href', 'xlink:href') and value.startswith('#') and value[1:] in ids:
+                node.attrib[name] = '#' + ids[value[1:]]
+            elif 'url(#' in value:
+                node.attrib[name] = _rewrite_refs(value, ids)
+        if node.tag == 'style' and node.text:
+            node.text = _rewrite_refs(node.text, ids)
+
+
+def _has_ids(elem: ET.Element) -> bool:
+    return any(isinstance(node.tag, str) and 'id' in node.attrib for node in elem.iter())
+
+
+class SpriteSheet:
+    """Shared <defs> and groups for every SVG inlined into one page"""
+
+    def __init__(self, prefix: str = 's'):
+        self.prefix = prefix
+        self.entries: Dict[str, str] = {}  # shared id -> markup
+        self.assets = 0
+        self.inline_bytes = 0
+        self.reused = 0
+
+    # ---- defs -------------------------------------------------------
+
+    def _hoist_defs(self, root: ET.Element) -> Dict[str, str]:
+        """Move every <defs> child into the sheet; returns old id -> shared id"""
+        defs: Dict[str, ET.Element] = {}
+        anonymous: List[ET.Element] = []
+        for parent in list(root.iter()):
+            for child in list(parent):
+                if child.tag != 'defs':
+                    continue
+                for item in child:
+                    if not isinstance(item.tag, str):
+                        continue
+                    if 'id' in item.attrib:
+                        defs.setdefault(item.attrib['id'], item)
+                    else:
+                        anonymous.append(item)
+                parent.remove(child)
+
+        keys: Dict[str, str] = {}
+
+        def key_of(def_id: str, seen: Tuple[str, ...] = ()) -> str:
+            if def_id in keys:
+                return keys[def_id]
+            elem = defs[def_id]
+            markup = _serialize(elem).replace(f'id="{def_id}"', '', 1)
+            refs = [m.group(1) or m.group(2) for m in REF_RE.finditer(markup)]
+            deps = [key_of(ref, seen + (def_id,)) if ref in defs and ref not in seen else ref
+                    for ref in refs]
+            keys[def_id] = digest(markup, deps)[:10]
+            return keys[def_id]
+
+        ids = {def_id: f"{self.prefix}{key_of(def_id)}" for def_id in defs}
+        for def_id, elem in defs.items():
+            elem.set('id', ids[def_id])
+            self._add(ids[def_id], _rewrite_refs(_serialize(elem), ids))
+        for elem in anonymous:
+            # Styles and other unnamed defs: keep once per distinct content
+            markup = _rewrite_refs(_serialize(elem), ids)
+            self._add(f"{self.prefix}{digest(markup)[:10]}", markup)
+        return ids
+
+    # ---- groups -----------------------------------------------------
+
+    def _hoist_groups(self, elem: ET.Element):
+        """Replace large self-contained groups with <use> of a shared copy"""
+        for index, child in enumerate(list(elem)):
+            if not isinstance(child.tag, str):
+                continue
+            size = sum(1 for node in child.iter() if isinstance(node.tag, str)) - 1
+            if child.tag == 'g' and size >= MIN_GROUP_ELEMENTS and not _has_ids(child):
+                transform = child.attrib.pop('transform', None)
+                markup = _serialize(child)
+                shared_id = f"{self.prefix}{digest(markup)[:10]}"
+                self._add(shared_id, markup.replace('<g', f'<g id="{shared_id}"', 1))
+                use = ET.Element('use', {'href': f'#{shared_id}'})
+                if transform is not None:
+                    use.set('transform', transform)
+                use.tail = child.tail
+                elem.remove(child)
+                elem.insert(index, use)
+            else:
+                self._hoist_groups(child)
+
+    def _add(self, shared_id: str, markup: str):
+        if shared_id in self.entries:
+            self.reused += 1
+        else:
+            self.entries[shared_id] = markup
+
+    # ---- public API -------------------------------------------------
+
+    def inline(self, svg_text: str) -> Optional[str]:
+        """Return the asset as inline <svg> markup that references the sheet.
+
+        Returns None if the file is not well-formed SVG.
+        """
+        try:
+            root = ET.fromstring(svg_text.encode('utf-8'))
+        except ET.ParseError:
+            return None
+        _strip_namespaces(root)
+        self.assets += 1
+        local = f"a{self.assets}-"
+
+        ids = self._hoist_defs(root)
+        # Ids left in the body are private to this asset
+        for node in root.iter():
+            if isinstance(node.tag, str) and 'id' in node.attrib:
+                old = node.attrib['id']
+                node.attrib['id'] = local + old
+                ids.setdefault(old, local + old)
+        _rewrite_tree_refs(root, ids)
+        self._hoist_groups(root)
+
+        markup = _serialize(root)
+        self.inline_bytes += len(markup)
+        return markup
+
+    def markup(self) -> str:
+        """The hidden sheet holding every shared entry.
+
+        Hidden with a zero-size box rather than display:none, which would stop
+        browsers from painting gradients and filters referenced from it.
+        """
+        body = '\n'.join(self.entries.values())
+        return ('<svg xmlns="http://www.w3.org/2000/svg" width="0" height="0" '
+                'style="position:absolute" aria-hidden="true">\n'
+                f'<defs>\n{body}\n</defs>\n</svg>\n')
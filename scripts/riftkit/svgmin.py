@@ -0,0 +1,250 @@
+"""
+Minify the SVG documents the generators write.
+
+The generators build SVG from indented f-string templates: every document
+carries an XML declaration, comments, indentation, coordinates such as
+`x + 0*scale` printed at full float precision, and the same
+fill/stroke/stroke-width attributes on every path of an icon. minify_svg()
+parses a document once and
+
+- drops the XML declaration, comments and whitespace between elements
+  (text inside <text> only has its runs of spaces collapsed, which is what
+  the renderer does anyway);
+- rounds numbers in geometry attributes to PRECISION decimals
+  (TRANSFORM_PRECISION inside transforms, where a rounded scale would be
+  visible) and packs path data (`M 120.0 40.0 L` -> `M120 40L`);
+- removes <defs> children that nothing references, and <defs> left empty;
+- moves presentation attributes that repeat on several elements into
+  one CSS class each, in a <style> at the top of the document.
+
+Class names carry a short digest of the document, so SVGs inlined side by
+side into one page cannot restyle each other. Documents whose own <style>
+holds rules (not just a font @import) keep their attributes, since a new
+class rule could outrank their CSS. Anything that does not parse is
+returned unchanged.
+
+AssetWriter runs every .svg through here as it is written, so it is the
+last stage of every generator.
+"""
+
+import hashlib
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Set, Tuple
+
+SVG_URI = 'http://www.w3.org/2000/svg'
+XLINK_URI = 'http://www.w3.org/1999/xlink'
+
+PRECISION = 2
+TRANSFORM_PRECISION = 4
+
+# Attributes whose values are numbers, number lists or path data
+NUMERIC_ATTRS = {
+    'x', 'y', 'x1', 'y1', 'x2', 'y2', 'cx', 'cy', 'fx', 'fy', 'r', 'rx', 'ry', 'dx', 'dy',
+    'width', 'height', 'd', 'points', 'viewBox', 'offset', 'stdDeviation',
+    'stroke-width', 'stroke-dasharray', 'stroke-dashoffset', 'stroke-miterlimit',
+    'font-size', 'letter-spacing', 'opacity', 'fill-opacity', 'stroke-opacity', 'stop-opacity',
+}
+# Presentation attributes that can move into a class rule under the same name
+STYLE_ATTRS = {
+    'fill', 'fill-opacity', 'fill-rule', 'stroke', 'stroke-width', 'stroke-linecap',
+    'stroke-linejoin', 'stroke-miterlimit', 'stroke-dasharray', 'stroke-dashoffset',
+    'stroke-opacity', 'opacity', 'font-family', 'font-size', 'font-weight', 'font-style',
+    'letter-spacing', 'text-anchor', 'dominant-baseline', 'text-decoration',
+}
+# Elements whose character data is content rather than indentation
+TEXT_TAGS = {'text', 'tspan', 'textPath', 'title', 'desc', 'style'}
+# Lengths that may be unitless as attributes but need a unit in CSS
+CSS_LENGTHS = {'font-size', 'letter-spacing'}
+
+NUMBER_RE = re.compile(r'-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?')
+REF_RE = re.compile(r'url\(#([^)\s]+)\)')
+SPACES_RE = re.compile(r'\s+')
+PATH_COMMAND_RE = re.compile(r'\s*([MmLlHhVvCcSsQqTtAaZz])\s*')
+LIST_SEPARATOR_RE = re.compile(r'[\s,]+')
+CSS_PUNCTUATION_RE = re.compile(r'\s*([{};:,])\s*')
+IMPORT_RE = re.compile(r'''@import\s*(?:url\([^)]*\)|"[^"]*"|'[^']*')[^;]*;''')
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def format_number(match, precision: int) -> str:
+    """Shortest text for a number rounded to precision decimals: 0.50 -> .5, 120.0 -> 120"""
+    text = match.group(0)
+    value = round(float(text), precision) + 0.0  # + 0.0 turns -0.0 into 0.0
+    short = f"{value:.{precision}f}".rstrip('0').rstrip('.') if precision else f"{value:.0f}"
+    if short.startswith('0.'):
+        short = short[1:]
+    elif short.startswith('-0.'):
+        short = '-' + short[2:]
+    return short if len(short) <= len(text) else text
+
+
+def minify_numbers(name: str, value: str, precision: int = PRECISION,
+                   transform_precision: int = TRANSFORM_PRECISION) -> str:
+    """Round the numbers in one attribute value and pack number lists"""
+    if name == 'transform':
+        value = NUMBER_RE.sub(lambda m: format_number(m, transform_precision), value)
+        return re.sub(r'\s*([(),])\s*', r'\1', value).strip()
+    if name not in NUMERIC_ATTRS:
+        return value
+    value = NUMBER_RE.sub(lambda m: format_number(m, precision), value)
+    if name == 'd':
+        value = PATH_COMMAND_RE.sub(r'\1', value)
+        value = LIST_SEPARATOR_RE.sub(' ', value).replace(' -', '-').strip()
+    elif name in ('points', 'viewBox', 'stroke-dasharray'):
+        value = LIST_SEPARATOR_RE.sub(' ', value).strip()
+    return value
+
+
+def _strip_whitespace(elem: ET.Element, in_text: bool = False):
+    """Drop indentation between elements; collapse runs of spaces inside text"""
+    local = _local(elem.tag)
+    in_text = in_text or local in TEXT_TAGS
+    if in_text:
+        if local == 'style' and elem.text:
+            elem.text = CSS_PUNCTUATION_RE.sub(r'\1', SPACES_RE.sub(' ', elem.text)).strip()
+        elif elem.text:
+            elem.text = SPACES_RE.sub(' ', elem.text)
+            if len(elem) == 0 and local == 'text':
+                elem.text = elem.text.strip()
+    elif elem.text is not None and not elem.text.strip():
+        elem.text = None
+    for child in elem:
+        _strip_whitespace(child, in_text)
+        if child.tail is not None:
+            if in_text:
+                child.tail = SPACES_RE.sub(' ', child.tail)
+            elif not child.tail.strip():
+                child.tail = None
+
+
+def _referenced_ids(root: ET.Element) -> Set[str]:
+    ids = set()
+    for elem in root.iter():
+        for name, value in elem.attrib.items():
+            if _local(name) == 'href' and value.startswith('#'):
+                ids.add(value[1:])
+            else:
+                ids.update(REF_RE.findall(value))
+        if _local(elem.tag) == 'style' and elem.text:
+            ids.update(REF_RE.findall(elem.text))
+    return ids
+
+
+def _remove_unused_defs(root: ET.Element):
+    """Drop unreferenced defs children until nothing changes, then empty <defs>"""
+    while True:
+        used = _referenced_ids(root)
+        removed = False
+        for parent in list(root.iter()):
+            for child in list(parent):
+                if _local(child.tag) == 'defs':
+                    for item in list(child):
+                        item_id = item.get('id')
+                        if item_id is not None and item_id not in used:
+                            child.remove(item)
+                            removed = True
+        if not removed:
+            break
+    for parent in list(root.iter()):
+        for child in list(parent):
+            if _local(child.tag) == 'defs' and len(child) == 0 and not (child.text or '').strip():
+                parent.remove(child)
+
+
+def _styleable(root: ET.Element) -> List[ET.Element]:
+    """Elements outside <defs> whose presentation attributes may become a class"""
+    found = []
+
+    def visit(elem: ET.Element):
+        for child in elem:
+            if _local(child.tag) in ('defs', 'style'):
+                continue
+            if 'class' not in child.attrib and 'style' not in child.attrib:
+                found.append(child)
+            visit(child)
+
+    visit(root)
+    return found
+
+
+def _merge_classes(root: ET.Element, document_digest: str):
+    """Move presentation attribute sets used more than once into CSS classes"""
+    if any(_local(elem.tag) == 'style' and IMPORT_RE.sub('', elem.text or '').strip()
+           for elem in root.iter()):
+        return
+    groups: Dict[Tuple[Tuple[str, str], ...], List[ET.Element]] = {}
+    for elem in _styleable(root):
+        props = tuple(sorted((name, value) for name, value in elem.attrib.items()
+                             if name in STYLE_ATTRS and 'url(' not in value
+                             and not any(c in value for c in ';{}')))
+        if props:
+            groups.setdefault(props, []).append(elem)
+
+    rules = []
+    for props, elems in groups.items():
+        if len(elems) < 2:
+            continue
+        name = f"r{document_digest}{len(rules):x}"
+        declarations = [f"{k}:{v}px" if k in CSS_LENGTHS and NUMBER_RE.fullmatch(v) else f"{k}:{v}"
+                        for k, v in props]
+        rule = f".{name}{{{';'.join(declarations)}}}"
+        attributes = sum(len(f' {k}="{v}"') for k, v in props)
+        if len(rule) + len(elems) * len(f' class="{name}"') >= len(elems) * attributes:
+            continue  # the rule would cost more than it saves
+        rules.append(rule)
+        for elem in elems:
+            for key, _ in props:
+                del elem.attrib[key]
+            elem.set('class', name)
+    if rules:
+        namespace = root.tag[:-len(_local(root.tag))]
+        style = ET.Element(f"{namespace}style")
+        style.text = ''.join(rules)
+        root.insert(0, style)
+
+
+def minify_svg(text: str, precision: int = PRECISION,
+               transform_precision: int = TRANSFORM_PRECISION) -> str:
+    """Minified copy of an SVG document, or the document itself if it does not parse"""
+    try:
+        root = ET.fromstring(text)
+    except ET.ParseError:
+        return text
+    if _local(root.tag) != 'svg':
+        return text
+
+    _strip_whitespace(root)
+    for elem in root.iter():
+        for name, value in elem.attrib.items():
+            elem.attrib[name] = minify_numbers(name, value, precision, transform_precision)
+    _remove_unused_defs(root)
+    _merge_classes(root, hashlib.blake2b(text.encode('utf-8'), digest_size=3).hexdigest())
+
+    result = serialize(root)
+    return result if len(result) < len(text) else text
+
+
+def serialize(root: ET.Element) -> str:
+    """Markup with the SVG namespace as the default and xlink: attributes.
+
+    ElementTree can only write a default namespace when every attribute is
+    qualified too, so the namespaces are stripped and declared by hand.
+    """
+    svg_ns, xlink_ns = f'{{{SVG_URI}}}', f'{{{XLINK_URI}}}'
+    uses_xlink = False
+    for elem in root.iter():
+        if elem.tag.startswith(svg_ns):
+            elem.tag = elem.tag[len(svg_ns):]
+        for name in [n for n in elem.attrib if n.startswith(xlink_ns)]:
+            elem.attrib['xlink:' + name[len(xlink_ns):]] = elem.attrib.pop(name)
+            uses_xlink = True
+    declarations = {'xmlns': SVG_URI}
+    if uses_xlink:
+        declarations['xmlns:xlink'] = XLINK_URI
+    root.attrib = {**declarations, **root.attrib}
+    # ElementTree escapes > in text and attributes, so ' />' only ever ends a tag
+    return ET.tostring(root, encoding='unicode').replace(' />', '/>')
@@ -0,0 +1,201 @@
+"""
+Wait for files to appear or change under a folder, in debounced batches.
+
+InotifyWatcher uses Linux inotify through ctypes, so no extra package is
+needed. It watches every folder under the root, adds watches for folders
+that are created later, and reports a file once it has been closed after
+writing (IN_CLOSE_WRITE) or moved in (IN_MOVED_TO). PollingWatcher is the
+fallback for other platforms and for filesystems that do not deliver
+inotify events (network mounts, some container volumes): it compares
+(size, mtime) snapshots every few seconds.
+
+next_batch() waits for the first change and then keeps collecting until
+the folder has been quiet for a while. A supplier drop of a few hundred
+files copied in over several seconds therefore arrives as one batch, not
+hundreds.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+# inotify(7) event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+
+# Files that are still being written by a browser, unzip or rsync
+TEMPORARY_SUFFIXES = ('.partial', '.part', '.crdownload', '.tmp', '.download')
+
+
+def is_candidate(path: str) -> bool:
+    """False for dotfiles and the temporary names downloaders write to"""
+    name = os.path.basename(path)
+    return not name.startswith('.') and not name.lower().endswith(TEMPORARY_SUFFIXES)
+
+
+def walk_files(root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """(path, stat) of every candidate file under root"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.is_file(follow_symlinks=False) and is_candidate(entry.path):
+                yield entry.path, entry.stat(follow_symlinks=False)
+
+
+class InotifyWatcher:
+    """Changed files under root, from inotify events"""
+
+    def __init__(self, root: str):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError(errno.ENOSYS, 'libc not found')
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        self.root = root
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._dirs: Dict[int, str] = {}
+        self._pending: Set[str] = set()
+        self._watch_tree(root, report=False)
+
+    def _add_watch(self, directory: str) -> bool:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            return False
+        self._dirs[wd] = directory
+        return True
+
+    def _watch_tree(self, directory: str, report: bool):
+        """Watch directory and its subfolders; report files already in them"""
+        self._add_watch(directory)
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for name in dirnames:
+                self._add_watch(os.path.join(dirpath, name))
+            if report:
+                # Files written before the watch existed would never send an event
+                self._pending.update(os.path.join(dirpath, f) for f in filenames
+                                     if is_candidate(f))
+
+    def changes(self, timeout: float) -> Set[str]:
+        """Paths closed after writing or moved in, waiting up to timeout seconds"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if readable:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                data = b''
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped: fall back to a full look
+                    self._pending.update(path for path, _ in walk_files(self.root))
+                    continue
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None or not name or name.startswith('.'):
+                    continue
+                path = os.path.join(directory, name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._watch_tree(path, report=True)
+                elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO) and is_candidate(path):
+                    self._pending.add(path)
+        changed, self._pending = self._pending, set()
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Changed files under root, from (size, mtime) snapshots"""
+
+    def __init__(self, root: str, interval: float = 2.0):
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next = time.monotonic() + interval
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        return {path: (stat.st_size, stat.st_mtime_ns) for path, stat in walk_files(self.root)}
+
+    def changes(self, timeout: float) -> Set[str]:
+        """Paths that are new or changed since the last snapshot"""
+        wait = self._next - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return set()
+        if wait > 0:
+            time.sleep(wait)
+        self._next = time.monotonic() + self.interval
+        snapshot = self._scan()
+        changed = {path for path, state in snapshot.items() if self._snapshot.get(path) != state}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(root: str, polling: bool = False, interval: float = 2.0):
+    """An InotifyWatcher, or a PollingWatcher when asked or when inotify is unavailable"""
+    if not polling:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, interval)
+
+
+def next_batch(watcher, quiet: float = 2.0, limit: Optional[float] = None) -> Set[str]:
+    """Wait for changes, then collect until nothing has changed for quiet seconds.
+
+    Returns the changed paths that still exist. limit bounds the initial
+    wait (None waits forever) and returns an empty set when it runs out.
+    """
+    deadline = None if limit is None else time.monotonic() + limit
+    batch: Set[str] = set()
+    while not batch:
+        timeout = 1.0 if deadline is None else min(1.0, deadline - time.monotonic())
+        if timeout <= 0:
+            return set()
+        batch |= watcher.changes(timeout)
+    last_change = time.monotonic()
+    while time.monotonic() - last_change < quiet:
+        more = watcher.changes(max(0.05, quiet - (time.monotonic() - last_change)))
+        if more:
+            batch |= more
+            last_change = time.monotonic()
+    return {path for path in batch if os.path.isfile(path)}
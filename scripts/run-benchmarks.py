@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Benchmark the brand generators and the bike image pipeline.
+
+Each repeat builds everything from scratch in a temporary directory:
+every registered generator in turn (generate:NAME), a no-change rebuild of
+all of them (rebuild), each preview page redrawn over the finished output
+(preview:NAME), then refine_organization, review_images and
+remove_duplicates over a synthetic bike tree (refine, review, dedupe).
+Every case runs in its own process and records wall and CPU time, peak
+RSS, and the files and bytes it wrote (riftkit.bench). Results go to
+.benchmarks/<commit>.json, to be compared with another run:
+
+    python3 scripts/run-benchmarks.py --repeat 3
+    python3 scripts/run-benchmarks.py --only 'generate:*' --compare .benchmarks/1a2b3c4d5e6f.json
+    python3 scripts/run-benchmarks.py --compare OLD.json NEW.json
+
+--compare exits with status 1 when any case got slower or bigger than
+--threshold allows, so a nightly build can fail on it. --profile (and
+--cprofile, --tracemalloc) profiles every case; each one's report is in
+the --keep-log output and in .profile/bench-<case>.json.
+"""
+
+import argparse
+import fnmatch
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from riftkit import bench, engine, profiling
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Image pipeline stages, in order; each works on the tree the one before left
+IMAGE_CASES = ['refine', 'review', 'dedupe']
+SOURCE_NAME = 'organized_bikes'
+REFINED_NAME = 'organized_bikes_refined'
+
+
+def load_script(filename):
+    """Import one of the hyphenated scripts in this directory as a module."""
+    module_name = filename[:-3].replace('-', '_')
+    if module_name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / filename)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[module_name]
+
+
+# ==================== ONE CASE (child process) ====================
+
+def run_case(case, workdir, jobs):
+    """Run one case in workdir and return its wall time; the caller measures the rest."""
+    os.chdir(workdir)
+    kind, _, name = case.partition(':')
+    if kind in ('generate', 'rebuild', 'preview'):
+        engine.load_generator_scripts()
+        args = engine.build_parser(list(engine.REGISTRY)).parse_args(['--jobs', str(jobs)])
+    source, refined = Path(workdir) / SOURCE_NAME, Path(workdir) / REFINED_NAME
+
+    start = time.perf_counter()
+    if kind == 'generate':
+        engine.run([name], args)
+    elif kind == 'rebuild':
+        engine.run(list(engine.REGISTRY), args)
+    elif kind == 'preview':
+        engine.REGISTRY[name].preview(args)
+        engine.WRITER.flush()
+    elif kind == 'refine':
+        refine = load_script('refine-bike-organization.py')
+        refine.SOURCE_DIR, refine.TARGET_DIR = source, refined
+        refine.refine_organization(jobs=jobs)
+    elif kind == 'review':
+        review = load_script('identify-overlay-images.py')
+        review.SOURCE_DIR = refined
+        review.review_images(jobs=jobs)
+    elif kind == 'dedupe':
+        load_script('remove-duplicates.py').remove_duplicates(source_dir=refined, jobs=jobs)
+    else:
+        raise ValueError(f"unknown benchmark case {case!r}")
+    return time.perf_counter() - start
+
+
+def child_main(case, workdir, jobs, result_path, profile_args=()):
+    """Entry point of the per-case process: run it and write its measurements as JSON"""
+    parser = argparse.ArgumentParser()
+    profiling.add_arguments(parser)
+    cpu_start = bench.cpu_time()
+    with profiling.session(parser.parse_args(profile_args), 'bench-' + case.replace(':', '-')):
+        wall = run_case(case, workdir, jobs)
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump({'wall': wall, 'cpu': bench.cpu_time() - cpu_start, 'peak_rss': bench.peak_rss()}, f)
+
+
+# ==================== THE SUITE (parent process) ====================
+
+def site_cases():
+    """Generator cases in the order they depend on each other"""
+    engine.load_generator_scripts()
+    names = list(engine.REGISTRY)
+    return ([f'generate:{name}' for name in names] + ['rebuild']
+            + [f'preview:{name}' for name in names if engine.REGISTRY[name].preview])
+
+
+def needed(chain, selected):
+    """Cases of a chain to run: the selected ones and everything later selected cases build on.
+
+    generate:NAME cases stand alone; every other case works on what all the
+    cases before it produced.
+    """
+    wanted = [case for case in chain if selected(case)]
+    if not wanted:
+        return []
+    depends = any(not case.startswith('generate:') for case in wanted)
+    last = chain.index(wanted[-1])
+    return [case for case in chain[:last + 1] if selected(case) or depends]
+
+
+def measure(case, workdir, jobs, log, profile_args=()):
+    """Run one case in a fresh process; its measurements plus what it wrote, or an error"""
+    before = bench.snapshot(workdir)
+    result_path = os.path.join(os.path.dirname(workdir), 'case-result.json')
+    process = subprocess.run([sys.executable, __file__, '--child', case, workdir, str(jobs), result_path,
+                              *profile_args],
+                             stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    with open(log, 'a', encoding='utf-8') as f:
+        f.write(f"\n===== {case} =====\n{process.stdout}")
+    if process.returncode != 0:
+        lines = process.stdout.strip().splitlines()
+        return {'error': lines[-1] if lines else f"exit status {process.returncode}"}
+    with open(result_path, 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+    os.remove(result_path)
+    sample.update(bench.changes(before, bench.snapshot(workdir)))
+    return sample
+
+
+def run_suite(args, selected):
+    results = bench.new_results(repeat=args.repeat, jobs=args.jobs, bikes=args.bikes,
+                                files_per_bike=args.files_per_bike, seed=args.seed)
+    chains = [needed(site_cases(), selected), needed(IMAGE_CASES, selected)]
+    profile_args = [f'--{mode}' for mode in ('profile', 'cprofile', 'tracemalloc') if getattr(args, mode)]
+    samples = {}
+    with tempfile.TemporaryDirectory(prefix='rift-bench-') as scratch:
+        log = os.path.join(scratch, 'bench.log')
+        if chains[1]:
+            template = os.path.join(scratch, 'bikes-template', SOURCE_NAME)
+            count, size = bench.build_bike_tree(template, args.bikes, args.files_per_bike, args.seed)
+            print(f"🚲 Synthetic bike tree: {args.bikes} bikes, {count} files ({size / 1024 / 1024:.1f}MB)")
+        for repeat in range(args.repeat):
+            print(f"\n⏱  Run {repeat + 1}/{args.repeat}")
+            for chain_index, chain in enumerate(chains):
+                workdir = os.path.join(scratch, f'run-{repeat}-{chain_index}')
+                if chain_index == 1:
+                    bench.fresh_copy(template, os.path.join(workdir, SOURCE_NAME))
+                os.makedirs(workdir, exist_ok=True)
+                for case in chain:
+                    sample = measure(case, workdir, args.jobs, log, profile_args)
+                    if 'error' in sample:
+                        print(f"   ✗ {case:34} {sample['error']}")
+                        results['cases'][case] = sample
+                        continue
+                    if selected(case):
+                        samples.setdefault(case, []).append(sample)
+                    print(f"   {'✓' if selected(case) else '·'} {case:34} {sample['wall']:8.3f}s "
+                          f"{sample['peak_rss'] / 1024 / 1024:7.1f}MB  {sample['files']:5} files "
+                          f"{sample['bytes'] / 1024:9.1f}KB")
+        if args.keep_log and os.path.exists(log):
+            os.replace(log, args.keep_log)
+    for case, case_samples in samples.items():
+        if case not in results['cases']:
+            results['cases'][case] = bench.summarize(case_samples)
+    return results
+
+
+# ==================== REPORTS ====================
+
+def print_comparison(base, new, threshold, floor):
+    """Print both runs side by side; returns the regressed case names"""
+    rows, regressions = bench.compare(base, new, threshold, floor)
+    print(f"\n📊 {base['commit'][:12]}{'-dirty' if base['dirty'] else ''} → "
+          f"{new['commit'][:12]}{'-dirty' if new['dirty'] else ''}")
+    print(f"   {'case':34} {'wall':>19} {'change':>8} {'peak RSS':>17} {'bytes written':>21}")
+    for name, old, cur in rows:
+        if not old or not cur or 'error' in old or 'error' in cur:
+            status = 'error' if (cur or {}).get('error') else ('new' if not old else 'gone' if not cur else 'fixed')
+            print(f"   {name:34} {status}")
+            continue
+        change = (cur['wall'] - old['wall']) / old['wall'] * 100 if old['wall'] else 0.0
+        mark = '  ⚠️' if name in regressions else ''
+        print(f"   {name:34} {old['wall']:8.3f}s→{cur['wall']:8.3f}s {change:+7.1f}% "
+              f"{old['peak_rss'] / 1048576:6.1f}→{cur['peak_rss'] / 1048576:6.1f}MB "
+              f"{old['bytes'] / 1024:9.1f}→{cur['bytes'] / 1024:9.1f}KB{mark}")
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} regressions beyond {threshold * 100:.0f}%: {', '.join(regressions)}")
+    else:
+        print(f"\n✅ No regressions beyond {threshold * 100:.0f}%")
+    return regressions
+
+
+def main():
+    if len(sys.argv) >= 6 and sys.argv[1] == '--child':
+        child_main(sys.argv[2], sys.argv[3], int(sys.argv[4]), sys.argv[5], sys.argv[6:])
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark the RIFT generators and image pipeline")
+    parser.add_argument('--repeat', '-r', type=int, default=3,
+                        help='runs of every case from scratch; times are medians (default: 3)')
+    parser.add_argument('--only', action='append', default=[], metavar='PATTERN',
+                        help="cases to record, as glob patterns such as 'generate:*' or dedupe (repeatable)")
+    parser.add_argument('--list', action='store_true', help='list the benchmark cases and exit')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='worker processes inside each case (0 = one per CPU core; default: 1)')
+    parser.add_argument('--bikes', type=int, default=4, help='bikes in the synthetic tree (default: 4)')
+    parser.add_argument('--files-per-bike', type=int, default=len(bench.BIKE_FILES),
+                        help=f'files per synthetic bike (default: {len(bench.BIKE_FILES)})')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic tree')
+    parser.add_argument('--output', '-o', help='results file (default: .benchmarks/<commit>.json)')
+    parser.add_argument('--compare', nargs='+', metavar='RESULTS',
+                        help='compare this run with a results file, or two results files without running')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='percent growth in wall time or peak RSS counted as a regression (default: 10)')
+    parser.add_argument('--floor', type=float, default=0.05,
+                        help='seconds of growth below which wall time never counts as a regression')
+    parser.add_argument('--keep-log', metavar='FILE', help='keep the output of every case in FILE')
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    if args.compare and len(args.compare) > 2:
+        parser.error('--compare takes one or two results files')
+    if args.jobs <= 0:
+        args.jobs = os.cpu_count() or 1
+
+    if args.list:
+        for case in site_cases() + IMAGE_CASES:
+            print(case)
+        return
+
+    if args.compare and len(args.compare) == 2:
+        base, new = (bench.load_results(path) for path in args.compare)
+    else:
+        def selected(case):
+            return not args.only or any(fnmatch.fnmatchcase(case, pattern) for pattern in args.only)
+
+        print("=" * 60)
+        print("⏱  RIFT BENCHMARKS")
+        print("=" * 60)
+        new = run_suite(args, selected)
+        output = args.output or bench.default_results_path(new)
+        bench.save_results(output, new)
+        print(f"\n💾 Results: {output}")
+        if not args.compare:
+            return
+        base = bench.load_results(args.compare[0])
+    if print_comparison(base, new, args.threshold / 100, args.floor):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
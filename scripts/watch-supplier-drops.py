@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Watch the supplier drop folder and process new material as it arrives.
+Every file (or .zip archive) that appears or changes is categorized with
+the refine rules, placed into the refined tree unless its bike already holds
+the same bytes, checked by size and content, and any images that need a
+look are appended to MANUAL_REVIEW_CHECKLIST.md.
+Files that were already placed and have not changed are left alone, so a
+drop is processed in seconds instead of by rerunning the whole pipeline.
+
+Uses inotify on Linux and falls back to polling elsewhere (or with --poll).
+Changes are debounced: processing starts once the folder has been quiet
+for --quiet seconds, so a drop being copied in arrives as one batch.
+Watching, placing and the size checks need only the standard library; the
+content check of clean images is skipped when Pillow and NumPy are missing.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+from riftkit import profiling
+from riftkit.dedupe import HEAD_BYTES, DuplicateIndex, file_digest, iter_files
+from riftkit.journal import PARTIAL_SUFFIX, PlacementJournal
+from riftkit.place import MODES, Placer
+from riftkit.watch import InotifyWatcher, next_batch, open_watcher, walk_files
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+_spec = importlib.util.spec_from_file_location("ingest_bike_assets", SCRIPTS_DIR / "ingest-bike-assets.py")
+ingest = importlib.util.module_from_spec(_spec)
+sys.modules["ingest_bike_assets"] = ingest
+_spec.loader.exec_module(ingest)
+
+SOURCE_DIR = ingest.SOURCE_DIR
+TARGET_DIR = ingest.TARGET_DIR
+
+
+def bike_index(bike_dir):
+    """DuplicateIndex of the files a bike folder already holds; hashed only on a size match."""
+    index = DuplicateIndex()
+    for path, size in iter_files(str(bike_dir)):
+        if not path.endswith(PARTIAL_SUFFIX):
+            index.insert(path, size)
+    return index
+
+
+def process_batch(paths, source_dir, target_dir, journal, placer, content=True, jobs=1):
+    """Place and review one batch of new or changed files."""
+    start = time.perf_counter()
+    stats = {"total": 0, "by_category": {}, "by_bike": {}}
+    clean, details = [], []  # (bike_name, source, placed path, placed now), only files placed now
+    duplicates = 0
+
+    # One index per bike, as ingest keeps; rebuilt every batch since reviews move files
+    indexes = {}
+
+    def index_for(bike_name):
+        if bike_name not in indexes:
+            indexes[bike_name] = bike_index(target_dir / bike_name)
+        return indexes[bike_name]
+
+    for path in sorted(paths):
+        if path.lower().endswith(".zip"):
+            try:
+                placements, archive_duplicates, unmatched = ingest.ingest_archive(path, target_dir, journal,
+                                                                                  index_for=index_for)
+            except (OSError, ingest.zipfile.BadZipFile) as e:
+                print(f"  ✗ Error reading {os.path.basename(path)}: {e}")
+                continue
+            for _, name, original in archive_duplicates:
+                duplicates += 1
+                print(f"  ⊘ duplicate      → {os.path.basename(name)} (same bytes as {os.path.basename(original)})")
+            for bike_name, key, target_file, placed_now in placements:
+                if placed_now:
+                    stats["total"] += 1
+                    ingest.record_placement(stats, clean, details, target_dir / bike_name, key,
+                                            target_file, True)
+            if unmatched:
+                print(f"⚠️  {unmatched} files in {os.path.basename(path)} match no known bike model")
+            continue
+
+        rel_path = os.path.relpath(path, source_dir).replace(os.sep, "/")
+        bike_name = ingest.bike_for_member("", rel_path)
+        if bike_name is None:
+            print(f"⚠️  {rel_path} is not inside a known bike model folder; skipping it")
+            continue
+        filename = os.path.basename(path)
+        try:
+            size = os.path.getsize(path)
+            # Sources the journal already knows are left to it: their placed copy is in the index
+            original = None if journal.destination(path) is not None else index_for(bike_name).find(
+                size, lambda: file_digest(path, HEAD_BYTES), lambda: file_digest(path))
+        except OSError as e:
+            print(f"  ✗ Error reading {filename}: {e}")
+            continue
+        if original:
+            duplicates += 1
+            print(f"  ⊘ duplicate      → {filename} (same bytes as {os.path.basename(original)})")
+            continue
+
+        subdir = ingest.refine.refined_subdir(ingest.refine.categorize_image(filename, Path(path)), path)
+        try:
+            target_file, placed_now = journal.place(path, target_dir / bike_name / subdir,
+                                                    transfer=placer.place)
+        except OSError as e:
+            print(f"  ✗ Error placing {filename}: {e}")
+            continue
+        if placed_now:
+            index_for(bike_name).insert(str(target_file), size)
+            stats["total"] += 1
+            ingest.record_placement(stats, clean, details, target_dir / bike_name, path,
+                                    target_file, True)
+
+    if not stats["total"]:
+        if duplicates:
+            print(f"✅ Nothing new: {duplicates} duplicates skipped")
+        return stats
+    review_results = ingest.check_placed(stats, journal, target_dir, clean, details,
+                                         content=content, jobs=jobs)
+    review_file = ingest.identify.append_to_checklist(
+        review_results, target_dir, heading=f"Drop of {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    flagged = len(review_results["potential_overlays"]) + len(review_results["small_images"])
+    print(f"✅ Placed {stats['total']} files in {time.perf_counter() - start:.1f}s"
+          + (f", {duplicates} duplicates skipped" if duplicates else "")
+          + (f"; {flagged} to review in {review_file}" if flagged else ""))
+    return stats
+
+
+def watch(source_dir=SOURCE_DIR, target_dir=TARGET_DIR, mode="auto", content=True, jobs=1,
+          quiet=2.0, poll=False, interval=2.0, once=False):
+    """Catch up on anything missed, then process drops until interrupted."""
+    source_dir, target_dir = Path(source_dir), Path(target_dir)
+    source_dir.mkdir(parents=True, exist_ok=True)
+    placer = Placer(mode)
+    journal = PlacementJournal(target_dir)
+    # Watch before catching up, so nothing that lands during the catch-up is missed;
+    # a file seen by both is skipped by the journal the second time
+    watcher = None if once else open_watcher(str(source_dir), polling=poll, interval=interval)
+    try:
+        # Anything that arrived while nobody was watching; placed files are skipped by the journal
+        print(f"🔄 Catching up on {source_dir}...")
+        with profiling.stage('catch up'):
+            process_batch([path for path, _ in walk_files(str(source_dir))], source_dir, target_dir,
+                          journal, placer, content=content, jobs=jobs)
+        if watcher is None:
+            return
+
+        kind = "inotify" if isinstance(watcher, InotifyWatcher) else f"polling every {interval:g}s"
+        print(f"👀 Watching {source_dir} ({kind}); press Ctrl+C to stop")
+        try:
+            while True:
+                batch = next_batch(watcher, quiet=max(quiet, interval if poll else 0))
+                print(f"\n📥 {len(batch)} new or changed files")
+                with profiling.stage('drop'):
+                    process_batch(batch, source_dir, target_dir, journal, placer,
+                                  content=content, jobs=jobs)
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+    finally:
+        if watcher is not None:
+            watcher.close()
+        journal.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process supplier drops as they arrive")
+    parser.add_argument("--source", type=Path, default=SOURCE_DIR,
+                        help=f"drop folder to watch (default: {SOURCE_DIR})")
+    parser.add_argument("--target", type=Path, default=TARGET_DIR,
+                        help=f"refined output folder (default: {TARGET_DIR})")
+    parser.add_argument("--link", choices=MODES, default="auto",
+                        help="how to place files: reflink, hardlink or copy (auto tries reflink, then copy; "
+                             "hardlink only for a throwaway extract)")
+    parser.add_argument("--no-content", action="store_true",
+                        help="skip pixel analysis of clean images")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="worker processes for pixel analysis (0 = one per CPU core)")
+    parser.add_argument("--quiet", type=float, default=2.0,
+                        help="seconds without changes before a drop is processed")
+    parser.add_argument("--poll", action="store_true",
+                        help="poll instead of using inotify (network mounts)")
+    parser.add_argument("--interval", type=float, default=2.0,
+                        help="seconds between polls")
+    parser.add_argument("--once", action="store_true",
+                        help="process what is there now and exit")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    with profiling.session(args):
+        watch(args.source, args.target, mode=args.link, content=not args.no_content,
+              jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1),
+              quiet=args.quiet, poll=args.poll, interval=args.interval, once=args.once)
+
+
+if __name__ == "__main__":
+    main()